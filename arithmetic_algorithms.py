@@ -2,6 +2,34 @@
    can be implemented in Python'''
 
 import math
+import numbers
+import operator
+import random
+import types
+from collections import namedtuple
+from decimal import Decimal
+
+'''Every function below that loops one unit at a time accepts an `engine` keyword.
+   The default 'pedagogical' engine runs the algorithm exactly as it is written, which
+   is what the lessons are about. The 'fast' engine computes the same results (same types,
+   same exceptions) using Python's native arithmetic, so that answer checking does not have
+   to wait for a million increments. The one exception is add with large floats, see the note
+   before _fast_add below:
+
+   multiply(10**6, 10**6, engine='fast') # 1000000000000
+
+   The division functions also accept engine='long', which subtracts whole groups of the divisor
+   at a time, one place value at a time, as described before quotient() below.
+'''
+
+ENGINES = ('pedagogical', 'fast')
+DIVISION_ENGINES = ENGINES + ('long',)
+
+def _use_fast_engine(engine, engines=ENGINES):
+    '''returns False if `engine` asks for the pedagogical engine, True for any of the faster ones'''
+    if engine not in engines:
+        raise ValueError(f'unknown engine {engine!r}, expected one of {engines}')
+    return engine != 'pedagogical'
 
 def add_one(number):
     return number + 1
@@ -26,13 +54,17 @@ def multiply_recursive(number1, number2):
 
 '''The above recursive algorithms can be converted into the following iterative algorithms:'''
 
-def add(number1, number2):
+def add(number1, number2, engine='pedagogical'):
+    if _use_fast_engine(engine):
+        return _fast_add(number1, number2)
     sum_so_far = number1
     for _ in range(number2):
         sum_so_far += 1
     return sum_so_far
 
-def multiply(number1, number2):
+def multiply(number1, number2, engine='pedagogical'):
+    if _use_fast_engine(engine):
+        return _fast_multiply(number1, number2)
     product_so_far = number1
     for _ in range(number2 - 1):
         product_so_far = add(product_so_far, number1)
@@ -42,13 +74,17 @@ def multiply(number1, number2):
    the way in which two inputs to the multiplicaiton function become
    more than two inputs into the addition function:'''
 
-def generalized_addition(*inputs):
+def generalized_addition(*inputs, engine='pedagogical'):
+    if _use_fast_engine(engine):
+        return _fast_generalized_addition(*inputs)
     sum_so_far = 0
     for number in inputs:
         sum_so_far = add(sum_so_far, number)
     return sum_so_far
 
-def multiplication(input1, input2):
+def multiplication(input1, input2, engine='pedagogical'):
+    if _use_fast_engine(engine):
+        return _fast_multiplication(input1, input2)
     list_of_inputs = [input1 for x in range(input2)]
     return generalized_addition(*list_of_inputs)
 
@@ -196,9 +232,11 @@ def division(a, b):
 
    '''  
 
-def quotient(input1, input2):
+def quotient(input1, input2, engine='pedagogical'):
     '''returns the quotient when input1 is divided by input2. The quotient is simply a count of how many times we can 
        subtract input2 from input1 until the result becomes negative.'''
+    if _use_fast_engine(engine, DIVISION_ENGINES):
+        return _divide_with_engine(input1, input2, engine)[0]
     if input2 == 0:
         raise ZeroDivisionError
     quotient_so_far = 0
@@ -211,21 +249,25 @@ def quotient(input1, input2):
 '''we can compute the remainder using the same logic from the above function, except we remove any mention of the quotient,
    and return the remainder instead of the quotient:'''
 
-def remainder(input1, input2):
+def remainder(input1, input2, engine='pedagogical'):
     '''returns the remainder when input1 is divided by input2'''
+    if _use_fast_engine(engine, DIVISION_ENGINES):
+        return _divide_with_engine(input1, input2, engine)[1]
     if input2 == 0:
         raise ZeroDivisionError
     remainder_so_far = input1
     while remainder_so_far >= input2:
         remainder_so_far -= input2
-        return remainder_so_far
+    return remainder_so_far
 
 '''the division function taught in school is what Python calls the 'divmod' function. It returns both the quotient and the
    remainder at the same time in the form of a tuple:'''
 
-def quotient_and_remainder(input1, input2):
+def quotient_and_remainder(input1, input2, engine='pedagogical'):
     '''returns the quotient when input1 is divided by input2. The quotient is simply a count of how many times we can 
        subtract input2 from input1 until the result becomes negative.'''
+    if _use_fast_engine(engine, DIVISION_ENGINES):
+        return _divide_with_engine(input1, input2, engine)
     if input2 == 0:
         raise ZeroDivisionError
     quotient_so_far = 0
@@ -237,22 +279,287 @@ def quotient_and_remainder(input1, input2):
 
 '''the following version fo the quotient and remainder function is conceptually simpler to understand:'''
 
-def quotient_and_remainder2(input1, input2):
+def quotient_and_remainder2(input1, input2, engine='pedagogical'):
     if input2 == 0:
         raise ZeroDivisionError
-    quotient_result = quotient(input1, input2)
-    remainder_result = remainder(input1, input2)
+    # the faster engines get both results out of the same pass
+    if _use_fast_engine(engine, DIVISION_ENGINES):
+        return _divide_with_engine(input1, input2, engine)
+    quotient_result = quotient(input1, input2, engine)
+    remainder_result = remainder(input1, input2, engine)
     return (quotient_result, remainder_result)
 
-def long_division(numerator, denominator):
+'''The fast engine. Each function below reproduces what the corresponding loop above computes,
+   including its corner cases, without doing the loop:
+
+   - add only counts up, so a negative second input leaves the first input unchanged.
+   - multiply starts the product at number1 and adds number1 (number2 - 1) more times, so a second
+     input of 0 or 1 returns number1, and a negative number1 (which add ignores) never changes it.
+   - range() only accepts integers, so wherever a loop calls range() on an input we call
+     operator.index() on it to raise the same TypeError.
+   - repeated subtraction of a negative divisor never stops, so instead of hanging the fast engine
+     raises a ValueError for those inputs, and so does subtracting from an infinite dividend.
+   - every subtraction of a float rounds, so repeatedly subtracting 0.1 drifts away from what divmod
+     gives (1.0 divided by 0.1 is 10 with the loop and 9 with divmod). But while the remainder stays
+     between two powers of 2 every subtraction rounds the same way, so _subtract_repeatedly takes
+     all of those subtractions in one go, and the answers are the loop's exactly. A divisor too small
+     to change the dividend at all would loop forever, and raises a ValueError too.
+
+   The one difference is in add, where the loop also rounds after every + 1 and the fast engine
+   rounds once, so with floats too large to count in ones it gives the float nearest to the true
+   answer, where the loop does not move at all:
+
+   add(1e16, 3) # 1e+16, since 1e16 + 1 rounds back to 1e16 every time
+   add(1e16, 3, engine='fast') # 1.0000000000000004e+16, the float nearest to 10000000000000003
+'''
+
+def _fast_add(number1, number2):
+    count = operator.index(number2)
+    if count <= 0:
+        return number1
+    return number1 + count
+
+def _fast_multiply(number1, number2):
+    repetitions = operator.index(number2 - 1)
+    if repetitions <= 0:
+        return number1
+    step = operator.index(number1)
+    if step <= 0:
+        return number1
+    return number1 + step * repetitions
+
+def _fast_generalized_addition(*inputs):
+    sum_so_far = 0
+    for number in inputs:
+        count = operator.index(number)
+        if count > 0:
+            sum_so_far += count
+    return sum_so_far
+
+def _fast_multiplication(input1, input2):
+    count = len(range(input2))
+    if count == 0:
+        return 0
+    return max(operator.index(input1), 0) * count
+
+def _fast_quotient_and_remainder(input1, input2):
+    if input2 == 0:
+        raise ZeroDivisionError
+    # written like the loop's test, so that a nan dividend (which is not >= anything) stops at once
+    if not input1 >= input2:
+        return 0, input1
+    if input2 < 0:
+        raise ValueError('repeatedly subtracting a negative divisor never makes the dividend smaller')
+    if input1 == math.inf:
+        if input2 == math.inf:
+            # one subtraction gives inf - inf, which is nan
+            return 1, input1 - input2
+        raise ValueError('subtracting from an infinite dividend never makes it smaller')
+    if not (isinstance(input1, numbers.Rational) and isinstance(input2, numbers.Rational)) and {type(input1), type(input2)} <= {int, float}:
+        return _subtract_repeatedly(input1, input2)
+    quotient_so_far, remainder_so_far = divmod(input1, input2)
+    return int(quotient_so_far), remainder_so_far
+
+def _subtract_repeatedly(remainder, divisor):
+    '''returns (quotient, remainder) exactly as the loop `while remainder >= divisor: remainder -= divisor`
+       computes them with floats, for a finite remainder >= divisor > 0.
+
+       Between lower and 2 * lower (two powers of 2) floats are the multiples of one unit, so
+       remainder - divisor rounds to remainder - step * unit, where step is divisor / unit rounded to a
+       whole number, for as long as remainder - divisor stays above lower. Only when divisor / unit is
+       exactly halfway between two whole numbers does the rounding (to an even number of units) depend
+       on the remainder, and then it settles down after one subtraction.'''
+    quotient_so_far = 0
+    while remainder >= divisor:
+        if type(remainder) is not float:
+            # the first subtraction turns an int remainder into a float
+            remainder -= divisor
+            quotient_so_far += 1
+            continue
+        unit = math.ulp(remainder)
+        lower = 2.0 ** (math.frexp(remainder)[1] - 1)
+        units, remainder_units, lower_units = divisor / unit, int(remainder / unit), int(lower / unit)
+        whole = math.floor(units)
+        if units - whole == 0.5:
+            step = whole if (remainder_units - whole) % 2 == 0 else whole + 1
+            if step % 2:
+                # an odd step changes which way the next subtraction rounds
+                remainder -= divisor
+                quotient_so_far += 1
+                continue
+        else:
+            step = round(units)
+        if step == 0:
+            raise ValueError('the divisor is too small to change the dividend, so subtracting it never ends')
+        # the subtractions that keep remainder - divisor above lower
+        numerator, denominator = units.as_integer_ratio()
+        room = (remainder_units - lower_units) * denominator - numerator
+        count = room // (step * denominator) + 1 if room >= 0 else 0
+        if count == 0:
+            remainder -= divisor
+            quotient_so_far += 1
+        else:
+            remainder = (remainder_units - count * step) * unit
+            quotient_so_far += count
+    return quotient_so_far, remainder
+
+def _divide_with_engine(input1, input2, engine):
+    '''returns (quotient, remainder) from the fast or the long engine'''
+    if engine == 'long':
+        return long_quotient_and_remainder(input1, input2)
+    return _fast_quotient_and_remainder(input1, input2)
+
+'''The long engine. Instead of subtracting the divisor one at a time, we subtract it in groups of
+   base ** place, starting from the largest place that fits. At each place we subtract the group
+   as many times as we can (at most base - 1 times), which gives the quotient digit for that place,
+   exactly like the 2 written above the 9 when dividing 960 by 4:
+
+   960 - 2 x 400 = 160   # quotient digit 2 in the hundreds place
+   160 - 4 x 40 = 0      # quotient digit 4 in the tens place
+   0 - 0 x 4 = 0         # quotient digit 0 in the ones place
+
+   So a dividend with n digits takes at most n x (base - 1) subtractions instead of dividend / divisor.
+   With base=2 this is the 'restoring division' circuit used inside computers.'''
+
+DivisionStep = namedtuple('DivisionStep', ['place', 'digit', 'subtracted', 'remainder'])
+
+def long_quotient_and_remainder(input1, input2, base=10, trace=None):
+    '''returns the quotient and the remainder when input1 is divided by input2, in one pass over
+       the places of the quotient. Gives the same answers as quotient_and_remainder.
+
+       If `trace` is a list, one DivisionStep is appended to it for every place of the quotient,
+       which is what the tutorial shows:
+
+       steps = []
+       long_quotient_and_remainder(960, 4, trace=steps) # (240, 0)
+       steps[0] # DivisionStep(place=2, digit=2, subtracted=800, remainder=160)
+    '''
+    if input2 == 0:
+        raise ZeroDivisionError
+    if input1 < input2:
+        return 0, input1
+    try:
+        dividend, divisor = operator.index(input1), operator.index(input2)
+    except TypeError:
+        # place values only make sense for whole numbers
+        return _fast_quotient_and_remainder(input1, input2)
+    if divisor < 0:
+        raise ValueError('repeatedly subtracting a negative divisor never makes the dividend smaller')
+
+    # the largest group of the divisor that still fits into the dividend
+    place = 0
+    group = divisor
+    while group * base <= dividend:
+        group *= base
+        place += 1
+
+    quotient_so_far = 0
+    remainder_so_far = dividend
+    while place >= 0:
+        digit = 0
+        while remainder_so_far >= group:
+            remainder_so_far -= group
+            digit += 1
+        quotient_so_far = quotient_so_far * base + digit
+        if trace is not None:
+            trace.append(DivisionStep(place, digit, digit * group, remainder_so_far))
+        group //= base
+        place -= 1
+    return quotient_so_far, remainder_so_far
+
+def check_engines(trials=1000, largest=200, seed=0):
+    '''runs every engine-aware function on `trials` random inputs with every engine it accepts and returns a list of
+       (function name, engine, inputs, pedagogical outcome, engine outcome) tuples for the inputs on which an engine
+       disagrees with the pedagogical one. An outcome is either ('value', result, type of result) or ('error', type of exception).
+
+       Inputs are integers between -largest and largest, plus some halves such as 2.5 to exercise the
+       TypeErrors raised by range(), and some decimals such as 0.3 that floats cannot hold exactly, where
+       every subtraction rounds. Keep `largest` modest: the pedagogical engine takes about largest**2 steps.
+
+       For add, multiply and the other functions that count up, only the kinds of the outcomes (the types
+       of the results, or the type of the exception) are compared when an input is a float, since there
+       the engines round floats differently (see before _fast_add).
+
+       check_engines() # []
+    '''
+    generator = random.Random(seed)
+
+    def random_input():
+        kind = generator.random()
+        if kind < 0.1:
+            return generator.randint(-2 * largest, 2 * largest) / 2
+        if kind < 0.2:
+            return generator.randint(-10 * largest, 10 * largest) / 10
+        return generator.randint(-largest, largest)
+
+    def outcome(function, inputs, engine):
+        try:
+            result = function(*inputs, engine=engine)
+        except Exception as error:
+            return ('error', type(error))
+        if function not in division_functions and any(isinstance(number, float) for number in inputs):
+            return ('value', type(result))
+        return ('value', result, type(result))
+
+    def compare(function, inputs, engines):
+        pedagogical = outcome(function, inputs, 'pedagogical')
+        for engine in engines[1:]:
+            other = outcome(function, inputs, engine)
+            if pedagogical != other:
+                disagreements.append((function.__name__, engine, inputs, pedagogical, other))
+
+    division_functions = [quotient, remainder, quotient_and_remainder, quotient_and_remainder2]
+    disagreements = []
+    for _ in range(trials):
+        for function in [add, multiply, multiplication]:
+            compare(function, (random_input(), random_input()), ENGINES)
+
+        for function in division_functions:
+            inputs = (random_input(), random_input())
+            if inputs[1] < 0 <= inputs[0] - inputs[1]:
+                # the pedagogical loop never terminates for these inputs
+                continue
+            compare(function, inputs, DIVISION_ENGINES)
+
+        compare(generalized_addition, tuple(random_input() for _ in range(generator.randint(0, 5))), ENGINES)
+    return disagreements
+
+LONG_DIVISION_OUTPUTS = ('float', 'digit', 'string', 'decimal')
+
+def long_division(numerator, denominator, output='float'):
     '''returns an arbitrarily long prefix from the corresponding decimal expansion.
         use islice to control the accuracy of the answer.
         See https://bocoup.com/blog/long-division-in-javascript
+
+        `output` controls what is yielded after each step:
+
+        'float'   - the prefix as a float. Floats only hold about 17 digits, so past that point
+                    the same float is yielded over and over.
+        'digit'   - just the new digit, exactly as it is written above the dividend. Each digit
+                    takes a constant amount of work, however far the division goes.
+        'string'  - the exact prefix so far, e.g. '3.33'
+        'decimal' - the exact prefix so far as a decimal.Decimal
+
+        list(islice(long_division(10, 3, output='digit'), 4)) # [0, 3, 3, 3]
+        list(islice(long_division(10, 3, output='string'), 4)) # ['0', '3', '3.3', '3.33']
+
+        To get the whole (infinite) expansion at once, use repeating_decimal.
         '''
+    if output not in LONG_DIVISION_OUTPUTS:
+        raise ValueError(f'unknown output {output!r}, expected one of {LONG_DIVISION_OUTPUTS}')
+    return _long_division(numerator, denominator, output)
+
+def _long_division(numerator, denominator, output):
+    if denominator == 0:
+        raise ZeroDivisionError
+    if numerator < 0 or denominator < 0:
+        raise ValueError('long division is done on natural numbers')
     numerator_string = str(numerator)
     numerator_length = len(numerator_string)
     remainder = 0
-    quotient_so_far = ''
+    # the prefix as an integer, and the prefix's digits after leading zeros
+    quotient_so_far = 0
+    digits_so_far = []
     i = 0
 
     while True:
@@ -263,35 +570,320 @@ def long_division(numerator, denominator):
             digit = 0
 
         # append a period when the length of the quotient equals the length of the dividend
-        if i == numerator_length:
-            quotient_so_far = quotient_so_far + "."
+        if i == numerator_length and output in ('string', 'decimal'):
+            if not digits_so_far:
+                digits_so_far.append('0')
+            digits_so_far.append('.')
 
-        quotient_so_far = quotient_so_far + str(math.floor((digit + (remainder * 10)) / denominator))
-        remainder = (digit + (remainder * 10)) % denominator
+        quotient_digit, remainder = divmod(digit + (remainder * 10), denominator)
         i += 1
 
-        yield float(quotient_so_far)
+        if output == 'digit':
+            yield quotient_digit
+        elif output == 'float':
+            quotient_so_far = quotient_so_far * 10 + quotient_digit
+            yield quotient_so_far / 10 ** max(0, i - numerator_length)
+        else:
+            if quotient_digit or digits_so_far:
+                digits_so_far.append(str(quotient_digit))
+            prefix = ''.join(digits_so_far) or '0'
+            yield prefix if output == 'string' else Decimal(prefix)
+
+def decimal_expansion(numerator, denominator):
+    '''returns the decimal expansion of numerator / denominator as three strings: the integer part,
+       the digits after the decimal point that come before the repeating block, and the repeating block.
+
+       decimal_expansion(1, 7) # ('0', '', '142857')
+       decimal_expansion(7, 12) # ('0', '58', '3')
+       decimal_expansion(5, 4) # ('1', '25', '')
+
+       Long division only ever sees the remainders 0, 1, ..., denominator - 1, so once a remainder
+       comes back the digits repeat from there. Once every factor of 2 and 5 in the (reduced) denominator
+       has been used up the expansion starts repeating, so we know where the repeating block starts, and
+       it ends as soon as its first remainder comes back. Only the digits themselves are stored.'''
+    if denominator == 0:
+        raise ZeroDivisionError
+    if numerator < 0 or denominator < 0:
+        raise ValueError('long division is done on natural numbers')
+    integer_part, remainder = divmod(numerator, denominator)
+
+    reduced_denominator = denominator // math.gcd(numerator, denominator)
+    factors_of_two = factors_of_five = 0
+    while reduced_denominator % 2 == 0:
+        reduced_denominator //= 2
+        factors_of_two += 1
+    while reduced_denominator % 5 == 0:
+        reduced_denominator //= 5
+        factors_of_five += 1
+
+    non_repeating = []
+    for _ in range(max(factors_of_two, factors_of_five)):
+        digit, remainder = divmod(remainder * 10, denominator)
+        non_repeating.append(str(digit))
+
+    repeating = []
+    first_remainder = remainder
+    while remainder:
+        digit, remainder = divmod(remainder * 10, denominator)
+        repeating.append(str(digit))
+        if remainder == first_remainder:
+            break
+    return str(integer_part), ''.join(non_repeating), ''.join(repeating)
+
+def repeating_decimal(numerator, denominator):
+    '''returns the exact decimal expansion of numerator / denominator, with the repeating block in brackets:
+
+       repeating_decimal(1, 7) # '0.(142857)'
+       repeating_decimal(1, 6) # '0.1(6)'
+       repeating_decimal(1, 4) # '0.25'
+       repeating_decimal(6, 3) # '2'
+    '''
+    integer_part, non_repeating, repeating = decimal_expansion(numerator, denominator)
+    if repeating:
+        return f'{integer_part}.{non_repeating}({repeating})'
+    if non_repeating:
+        return f'{integer_part}.{non_repeating}'
+    return integer_part
 
 # from itertools import islice
 
 # for digit in islice(long_division(1, 3), 10):
 #     print(digit)
 
-def long_integer_multiplication(x, y):
+def long_integer_multiplication(x, y, show_partial_products=False):
     '''faster than the repeated addition method, just like long division is faster than the
-       repeated subtraction method.'''
-    string_x = str(x)
-    string_y = str(y)
-    result = 0
-    for i, x in enumerate(string_x[::-1]):
-        for j, y in enumerate(string_y[::-1]):
-            result += (10 ** (i + j)) * int(x) * int(y)
+       repeated subtraction method.
+
+       The numbers are written as lists of digits (four decimal digits per list entry, called a 'limb')
+       and multiplied the way it is done on paper: every limb of x times every limb of y. For long
+       numbers this switches to Karatsuba's and then Toom's trick, which split each number into two
+       or three pieces and get away with fewer multiplications of the pieces (see _multiply_limbs).
+
+       With show_partial_products=True, also returns the rows written down in school, one row per
+       digit of y, whose sum is the product:
+
+       long_integer_multiplication(123, 45, show_partial_products=True) # (5535, [615, 4920])
+    '''
+    x, y = operator.index(x), operator.index(y)
+    sign = -1 if (x < 0) != (y < 0) else 1
+    product = sign * _from_limbs(_multiply_limbs(_to_limbs(abs(x)), _to_limbs(abs(y))))
+    if not show_partial_products:
+        return product
+    partial_products = [sign * abs(x) * int(digit) * 10 ** place for place, digit in enumerate(str(abs(y))[::-1])]
+    return product, partial_products
+
+'''Limb arithmetic used by long_integer_multiplication. A number is a list of limbs, least significant
+   limb first, in base LIMB_BASE. While multiplying we never carry: a list of limbs is treated as a
+   polynomial whose coefficients may grow past LIMB_BASE or even become negative, and the carries are
+   only done once, by _from_limbs, at the very end.
+
+   The cutoffs are in limbs and were chosen with benchmarks/multiplication.py.'''
+
+LIMB_DIGITS = 4
+LIMB_BASE = 10 ** LIMB_DIGITS
+KARATSUBA_CUTOFF = 64
+TOOM3_CUTOFF = 96
+
+def _to_limbs(number, length=0):
+    '''returns the limbs of a non-negative integer, padded with zero limbs up to `length`.
+       Long numbers are split in half with divmod first, since peeling off one limb at a time
+       would be quadratic (and str() refuses numbers with more than a few thousand digits).'''
+    if number < LIMB_BASE ** 64:
+        limbs = []
+        while number:
+            number, limb = divmod(number, LIMB_BASE)
+            limbs.append(limb)
+    else:
+        half = (number.bit_length() * 3 // 10 // LIMB_DIGITS + 1) // 2
+        high, low = divmod(number, LIMB_BASE ** half)
+        limbs = _to_limbs(low, half) + _to_limbs(high)
+    return limbs + [0] * (length - len(limbs))
+
+def _from_limbs(limbs):
+    '''returns the integer represented by a list of (possibly uncarried) limbs'''
+    return _join_limbs(_carry_limbs(limbs))
+
+def _carry_limbs(limbs):
+    '''returns the same number as a list of limbs that are all between 0 and LIMB_BASE - 1'''
+    carried = []
+    carry = 0
+    for limb in limbs:
+        carry, limb = divmod(limb + carry, LIMB_BASE)
+        carried.append(limb)
+    if carry < 0:
+        raise ValueError('limbs represent a negative number')
+    while carry:
+        carry, limb = divmod(carry, LIMB_BASE)
+        carried.append(limb)
+    return carried
+
+def _join_limbs(limbs):
+    '''returns the integer represented by a list of carried limbs'''
+    if len(limbs) <= 64:
+        number = 0
+        for limb in reversed(limbs):
+            number = number * LIMB_BASE + limb
+        return number
+    half = len(limbs) // 2
+    return _join_limbs(limbs[:half]) + _join_limbs(limbs[half:]) * LIMB_BASE ** half
+
+def _add_limbs(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    return [u + v for u, v in zip(a, b)] + a[len(b):]
+
+def _subtract_limbs(a, b):
+    if len(a) >= len(b):
+        return [u - v for u, v in zip(a, b)] + a[len(b):]
+    return [u - v for u, v in zip(a, b)] + [-v for v in b[len(a):]]
+
+def _scale_limbs(a, factor):
+    return [factor * u for u in a]
+
+def _add_shifted(result, a, offset):
+    '''adds the limbs of `a`, moved up `offset` places, into `result` in place'''
+    for i, u in enumerate(a, offset):
+        result[i] += u
+
+def _multiply_limbs(a, b, karatsuba_cutoff=KARATSUBA_CUTOFF, toom3_cutoff=TOOM3_CUTOFF):
+    '''returns the uncarried limbs of the product of two lists of limbs'''
+    if not a or not b:
+        return []
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) < karatsuba_cutoff:
+        return _schoolbook_multiplication(a, b)
+    if len(a) >= 2 * len(b):
+        # very different lengths: cut the longer number into pieces as long as the shorter one
+        result = [0] * (len(a) + len(b) - 1)
+        for start in range(0, len(a), len(b)):
+            _add_shifted(result, _multiply_limbs(a[start:start + len(b)], b, karatsuba_cutoff, toom3_cutoff), start)
+        return result
+    if len(b) < toom3_cutoff:
+        return _karatsuba_multiplication(a, b, karatsuba_cutoff, toom3_cutoff)
+    return _toom3_multiplication(a, b, karatsuba_cutoff, toom3_cutoff)
+
+def _schoolbook_multiplication(a, b):
+    '''every limb of a times every limb of b, exactly as on paper'''
+    result = [0] * (len(a) + len(b) - 1)
+    width = len(b)
+    for i, u in enumerate(a):
+        if u:
+            result[i:i + width] = [r + u * v for r, v in zip(result[i:i + width], b)]
     return result
 
-def long_decimal_multiplication(x, y):
-    # ignore decimal point in each number, at it to the result at the end
-    # use logic from long_division to track where the decimal point should go.
-    pass
+def _karatsuba_multiplication(a, b, karatsuba_cutoff, toom3_cutoff):
+    '''writes a = a0 + a1 X and b = b0 + b1 X, and uses
+       (a0 + a1)(b0 + b1) - a0 b0 - a1 b1 = a0 b1 + a1 b0
+       to get the middle term with one multiplication instead of two'''
+    m = len(a) // 2
+    a0, a1, b0, b1 = a[:m], a[m:], b[:m], b[m:]
+    low = _multiply_limbs(a0, b0, karatsuba_cutoff, toom3_cutoff)
+    high = _multiply_limbs(a1, b1, karatsuba_cutoff, toom3_cutoff)
+    middle = _multiply_limbs(_add_limbs(a0, a1), _add_limbs(b0, b1), karatsuba_cutoff, toom3_cutoff)
+    middle = _subtract_limbs(_subtract_limbs(middle, low), high)
+
+    result = [0] * (len(a) + len(b) + 1)
+    _add_shifted(result, low, 0)
+    _add_shifted(result, middle, m)
+    _add_shifted(result, high, 2 * m)
+    return result[:len(a) + len(b) - 1]
+
+def _toom3_multiplication(a, b, karatsuba_cutoff, toom3_cutoff):
+    '''writes a = a0 + a1 X + a2 X^2 and b likewise, multiplies the two polynomials at the five points
+       0, 1, -1, -2 and infinity, and recovers the five coefficients of the product from those values
+       (Bodrato's interpolation sequence). Five multiplications of thirds instead of nine.'''
+    k = (len(a) + 2) // 3
+    a0, a1, a2 = a[:k], a[k:2 * k], a[2 * k:]
+    b0, b1, b2 = b[:k], b[k:2 * k], b[2 * k:]
+
+    def evaluate(p0, p1, p2):
+        p0_plus_p2 = _add_limbs(p0, p2)
+        at_minus_one = _subtract_limbs(p0_plus_p2, p1)
+        at_minus_two = _subtract_limbs(_scale_limbs(_add_limbs(at_minus_one, p2), 2), p0)
+        return p0, _add_limbs(p0_plus_p2, p1), at_minus_one, at_minus_two, p2
+
+    def multiply(u, v):
+        return _multiply_limbs(u, v, karatsuba_cutoff, toom3_cutoff)
+
+    r0, r1, r_minus_1, r_minus_2, r_infinity = map(multiply, evaluate(a0, a1, a2), evaluate(b0, b1, b2))
+
+    # every division below is exact, limb by limb
+    c3 = [u // 3 for u in _subtract_limbs(r_minus_2, r1)]
+    c1 = [u // 2 for u in _subtract_limbs(r1, r_minus_1)]
+    c2 = _subtract_limbs(r_minus_1, r0)
+    c3 = _add_limbs([u // 2 for u in _subtract_limbs(c2, c3)], _scale_limbs(r_infinity, 2))
+    c2 = _subtract_limbs(_add_limbs(c2, c1), r_infinity)
+    c1 = _subtract_limbs(c1, c3)
+
+    result = [0] * (len(a) + len(b) + 4 * k)
+    for power, coefficient in enumerate((r0, c1, c2, c3, r_infinity)):
+        _add_shifted(result, coefficient, power * k)
+    return result[:len(a) + len(b) - 1]
+
+def long_decimal_multiplication(x, y, stream=False):
+    '''returns the exact product of two decimal numbers as a string. The inputs can be strings, ints,
+       decimal.Decimals or floats (a float is taken to mean the decimal it prints as).
+
+       long_decimal_multiplication('0.1', '0.3') # '0.03', where 0.1 * 0.3 gives 0.030000000000000002
+       long_decimal_multiplication('-1.25', '0.40') # '-0.5000'
+
+       Just like on paper, we ignore the decimal point in each number, multiply the two whole numbers
+       that are left with long_integer_multiplication's limbs, and put the decimal point back at the end:
+       the product has as many digits after the point as both inputs together.
+
+       With stream=True, returns a generator that yields the characters of the answer (sign, digits and
+       decimal point) most significant first, without ever building the whole string.
+    '''
+    negative_x, limbs_x, places_x = _decimal_limbs(x)
+    negative_y, limbs_y, places_y = _decimal_limbs(y)
+    limbs = _carry_limbs(_multiply_limbs(limbs_x, limbs_y))
+    while limbs and not limbs[-1]:
+        limbs.pop()
+    characters = _decimal_characters(limbs, places_x + places_y, negative_x != negative_y)
+    if stream:
+        return characters
+    return ''.join(characters)
+
+def _decimal_limbs(number):
+    '''returns (is negative, limbs of the digits without the decimal point, digits after the decimal point)'''
+    if not isinstance(number, Decimal):
+        number = Decimal(str(number))
+    if not number.is_finite():
+        raise ValueError(f'{number} does not have a decimal expansion')
+    sign, digits, exponent = number.as_tuple()
+    places = -exponent
+    if places < 0:
+        # e.g. 12E+3: write out the zeros
+        digits, places = digits + (0,) * -places, 0
+    limbs = []
+    for end in range(len(digits), 0, -LIMB_DIGITS):
+        limb = 0
+        for digit in digits[max(0, end - LIMB_DIGITS):end]:
+            limb = limb * 10 + digit
+        limbs.append(limb)
+    return bool(sign), limbs, places
+
+def _decimal_characters(limbs, places, negative):
+    '''yields the characters of a decimal number given its carried limbs (without leading zero limbs)
+       and the number of digits after the decimal point'''
+    if not limbs:
+        limbs, negative = [0], False
+    digit_count = len(str(limbs[-1])) + LIMB_DIGITS * (len(limbs) - 1)
+    if negative:
+        yield '-'
+    if places >= digit_count:
+        yield '0'
+        yield '.'
+        yield from '0' * (places - digit_count)
+    digits_before_point = digit_count - places
+    position = 0
+    for i in range(len(limbs) - 1, -1, -1):
+        for digit in (str(limbs[i]) if i == len(limbs) - 1 else f'{limbs[i]:0{LIMB_DIGITS}d}'):
+            if position == digits_before_point > 0:
+                yield '.'
+            yield digit
+            position += 1
 
 
 '''The above algorithms all compute functions that map N x N --> N.
@@ -328,4 +920,188 @@ def multiply_integers(x, y):
     else: 
         return x + multiply_integers(x, y - 1)
 
-'''todo: convert the new recursive algorithms into iterative form'''
\ No newline at end of file
+'''Python gives up on the recursive definitions above once they are about 1000 calls deep, and every call
+   costs a Python frame. Instead of rewriting each definition by hand into iterative form, we can keep
+   the definitions exactly as written and change how they are run.
+
+   Below, each recursive definition is repeated with its recursive call replaced by a `yield` of the
+   arguments it wants to recurse on. The value of the yield expression is the result of that recursive
+   call. run_recursive() drives these generators with an explicit stack instead of Python's call stack,
+   so there is no depth limit:
+
+   run_recursive(add_integers, 5, -100000) # -99995
+
+   Each definition also comes with a 'jump' that knows how many unary steps it will take before reaching
+   its base case (subtract_one applied number2 times, the divisor subtracted a // b times, ...) and
+   what all of those steps add up to. With fold=True the runner takes the jump instead of walking:
+
+   run_recursive(multiply_recursive, 3, 10**7, fold=True) # 30000000
+
+   Jumps also recognise inputs that never reach a base case and raise the RecursionError the recursive
+   definitions would have raised. Without folding such inputs run until memory runs out.'''
+
+def _add_recursive_generator(number1, number2):
+    if number2 == 0:
+        return number1
+    return add_one((yield number1, subtract_one(number2)))
+
+def _multiply_recursive_generator(number1, number2):
+    if number2 == 0:
+        return 0
+    return add(number1, (yield number1, subtract_one(number2)))
+
+def _division_generator(a, b):
+    if a < b:
+        return 0
+    return 1 + (yield a - b, b)
+
+def _add_integers_generator(x, y):
+    if y > 0:
+        return (yield x, y - 1) + 1
+    elif y < 0:
+        return (yield x, y + 1) - 1
+    else:
+        return x
+
+def _subtract_integers_generator(x, y):
+    if y > 0:
+        return (yield x, y - 1) - 1
+    elif y < 0:
+        return (yield x, y + 1) + 1
+    else:
+        return x
+
+def _multiply_integers_generator(x, y):
+    if x == 0 or y == 0:
+        return 0
+    elif y < 0:
+        return -x + (yield x, y + 1)
+    else:
+        return x + (yield x, y - 1)
+
+def _exact(*values):
+    '''whether arithmetic on all the values is exact. A float rounds after every step, so adding 1
+       three times can give a different float from adding 3 once, and a jump must not change results.'''
+    return all(isinstance(value, numbers.Rational) for value in values)
+
+def _whole_steps(count, name):
+    '''returns `count` as an int, since stepping by 1 from anything else never lands on 0'''
+    if count % 1 != 0:
+        raise RecursionError(f'{name} never reaches its base case when stepping from {count!r} by 1')
+    return int(count)
+
+def _add_recursive_jump(number1, number2):
+    if number2 == 0:
+        return None
+    if number2 < 0:
+        raise RecursionError('add_recursive never reaches its base case when number2 is negative')
+    count = _whole_steps(number2, 'add_recursive')
+    if not _exact(number1):
+        return None
+    return (number1, 0), (lambda result: result + count)
+
+def _multiply_recursive_jump(number1, number2):
+    if number2 == 0:
+        return None
+    if number2 < 0:
+        raise RecursionError('multiply_recursive never reaches its base case when number2 is negative')
+    count = _whole_steps(number2, 'multiply_recursive')
+    try:
+        step = operator.index(number1)
+    except TypeError:
+        # add() would reject number1 part of the way up; let the literal steps raise it
+        return None
+    if step >= 0:
+        return (number1, 0), (lambda result: result + count * step)
+    # add() ignores a negative second input, so after the first step the result stays at number1
+    return (number1, 0), (lambda result: add(number1, result, engine='fast'))
+
+def _division_jump(a, b):
+    if a < b:
+        return None
+    if b <= 0:
+        raise RecursionError('division never reaches its base case when the divisor is not positive')
+    if not _exact(a, b):
+        return None
+    count = int(a // b)
+    return (a - count * b, b), (lambda result: result + count)
+
+def _add_integers_jump(x, y):
+    if y == 0:
+        return None
+    step = _whole_steps(y, 'add_integers')
+    if not _exact(x):
+        return None
+    return (x, 0), (lambda result: result + step)
+
+def _subtract_integers_jump(x, y):
+    if y == 0:
+        return None
+    step = _whole_steps(y, 'subtract_integers')
+    if not _exact(x):
+        return None
+    return (x, 0), (lambda result: result - step)
+
+def _multiply_integers_jump(x, y):
+    if x == 0 or y == 0:
+        return None
+    step = _whole_steps(y, 'multiply_integers')
+    if not _exact(x):
+        return None
+    return (x, 0), (lambda result: result + x * step)
+
+_RECURSIVE_DEFINITIONS = {
+    add_recursive: (_add_recursive_generator, _add_recursive_jump),
+    multiply_recursive: (_multiply_recursive_generator, _multiply_recursive_jump),
+    division: (_division_generator, _division_jump),
+    add_integers: (_add_integers_generator, _add_integers_jump),
+    subtract_integers: (_subtract_integers_generator, _subtract_integers_jump),
+    multiply_integers: (_multiply_integers_generator, _multiply_integers_jump),
+}
+
+def run_recursive(definition, *arguments, fold=False):
+    '''computes definition(*arguments) for one of the recursive definitions above without using
+       Python's call stack. With fold=True, runs of unary steps are taken in a single jump.
+
+       run_recursive(division, 10**6, 3) # 333333
+    '''
+    try:
+        steps, jump = _RECURSIVE_DEFINITIONS[definition]
+    except KeyError:
+        raise ValueError(f'{getattr(definition, "__name__", definition)!r} has no stack-free form') from None
+
+    # calls waiting for the result of a recursive call: suspended generators or folded jumps
+    waiting = []
+    while True:
+        # go down until some call reaches its base case
+        while True:
+            if fold:
+                shortcut = jump(*arguments)
+                if shortcut is not None:
+                    arguments, finish_jump = shortcut
+                    waiting.append(finish_jump)
+                    continue
+            call = steps(*arguments)
+            try:
+                arguments = next(call)
+            except StopIteration as base_case:
+                result = base_case.value
+                break
+            waiting.append(call)
+
+        # come back up, handing each result to the call that asked for it
+        while waiting:
+            caller = waiting.pop()
+            if not isinstance(caller, types.GeneratorType):
+                result = caller(result)
+                continue
+            try:
+                arguments = caller.send(result)
+            except StopIteration as finished:
+                result = finished.value
+            else:
+                # the caller made another recursive call, so go down again
+                waiting.append(caller)
+                break
+        else:
+            return result
\ No newline at end of file
@@ -0,0 +1,128 @@
+'''array versions of the functions in arithmetic_algorithms.py, for checking many answers at once.
+
+   Each function takes NumPy arrays (or lists) of operands and returns an array of results, computing
+   the same thing as the function of the same name in arithmetic_algorithms.py applied to each pair:
+
+   import numpy as np
+   add(np.array([2, 5]), np.array([3, -1])) # array([5, 5]), since add ignores a negative second input
+   quotient_and_remainder(np.array([17, 3]), np.array([5, 5])) # (array([3, 0]), array([2, 3]))
+
+   The work is done on int64 arrays at C speed. If an answer would not fit into an int64, the whole
+   batch is redone on arrays of Python ints (dtype=object), which is slower but exact, so the dtype of
+   the result tells you which of the two happened.
+'''
+
+import numbers
+
+import numpy as np
+
+INT64_MIN = np.iinfo(np.int64).min
+INT64_MAX = np.iinfo(np.int64).max
+
+def _integer_operands(*operands):
+    '''returns the operands as broadcast int64 arrays, or as object arrays of Python ints
+       if some operand does not fit into an int64'''
+    arrays = [np.asarray(operand) for operand in operands]
+    for array in arrays:
+        if array.dtype.kind not in 'biuO':
+            # the loops in arithmetic_algorithms.py pass their inputs to range(), which only takes integers
+            raise TypeError(f'expected integers, got an array of {array.dtype}')
+    try:
+        if any(array.dtype.kind == 'O' for array in arrays):
+            raise TypeError('operands are already Python ints')
+        arrays = [array.astype(np.int64, casting='safe') for array in arrays]
+    except TypeError:
+        # e.g. uint64 values above INT64_MAX, or numbers too big for any NumPy integer
+        arrays = [_as_python_ints(array) for array in arrays]
+    return np.broadcast_arrays(*arrays)
+
+def _as_python_int(value):
+    if not isinstance(value, numbers.Integral):
+        # int() would quietly cut 2.5 down to 2
+        raise TypeError(f'expected integers, got {value!r}')
+    return int(value)
+
+def _as_python_ints(array):
+    '''returns an object array holding Python ints, raising TypeError if some element is not an integer'''
+    return np.vectorize(_as_python_int, otypes=[object])(array) if array.size else array.astype(object)
+
+def _exact(function, *operands):
+    '''redoes `function` on arrays of Python ints, which cannot overflow'''
+    return function(*[_as_python_ints(operand) for operand in operands])
+
+def _products_may_overflow(number1, number2):
+    '''returns True if some product of number1 and number2 might not fit into an int64.
+       Float products are off by much less than the factor of two of headroom we leave.'''
+    if number1.dtype == object:
+        return False
+    magnitude = np.abs(number1.astype(np.float64)) * np.abs(number2.astype(np.float64))
+    return bool(np.any(magnitude >= 2.0 ** 62))
+
+def add(number1, number2):
+    '''adds each pair of inputs; like add, a negative second input leaves the first input unchanged'''
+    number1, number2 = _integer_operands(number1, number2)
+    if number1.dtype != object and np.any((number2 > 0) & (number1 > INT64_MAX - np.maximum(number2, 0))):
+        return _exact(add, number1, number2)
+    return np.where(number2 > 0, number1 + np.maximum(number2, 0), number1)
+
+def multiply(number1, number2):
+    '''multiplies each pair of inputs; like multiply, a second input below 2 or a negative
+       first input gives back the first input'''
+    number1, number2 = _integer_operands(number1, number2)
+    if _products_may_overflow(number1, number2):
+        return _exact(multiply, number1, number2)
+    return np.where((number2 >= 2) & (number1 > 0), number1 * number2, number1)
+
+def multiplication(input1, input2):
+    '''multiplies each pair of inputs; like multiplication, a negative input counts as 0'''
+    input1, input2 = _integer_operands(input1, input2)
+    if _products_may_overflow(input1, input2):
+        return _exact(multiplication, input1, input2)
+    zero = np.zeros_like(input1)
+    return np.maximum(input1, zero) * np.maximum(input2, zero)
+
+def quotient_and_remainder(input1, input2):
+    '''returns an array of quotients and an array of remainders. Like quotient_and_remainder,
+       an input1 smaller than input2 gives a quotient of 0 and input1 as the remainder.'''
+    input1, input2 = _integer_operands(input1, input2)
+    if np.any(input2 == 0):
+        raise ZeroDivisionError
+    smaller = input1 < input2
+    if np.any(~smaller & (input2 < 0)):
+        raise ValueError('repeatedly subtracting a negative divisor never makes the dividend smaller')
+    # divide by 1 where the answer is not needed, to stay clear of INT64_MIN // -1
+    divisor = np.where(smaller, 1, input2)
+    quotients = np.where(smaller, 0, input1 // divisor)
+    remainders = np.where(smaller, input1, input1 % divisor)
+    return quotients, remainders
+
+def quotient(input1, input2):
+    '''returns an array of quotients, see quotient_and_remainder'''
+    return quotient_and_remainder(input1, input2)[0]
+
+def remainder(input1, input2):
+    '''returns an array of remainders, see quotient_and_remainder'''
+    return quotient_and_remainder(input1, input2)[1]
+
+'''Z x Z --> Z: these are ordinary signed addition, subtraction and multiplication.'''
+
+def add_integers(x, y):
+    '''returns x + y for each pair of integers'''
+    x, y = _integer_operands(x, y)
+    if x.dtype != object and np.any(((y > 0) & (x > INT64_MAX - np.maximum(y, 0))) | ((y < 0) & (x < INT64_MIN - np.minimum(y, 0)))):
+        return _exact(add_integers, x, y)
+    return x + y
+
+def subtract_integers(x, y):
+    '''returns x - y for each pair of integers'''
+    x, y = _integer_operands(x, y)
+    if x.dtype != object and np.any(((y < 0) & (x > INT64_MAX + np.minimum(y, 0))) | ((y > 0) & (x < INT64_MIN + np.maximum(y, 0)))):
+        return _exact(subtract_integers, x, y)
+    return x - y
+
+def multiply_integers(x, y):
+    '''returns x * y for each pair of integers'''
+    x, y = _integer_operands(x, y)
+    if _products_may_overflow(x, y):
+        return _exact(multiply_integers, x, y)
+    return x * y
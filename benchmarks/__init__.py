@@ -0,0 +1,9 @@
+'''benchmarks for the algorithms in this repository.
+
+   Each module can be run on its own from the repository root, for example:
+
+   python -m benchmarks.multiplication
+
+   benchmarks.suite runs the scaling benchmarks for the main algorithms together and compares them
+   with the stored baseline.
+'''
@@ -0,0 +1,50 @@
+'''compares evaluating a circuit one input at a time, through the functions in logic_gates.py or
+   compiled with truth tables, with evaluating it bit-sliced on words, and times checking 16-bit adders
+   against every possible input.
+
+   python -m benchmarks.circuits
+'''
+
+import random
+import time
+
+import numpy as np
+
+from circuit_compiler import compile_circuit
+from circuits import ADDERS, adder_circuit, add_planes, pack_bits, verify
+
+def calls_per_second(function, *arguments, seconds=0.5):
+    start, count = time.perf_counter(), 0
+    while time.perf_counter() - start < seconds:
+        function(*arguments)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def inputs_per_second(circuit, seconds=0.5):
+    '''returns how many inputs per second circuit.simulate, the compiled truth tables and
+       circuit.evaluate get through'''
+    generator = random.Random(0)
+    bits = {wire: generator.randrange(2) for wire in circuit.inputs}
+    one_at_a_time = calls_per_second(circuit.simulate, bits, seconds=seconds)
+    compiled = calls_per_second(compile_circuit(circuit, 'table'), *bits.values(), seconds=seconds)
+
+    numbers = np.random.default_rng(0).integers(0, 2 ** 16, 2 ** 20, dtype=np.uint64)
+    words = dict(zip(circuit.inputs, pack_bits(numbers, 16) + pack_bits(numbers[::-1], 16)))
+    start, count = time.perf_counter(), 0
+    while time.perf_counter() - start < seconds:
+        circuit.evaluate(words)
+        count += len(numbers)
+    return one_at_a_time, compiled, count / (time.perf_counter() - start)
+
+def main():
+    print(f'{"16-bit adder":>16} {"gates":>6} {"one at a time":>16} {"compiled":>16} {"bit-sliced":>16} {"all 2**32 inputs":>18}')
+    for kind in ADDERS:
+        circuit = adder_circuit(16, kind)
+        one_at_a_time, compiled, bit_sliced = inputs_per_second(circuit)
+        start = time.perf_counter()
+        if verify(circuit, add_planes) is not None:
+            raise AssertionError(f'the {kind} adder adds wrong')
+        print(f'{kind:>16} {len(circuit):>6} {one_at_a_time:>12.3g}/sec {compiled:>12.3g}/sec {bit_sliced:>12.3g}/sec {time.perf_counter() - start:>16.1f}s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+'''compares the Complex class of quantum/complex_numbers.py with the way it used to be (with a __dict__ in
+   every object, += and *= making a new object, division going through full complex multiplications,
+   and no way to mix with Python's built-in complex numbers): the memory each number takes, and the
+   time of making a number and of each of the operations.
+
+   python -m benchmarks.complex_numbers
+
+   The two classes run in turns and the median of the fastest times of each round is shown, since on
+   a busy machine single runs wander by more than the differences we are looking for. A dash means the
+   old class could not do it.
+'''
+
+import statistics
+import sys
+import timeit
+
+from quantum.complex_numbers import Complex
+
+class OldComplex():
+    '''the parts of Complex timed below, the way they used to be'''
+    def __init__(self, x, y=0.0):
+        self.x = x
+        self.y = y
+
+    def __add__(self, other):
+        return OldComplex(other.x + self.x, other.y + self.y)
+
+    def __mul__(self, other):
+        return OldComplex(self.x * other.x - self.y * other.y, self.x * other.y + self.y * other.x)
+
+    def __truediv__(self, other):
+        numerator = self * other.complex_conjugate()
+        denominator = other * other.complex_conjugate()
+        return numerator.scalar_multiplication(1/denominator.x)
+
+    def scalar_multiplication(self, scalar):
+        return OldComplex(scalar * self.x, scalar * self.y)
+
+    def complex_conjugate(self):
+        return OldComplex(self.x , -self.y)
+
+    def modulus_squared(self):
+        return (self * self.complex_conjugate()).x
+
+# name: (the statement to time, whether the old class can run it). b has modulus 1, so a *= b neither
+# overflows nor underflows however often it runs.
+STATEMENTS = {
+    'kind(0.3, 0.4)': ('kind(0.3, 0.4)', True),
+    'a + b': ('a + b', True),
+    'a * b': ('a * b', True),
+    'a / b': ('a / b', True),
+    'a += b': ('a += b', True),
+    'a *= b': ('a *= b', True),
+    'a.modulus_squared()': ('a.modulus_squared()', True),
+    'a * 2.0': ('a * 2.0', False),
+    'a * 1j': ('a * 1j', False),
+    '1j + a': ('1j + a', False),
+    'complex(a)': ('complex(a)', False),
+}
+
+def size(number):
+    '''returns the bytes a number takes, counting its __dict__ if it has one'''
+    return sys.getsizeof(number) + (sys.getsizeof(number.__dict__) if hasattr(number, '__dict__') else 0)
+
+def seconds(statement, kind, number):
+    '''returns the fastest of a few runs of the statement, per run, with a and b numbers of the kind'''
+    setup = 'a, b = kind(0.3, 0.4), kind(0.6, 0.8)'
+    return min(timeit.repeat(statement, setup, globals={'kind': kind}, number=number, repeat=3)) / number
+
+def run(rounds=7, number=50000):
+    '''returns {name: (old seconds or None, seconds)} for every statement'''
+    times = {name: ([], []) for name in STATEMENTS}
+    for _ in range(rounds):
+        for name, (statement, old_can) in STATEMENTS.items():
+            if old_can:
+                times[name][0].append(seconds(statement, OldComplex, number))
+            times[name][1].append(seconds(statement, Complex, number))
+    return {name: (statistics.median(old) if old else None, statistics.median(new)) for name, (old, new) in times.items()}
+
+def main():
+    print(f'{"":>22} {"old Complex":>12} {"Complex":>12}')
+    print(f'{"bytes per number":>22} {size(OldComplex(1.0, 2.0)):>12} {size(Complex(1.0, 2.0)):>12}')
+    for name, (old, new) in run().items():
+        old = f'{old * 1e9:>9.0f} ns' if old is not None else f'{"-":>12}'
+        print(f'{name:>22} {old} {new * 1e9:>9.0f} ns')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+'''measures what one Fraction operation costs: the time it takes, how many objects it creates along
+   the way, and how much memory the result keeps.
+
+   python -m benchmarks.fraction_benchmarks
+
+   Objects created are counted by tracing the Python instructions that make a new object (arithmetic
+   on ints, calls) while the operation runs, so a gcd computed in a Python loop counts every remainder,
+   while math.gcd counts once. Memory kept per result comes from tracemalloc.
+'''
+
+import dis
+import gc
+import operator
+import random
+import sys
+import timeit
+import tracemalloc
+
+from fraction_algorithms import Fraction
+
+OPERATIONS = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'truediv': operator.truediv,
+}
+
+ALLOCATING_INSTRUCTIONS = {dis.opmap[name] for name in ('BINARY_OP', 'CALL') if name in dis.opmap}
+
+def random_fractions(count, digits, seed=0):
+    generator = random.Random(seed)
+    return [Fraction(generator.randrange(1, 10 ** digits), generator.randrange(1, 10 ** digits)) for _ in range(count)]
+
+def objects_created(operation, a, b):
+    '''returns how many object-creating instructions run while computing operation(a, b)'''
+    count = 0
+
+    def trace(frame, event, argument):
+        nonlocal count
+        frame.f_trace_opcodes = True
+        if event == 'opcode' and frame.f_code.co_code[frame.f_lasti] in ALLOCATING_INSTRUCTIONS:
+            count += 1
+        return trace
+
+    sys.settrace(trace)
+    try:
+        operation(a, b)
+    finally:
+        sys.settrace(None)
+    # the call of operation itself
+    return count + 1
+
+def bytes_kept(operation, fractions):
+    '''returns the memory kept alive by one result, in bytes'''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [operation(a, b) for a, b in zip(fractions, fractions[1:])]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before - sys.getsizeof(results)) / len(results)
+
+def measure(name, digits=12, count=2000):
+    operation = OPERATIONS[name]
+    fractions = random_fractions(count + 1, digits)
+    pairs = list(zip(fractions, fractions[1:]))
+    seconds = min(timeit.repeat(lambda: [operation(a, b) for a, b in pairs], number=5, repeat=3)) / (5 * count)
+    created = sum(objects_created(operation, a, b) for a, b in pairs[:200]) / 200
+    return seconds, created, bytes_kept(operation, fractions)
+
+def main():
+    print(f'{"operation":>10} {"time":>10} {"objects created":>16} {"bytes kept":>11}')
+    for name in OPERATIONS:
+        seconds, created, kept = measure(name)
+        print(f'{name:>10} {seconds * 1e6:>8.2f}us {created:>16.1f} {kept:>11.1f}')
+
+if __name__ == '__main__':
+    main()
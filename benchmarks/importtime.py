@@ -0,0 +1,124 @@
+'''times how long the modules of the repository take to import, with python -X importtime, and checks
+   that importing them does not pull in heavy libraries they only need for demos or on first use.
+
+   python -m benchmarks.importtime            # run and compare against benchmarks/importtime.json
+   python -m benchmarks.importtime --save     # run and store the results as the new baseline
+
+   Every import runs in a fresh interpreter, a few times, and the fastest run counts. An import counts as
+   a regression when it is slower than the baseline by more than the threshold (and by more than
+   MINIMUM_MILLISECONDS, since small imports are noisy), or when it imports a library it must not. The
+   command exits with status 1 if anything regressed, so it can gate changes. Baselines are only
+   comparable on the same machine.
+'''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'importtime.json')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = ['calculus', 'mishnah', 'number_line', 'python_interpreter', 'quantum', 'set_theory']
+
+# what Django loads when the site starts: the settings, the URLs and through them the views
+DJANGO_STARTUP = ("import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'royal_road_project.settings'); "
+                  "import django; django.setup(); import royal_road_project.urls; "
+                  + '; '.join(f'import {app}.views' for app in APPS))
+
+# name: (the code to time, the libraries it must not import)
+IMPORTS = {
+    'arithmetic_algorithms': ('import arithmetic_algorithms', ['numpy', 'sympy']),
+    'fraction_algorithms': ('import fraction_algorithms', ['numpy', 'sympy']),
+    'fraction_arrays': ('import fraction_arrays', ['sympy']),
+    'logic_gates': ('import logic_gates', ['numpy', 'sympy']),
+    'circuits': ('import circuits', ['sympy']),
+    'calculus.infinite_sequences': ('import calculus.infinite_sequences', ['sympy']),
+    'mishnah.trees': ('import mishnah.trees', ['anytree', 'graphviz']),
+    'quantum.complex_numbers': ('import quantum.complex_numbers', ['sympy']),
+    'django startup': (DJANGO_STARTUP, ['sympy', 'anytree', 'numpy']),
+}
+
+MINIMUM_MILLISECONDS = 2
+
+MARKER = 'importtime starts here'
+
+def import_time(code):
+    '''runs `code` in a fresh interpreter and returns (milliseconds, the names of the modules it imported),
+       leaving out what the interpreter imports when it starts. Raises ImportError if the code fails.'''
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import sys; sys.stderr.write({MARKER!r} + "\\n"); {code}'],
+                             cwd=ROOT, capture_output=True, text=True)
+    lines = process.stderr.split(MARKER + '\n', 1)[-1].splitlines()
+    if process.returncode != 0:
+        raise ImportError(lines[-1] if lines else f'exit status {process.returncode}')
+    microseconds, modules = 0, set()
+    for line in lines:
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            modules.add(name.strip())
+            # only modules imported directly by the code count, the ones they import are included in them
+            if not name[1:].startswith(' '):
+                microseconds += int(cumulative)
+    return microseconds / 1e3, modules
+
+def run(names, repeat=5):
+    '''returns {name: {'milliseconds': ..., 'forbidden': [...]}} for the named imports, and the names of
+       the ones that could not run (usually because Django is not installed)'''
+    results, skipped = {}, {}
+    for name in names:
+        code, forbidden = IMPORTS[name]
+        try:
+            runs = [import_time(code) for _ in range(repeat)]
+        except ImportError as error:
+            skipped[name] = str(error)
+            continue
+        modules = set().union(*(modules for _, modules in runs))
+        results[name] = {'milliseconds': min(milliseconds for milliseconds, _ in runs),
+                         'forbidden': sorted(library for library in forbidden if library in modules)}
+    return results, skipped
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='time the imports of the modules in this repository')
+    parser.add_argument('--only', action='append', choices=sorted(IMPORTS), help='time just this import (can be repeated)')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON file to compare against or save to')
+    parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown before failing, 0.5 means 50%% slower')
+    parser.add_argument('--repeat', type=int, default=5, help='how many times to run each import')
+    options = parser.parse_args(arguments)
+
+    results, skipped = run(options.only or list(IMPORTS), options.repeat)
+    baseline = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+
+    regressions = []
+    for name, result in results.items():
+        line = f'{name:>28} {result["milliseconds"]:9.1f} ms'
+        if name in baseline:
+            before = baseline[name]['milliseconds']
+            line += f'  ({result["milliseconds"] / before:.2f}x the baseline {before:.1f} ms)'
+            if result['milliseconds'] > before * (1 + options.threshold) and result['milliseconds'] - before > MINIMUM_MILLISECONDS:
+                regressions.append(name)
+        if result['forbidden']:
+            line += '  imports ' + ', '.join(result['forbidden'])
+            regressions.append(name)
+        print(line)
+    for name, error in skipped.items():
+        print(f'{name:>28}   skipped: {error}')
+
+    if options.save:
+        baseline.update(results)
+        with open(options.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f'saved baseline to {options.baseline}')
+    elif regressions:
+        print('regressed: ' + ', '.join(dict.fromkeys(regressions)))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+'''times asking for the limits of the lessons through calculus/limits.py: the first time (when sympy works
+   them out), again in the same process, again after a restart (from the database on disk), and written
+   differently (found through the canonical form), against calling sym.limit every time.
+
+   python -m benchmarks.limits
+'''
+
+import os
+import tempfile
+import time
+
+import sympy as sym
+
+from calculus import limits
+
+inp = sym.Symbol('input')
+x = sym.Symbol('x')
+
+# each limit, and the same limit written differently
+LIMITS = {
+    '1 / input': (1 / inp, (x + 1) / x - 1, sym.oo),
+    '1 + 1 / input': (1 + 1 / inp, (x ** 2 + x + 1) / x ** 2 - 1 / x ** 2 + 1 - 1 / x, sym.oo),
+    'sin(input) / input': (sym.sin(inp) / inp, 2 * sym.sin(x) * sym.cos(x) / (x * sym.cos(x)) / 2, 0),
+    '(1 + 1 / input) ** input': ((1 + 1 / inp) ** inp, ((x + 1) / x) ** x, sym.oo),
+}
+
+def microseconds(function, *arguments):
+    start = time.perf_counter()
+    function(*arguments)
+    return (time.perf_counter() - start) * 1e6
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), 'limits.sqlite3')
+    print(f'{"limit":>26} {"sym.limit":>12} {"first time":>12} {"in memory":>12} {"on disk":>12} {"rewritten":>12}')
+    for name, (expression, rewritten, point) in LIMITS.items():
+        variable = expression.free_symbols.pop()
+        direct = microseconds(sym.limit, expression, variable, point)
+        first = microseconds(limits.limit, expression, variable, point, '+', path)
+        in_memory = microseconds(limits.limit, expression, variable, point, '+', path)
+        # a new worker process starts with nothing in memory
+        limits.forget()
+        on_disk = microseconds(limits.limit, expression, variable, point, '+', path)
+        found = microseconds(limits.limit, rewritten, x, point, '+', path)
+        print(f'{name:>26} {direct:>9.0f} us {first:>9.0f} us {in_memory:>9.0f} us {on_disk:>9.0f} us {found:>9.0f} us')
+
+if __name__ == '__main__':
+    main()
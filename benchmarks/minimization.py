@@ -0,0 +1,92 @@
+'''minimizes a few circuits built the long way by hand and reports their gate counts and evaluation
+   times before and after, checking every input to make sure nothing changed. Outputs that depend on too
+   many inputs to try them all (like the top bits of the 24-bit adder) are only tried on random inputs,
+   and the check says 'not certain' if those agree (the table says so, so the warning is not shown).
+
+   python -m benchmarks.minimization
+'''
+
+import warnings
+
+from circuit_minimization import minimization_report
+from circuits import Circuit, adder_circuit
+
+# which of the segments a to g of a seven-segment display light up for each digit
+SEGMENTS = {
+    0: 'abcdef', 1: 'bc', 2: 'abdeg', 3: 'abcdg', 4: 'bcfg',
+    5: 'acdfg', 6: 'acdefg', 7: 'abc', 8: 'abcdefg', 9: 'abcdfg',
+}
+
+def nand_xor(circuit, a, b):
+    '''the textbook XOR out of four NANDs'''
+    both = circuit.add_gate('NAND', a, b)
+    return circuit.add_gate('NAND', circuit.add_gate('NAND', a, both), circuit.add_gate('NAND', b, both))
+
+def nand_parity(width):
+    '''returns a circuit whose output is 1 when an odd number of its inputs are, with XORs out of NANDs'''
+    circuit = Circuit()
+    bits = circuit.input_bus('x', width)
+    parity = bits[0]
+    for bit in bits[1:]:
+        parity = nand_xor(circuit, parity, bit)
+    circuit.output_bus('p', [parity])
+    return circuit
+
+def nand_adder(width):
+    '''returns a ripple-carry adder whose full adders are nine NANDs each'''
+    circuit = Circuit()
+    a, b = circuit.input_bus('a', width), circuit.input_bus('b', width)
+    carry = circuit.add_gate('AND', a[0], circuit.add_gate('NOT', a[0]))
+    sums = []
+    for x, y in zip(a, b):
+        both = circuit.add_gate('NAND', x, y)
+        partial = circuit.add_gate('NAND', circuit.add_gate('NAND', x, both), circuit.add_gate('NAND', y, both))
+        partial_and_carry = circuit.add_gate('NAND', partial, carry)
+        sums.append(circuit.add_gate('NAND', circuit.add_gate('NAND', partial, partial_and_carry),
+                                     circuit.add_gate('NAND', carry, partial_and_carry)))
+        carry = circuit.add_gate('NAND', both, partial_and_carry)
+    circuit.output_bus('s', sums + [carry])
+    return circuit
+
+def seven_segment_decoder():
+    '''returns a decoder from a digit 0-9 in binary to the seven segments, written out digit by digit:
+       every segment is an OR of one AND of all four inputs (or their NOTs) for each digit it is lit for'''
+    circuit = Circuit()
+    bits = circuit.input_bus('d', 4)
+    segments = []
+    for segment in 'abcdefg':
+        products = []
+        for digit, lit in SEGMENTS.items():
+            if segment in lit:
+                literals = [bit if digit >> i & 1 else circuit.add_gate('NOT', bit) for i, bit in enumerate(bits)]
+                product = literals[0]
+                for literal in literals[1:]:
+                    product = circuit.add_gate('AND', product, literal)
+                products.append(product)
+        total = products[0]
+        for product in products[1:]:
+            total = circuit.add_gate('OR', total, product)
+        segments.append(total)
+    circuit.output_bus('segments', segments)
+    return circuit
+
+def _verdict(report):
+    if report.counterexample is not None:
+        return 'no'
+    return 'yes' if report.certain else 'not certain'
+
+def main():
+    print(f'{"circuit":>26} {"gates before":>13} {"gates after":>12} {"time before":>12} {"time after":>11} {"equivalent":>11}')
+    for name, circuit in [('seven-segment decoder', seven_segment_decoder()),
+                          ('16-bit parity from NANDs', nand_parity(16)),
+                          ('8-bit adder from NANDs', nand_adder(8)),
+                          ('8-bit lookahead adder', adder_circuit(8, 'lookahead')),
+                          ('24-bit ripple adder', adder_circuit(24))]:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            _, report = minimization_report(circuit)
+        print(f'{name:>26} {report.gates_before:>13} {report.gates_after:>12} {report.seconds_before * 1e3:>9.3f} ms'
+              f' {report.seconds_after * 1e3:>8.3f} ms {_verdict(report):>11}')
+
+if __name__ == '__main__':
+    main()
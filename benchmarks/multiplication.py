@@ -0,0 +1,70 @@
+'''sweeps the cutoffs of long_integer_multiplication, to find where Karatsuba starts beating schoolbook
+   multiplication and where Toom-3 starts beating Karatsuba. The cutoffs in arithmetic_algorithms.py
+   come from these two tables:
+
+   - for each length, Karatsuba used for the top level only (the cutoff set to that length) against
+     schoolbook multiplication;
+   - for each length, Toom-3 used for the top level only, with the shipped Karatsuba cutoff below it,
+     against Karatsuba alone, and the shipped cutoffs against Karatsuba alone.
+
+   A cutoff belongs where the ratio drops below 1 and stays there. The two configurations of a
+   comparison run in turns and the median of their ratios is shown, since on a busy machine the
+   times of single runs wander by more than the differences we are looking for.
+
+   python -m benchmarks.multiplication
+'''
+
+import random
+import statistics
+import timeit
+
+from arithmetic_algorithms import KARATSUBA_CUTOFF, TOOM3_CUTOFF, _multiply_limbs, _to_limbs
+
+NEVER = float('inf')
+
+KARATSUBA_LENGTHS = (16, 24, 32, 40, 48, 56, 64, 96, 128)
+TOOM3_LENGTHS = (64, 80, 96, 128, 160, 192, 256, 384, 512, 768, 1024)
+
+def compare(limbs_x, limbs_y, reference, candidates, rounds):
+    '''returns (median seconds of the reference, {name: median ratio of the candidate to the reference}),
+       where reference and the candidates are (karatsuba_cutoff, toom3_cutoff)'''
+    number = max(1, 2000 // len(limbs_x))
+
+    def seconds(cutoffs):
+        return timeit.timeit(lambda: _multiply_limbs(limbs_x, limbs_y, *cutoffs), number=number) / number
+
+    reference_times, ratios = [], {name: [] for name in candidates}
+    for _ in range(rounds):
+        reference_time = seconds(reference)
+        reference_times.append(reference_time)
+        for name, cutoffs in candidates.items():
+            ratios[name].append(seconds(cutoffs) / reference_time)
+    return statistics.median(reference_times), {name: statistics.median(values) for name, values in ratios.items()}
+
+def sweep(lengths, reference, candidates, rounds=15, seed=0):
+    '''returns a list of (length in limbs, reference seconds, {name: ratio}) rows. candidates(length)
+       returns the configurations to compare at that length.'''
+    generator = random.Random(seed)
+    rows = []
+    for length in lengths:
+        x = generator.randrange(10 ** (4 * length - 1), 10 ** (4 * length))
+        y = generator.randrange(10 ** (4 * length - 1), 10 ** (4 * length))
+        rows.append((length, *compare(_to_limbs(x), _to_limbs(y), reference, candidates(length), rounds)))
+    return rows
+
+def print_table(reference_name, rows):
+    names = list(rows[0][2])
+    print(f'{"limbs":>6} {"digits":>7} {reference_name:>12} ' + ' '.join(f'{name:>12}' for name in names))
+    for length, seconds, ratios in rows:
+        print(f'{length:>6} {4 * length:>7} {seconds * 1e3:>10.3f}ms ' + ' '.join(f'{ratios[name]:>11.3f}x' for name in names))
+
+def main():
+    print(f'Karatsuba for the top level against schoolbook (shipped: KARATSUBA_CUTOFF = {KARATSUBA_CUTOFF})')
+    print_table('schoolbook', sweep(KARATSUBA_LENGTHS, (NEVER, NEVER), lambda length: {'karatsuba': (length, NEVER)}))
+    print()
+    print(f'Toom-3 for the top level against Karatsuba from {KARATSUBA_CUTOFF} limbs (shipped: TOOM3_CUTOFF = {TOOM3_CUTOFF})')
+    print_table('karatsuba', sweep(TOOM3_LENGTHS, (KARATSUBA_CUTOFF, NEVER),
+                                   lambda length: {'toom3': (KARATSUBA_CUTOFF, length), 'shipped': (KARATSUBA_CUTOFF, TOOM3_CUTOFF)}))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+'''compares the derivatives and integrals of calculus/numeric.py with the simple ways of working them out:
+   a single difference quotient with a small h, and adaptive Simpson's rule written recursively, one
+   integral and one point at a time.
+
+   python -m benchmarks.numeric
+'''
+
+import math
+import time
+
+import numpy as np
+
+from calculus.numeric import TOLERANCE, derivative, integrate
+
+def difference_quotient(f, x, h=1e-5):
+    return (f(x + h) - f(x - h)) / (2 * h)
+
+def recursive_simpson(f, a, b, tolerance=TOLERANCE):
+    '''returns (integral, evaluations) with adaptive Simpson's rule, one interval at a time'''
+    evaluations = 3
+
+    def simpson(a, fa, m, fm, b, fb, whole, tolerance):
+        nonlocal evaluations
+        left_middle, right_middle = (a + m) / 2, (m + b) / 2
+        f_left, f_right = f(left_middle), f(right_middle)
+        evaluations += 2
+        left, right = (m - a) / 6 * (fa + 4 * f_left + fm), (b - m) / 6 * (fm + 4 * f_right + fb)
+        if abs(left + right - whole) <= 15 * tolerance:
+            return left + right + (left + right - whole) / 15
+        return (simpson(a, fa, left_middle, f_left, m, fm, left, tolerance / 2)
+                + simpson(m, fm, right_middle, f_right, b, fb, right, tolerance / 2))
+
+    m = (a + b) / 2
+    fa, fm, fb = f(a), f(m), f(b)
+    return simpson(a, fa, m, fm, b, fb, (b - a) / 6 * (fa + 4 * fm + fb), tolerance), evaluations
+
+def main():
+    points = np.linspace(-10, 10, 100001)
+    start = time.perf_counter()
+    estimate = derivative(np.sin, points)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    for x in points[:1000]:
+        derivative(np.sin, x)
+    one_at_a_time = (time.perf_counter() - start) * len(points) / 1000
+    print(f'derivative of sin at {len(points)} points')
+    print(f'    one difference quotient, h = 1e-5: largest error {np.abs(difference_quotient(np.sin, points) - np.cos(points)).max():.1e}')
+    print(f'    Richardson extrapolation:          largest error {np.abs(estimate.value - np.cos(points)).max():.1e},'
+          f' {estimate.evaluations / len(points):.1f} evaluations per point')
+    print(f'    {vectorized * 1e3:.0f} ms for all points at once, {one_at_a_time * 1e3:.0f} ms one point at a time (timed on 1000 of them)')
+
+    print()
+    bounds = np.linspace(0.5, 20, 1000)
+    start = time.perf_counter()
+    estimate = integrate(lambda x: np.sin(x) ** 2 / (1 + x), 0.0, bounds)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [recursive_simpson(lambda x: math.sin(x) ** 2 / (1 + x), 0.0, b) for b in bounds]
+    recursive = time.perf_counter() - start
+    largest_difference = max(abs(value - result) for value, (result, _) in zip(estimate.value, results))
+    print(f'integrals of sin(x)^2 / (1 + x) from 0 to {len(bounds)} different bounds')
+    print(f'    all at once:                {vectorized * 1e3:5.0f} ms, {estimate.evaluations / len(bounds):.0f} evaluations per integral')
+    print(f'    recursively, one at a time: {recursive * 1e3:5.0f} ms, {sum(evaluations for _, evaluations in results) / len(bounds):.0f}'
+          f' evaluations per integral, largest difference {largest_difference:.1e}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+'''compares finding limits by looking at terms with finding them by acceleration: for a few sequences it
+   reports how close each method gets from 256 terms, and how many terms it would take to get as close
+   without acceleration (found with epsilon_n, without computing them all). It also times computing
+   terms one at a time against computing them in vectorized blocks.
+
+   python -m benchmarks.sequences
+'''
+
+import itertools
+import math
+import time
+
+from calculus.infinite_sequences import reciprocal
+from calculus.sequences import METHODS, Sequence
+
+# the most terms epsilon_n looks at, partial sums this long take a while
+LAST = 2 ** 24
+
+SEQUENCES = {
+    '1 + 1/n': (Sequence(lambda n: 1 + 1 / n, vectorized=True), 1),
+    '(1 + 1/n)^n': (Sequence(lambda n: (1 + 1 / n) ** n, vectorized=True), math.e),
+    'sum of 1/n^2': (Sequence(lambda n: 1 / n ** 2, vectorized=True).partial_sums(), math.pi ** 2 / 6),
+    'sum of (-1)^n 4/(2n+1)': (Sequence(lambda n: 4 * (-1.0) ** n / (2 * n + 1), start=0, vectorized=True).partial_sums(), math.pi),
+}
+
+def main():
+    print(f'{"sequence":>24} {"method":>11} {"error":>10} {"terms needed without acceleration":>34}')
+    for name, (sequence, limit) in SEQUENCES.items():
+        for method in METHODS[1:]:
+            result = sequence.limit(method)
+            error = abs(result.value - limit)
+            try:
+                needed = sequence.epsilon_n(max(error, 1e-15), limit, last=LAST)
+            except ValueError:
+                needed = f'more than {LAST:.1e}'
+            print(f'{name:>24} {method:>11} {error:>10.1e} {needed:>34}')
+
+    print()
+    sequence, size = Sequence(reciprocal), 10 ** 6
+    start = time.perf_counter()
+    list(itertools.islice(sequence, size))
+    one_at_a_time = time.perf_counter() - start
+    start = time.perf_counter()
+    Sequence(lambda n: 1 / n, vectorized=True).block(1, size + 1)
+    print(f'{size} terms of 1/n: {one_at_a_time * 1e3:.1f} ms one at a time, {(time.perf_counter() - start) * 1e3:.1f} ms in a block')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+'''times the main algorithms of the repository on inputs of growing size and fits how their running
+   time grows: a time that grows like size ** k shows up as an exponent of about k.
+
+   python -m benchmarks.suite                 # run and compare against benchmarks/baseline.json
+   python -m benchmarks.suite --save          # run and store the results as the new baseline
+   python -m benchmarks.suite --only gram_schmidt --threshold 0.25
+
+   A benchmark counts as a regression when it is slower than the baseline by more than the threshold
+   (0.5 means 50% slower), averaged over all sizes. The command exits with status 1 if any benchmark
+   regressed, so it can gate changes. Baselines are only comparable on the same machine.
+'''
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import timeit
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+'''Each benchmark takes a size and returns a function with no arguments that does the work once.
+   Building the inputs is not timed.'''
+
+def long_integer_multiplication(size):
+    from arithmetic_algorithms import long_integer_multiplication
+    generator = random.Random(size)
+    x = generator.randrange(10 ** (size - 1), 10 ** size)
+    y = generator.randrange(10 ** (size - 1), 10 ** size)
+    return lambda: long_integer_multiplication(x, y)
+
+def fraction_addition(size):
+    '''adds two fractions whose numerators and denominators have `size` digits'''
+    from fraction_algorithms import Fraction
+    generator = random.Random(size)
+    digits = lambda: generator.randrange(10 ** (size - 1), 10 ** size)
+    a, b = Fraction(digits(), digits()), Fraction(digits(), digits())
+    return lambda: a + b
+
+def _random_complex_vector(generator, length):
+    from quantum.complex_numbers import Complex, ComplexVector
+    return ComplexVector([Complex(generator.uniform(-1, 1), generator.uniform(-1, 1)) for _ in range(length)])
+
+def inner_product(size):
+    generator = random.Random(size)
+    u, v = _random_complex_vector(generator, size), _random_complex_vector(generator, size)
+    return lambda: u.inner_product(v)
+
+def gram_schmidt(size):
+    '''orthonormalizes `size` random vectors of length `size`'''
+    from quantum.complex_numbers import gram_schmidt
+    generator = random.Random(size)
+    vectors = [_random_complex_vector(generator, size) for _ in range(size)]
+    return lambda: gram_schmidt(vectors)
+
+def binary_search_tree_insertion(size):
+    '''inserts `size` values in random order into an empty tree'''
+    from mishnah.trees import BinarySearchTree
+    generator = random.Random(size)
+    values = [generator.random() for _ in range(size)]
+
+    def insert_all():
+        tree = BinarySearchTree(values[0])
+        for value in values[1:]:
+            tree.insert_node(value)
+    return insert_all
+
+BENCHMARKS = {
+    'long_integer_multiplication': (long_integer_multiplication, [250, 500, 1000, 2000, 4000]),
+    'fraction_addition': (fraction_addition, [50, 100, 200, 400, 800]),
+    'inner_product': (inner_product, [1000, 2000, 4000, 8000, 16000]),
+    'gram_schmidt': (gram_schmidt, [4, 8, 16, 32]),
+    'binary_search_tree_insertion': (binary_search_tree_insertion, [1000, 2000, 4000, 8000, 16000]),
+}
+
+def best_time(work, repeat=3, minimum_seconds=0.05):
+    '''returns the best time of one call of `work`, in seconds, calling it often enough
+       that each measurement takes at least `minimum_seconds`'''
+    timer = timeit.Timer(work)
+    number = 1
+    while timer.timeit(number) < minimum_seconds and number < 10 ** 6:
+        number *= 4
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def fit_exponent(sizes, seconds):
+    '''returns the slope of the least squares line through the points (log size, log seconds)'''
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(time) for time in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+def run(names):
+    '''returns {name: {'sizes': [...], 'seconds': [...], 'exponent': ...}} for the named benchmarks'''
+    results = {}
+    for name in names:
+        make_work, sizes = BENCHMARKS[name]
+        seconds = [best_time(make_work(size)) for size in sizes]
+        results[name] = {'sizes': sizes, 'seconds': seconds, 'exponent': fit_exponent(sizes, seconds)}
+    return results
+
+def slowdown(result, baseline):
+    '''returns how many times slower `result` is than `baseline` (geometric mean over the shared sizes),
+       or None if they have no sizes in common'''
+    baseline_seconds = dict(zip(baseline['sizes'], baseline['seconds']))
+    ratios = [time / baseline_seconds[size] for size, time in zip(result['sizes'], result['seconds']) if size in baseline_seconds]
+    if not ratios:
+        return None
+    return math.exp(sum(math.log(ratio) for ratio in ratios) / len(ratios))
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='benchmark the algorithms in this repository')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='run just this benchmark (can be repeated)')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON file to compare against or save to')
+    parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown before failing, 0.5 means 50%% slower')
+    options = parser.parse_args(arguments)
+
+    results = run(options.only or list(BENCHMARKS))
+    baseline = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+
+    regressions = []
+    for name, result in results.items():
+        print(f'{name}: time grows like size ** {result["exponent"]:.2f}')
+        for size, time in zip(result['sizes'], result['seconds']):
+            print(f'    {size:>8}  {time * 1e3:12.4f} ms')
+        if name in baseline:
+            ratio = slowdown(result, baseline[name])
+            if ratio is not None:
+                print(f'    {ratio:.2f}x the baseline time (baseline exponent {baseline[name]["exponent"]:.2f})')
+                if ratio > 1 + options.threshold:
+                    regressions.append(name)
+
+    if options.save:
+        baseline.update(results)
+        with open(options.baseline, 'w') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f'saved baseline to {options.baseline}')
+    elif regressions:
+        print('regressed past the threshold: ' + ', '.join(regressions))
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+'''compares ripple-carry and carry-lookahead adders by how long their answers take to settle, and
+   compares the event-driven TimingSimulator with evaluating every gate again after each input change.
+
+   The event-driven simulator wins when a change only reaches a small part of the circuit, like in a
+   bank of independent adders. In an array multiplier a single input bit reaches most of the gates,
+   some of them several times as the signals arrive one after another, so it does not.
+
+   python -m benchmarks.timing
+'''
+
+import random
+import time
+
+from circuit_timing import TimingSimulator, critical_path
+from circuits import ADDERS, Circuit, adder_circuit, multiplier_circuit
+
+def adder_bank(count, width, kind='lookahead'):
+    '''returns a circuit made of `count` separate adders'''
+    circuit = Circuit()
+    for i in range(count):
+        a, b = circuit.input_bus(f'a{i}_', width), circuit.input_bus(f'b{i}_', width)
+        circuit.output_bus(f's{i}_', ADDERS[kind](circuit, a, b))
+    return circuit
+
+def worst_carry(circuit, width):
+    '''returns how long the sum takes to settle when a carry has to travel through every column:
+       a is all 1s and b changes from 0 to 1'''
+    simulator = TimingSimulator(circuit)
+    simulator.apply({f'a{i}': 1 for i in range(width)})
+    return simulator.apply({'b0': 1})
+
+def seconds_per_flip(circuit, flips=200, seed=0):
+    '''flips one random input bit at a time, and returns (seconds per flip for the TimingSimulator,
+       gates it evaluated per flip, seconds per flip evaluating every gate with circuit.simulate)'''
+    generator = random.Random(seed)
+    bits = {wire: generator.randrange(2) for wire in circuit.inputs}
+    simulator = TimingSimulator(circuit)
+    simulator.apply(bits)
+    flipped = [generator.choice(circuit.inputs) for _ in range(flips)]
+
+    evaluations = simulator.evaluations
+    start = time.perf_counter()
+    for wire in flipped:
+        bits[wire] ^= 1
+        simulator.apply({wire: bits[wire]})
+    event_driven = (time.perf_counter() - start) / flips
+    evaluations = (simulator.evaluations - evaluations) / flips
+
+    start = time.perf_counter()
+    for wire in flipped[:5]:
+        bits[wire] ^= 1
+        circuit.simulate(bits)
+    return event_driven, evaluations, (time.perf_counter() - start) / 5
+
+def main():
+    print(f'{"adder":>10} {"width":>6} {"critical path":>14} {"longest carry":>14}')
+    for width in [8, 16, 32, 64]:
+        for kind in ADDERS:
+            circuit = adder_circuit(width, kind)
+            print(f'{kind:>10} {width:>6} {critical_path(circuit)[0]:>14} {worst_carry(circuit, width):>14}')
+
+    print()
+    print(f'{"circuit":>28} {"gates":>8} {"event-driven":>14} {"gates evaluated":>16} {"every gate":>12}')
+    for name, circuit in [('64-bit lookahead adder', adder_circuit(64, 'lookahead')),
+                          ('32-bit multiplier', multiplier_circuit(32)),
+                          ('650 16-bit lookahead adders', adder_bank(650, 16))]:
+        event_driven, evaluations, every_gate = seconds_per_flip(circuit)
+        print(f'{name:>28} {len(circuit):>8} {event_driven * 1e3:>11.3f} ms {evaluations:>16.0f} {every_gate * 1e3:>9.1f} ms')
+
+if __name__ == '__main__':
+    main()
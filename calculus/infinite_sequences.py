@@ -58,8 +58,10 @@ def reciprocal(input):
 '''now that we have our reciprocal function, we want to investigate what happes to the output as the input
    becomes arbitrarily large. We can do this by feeding it larger and larger numbers as input:'''
 
-for input in range(1, 100):
-    print(reciprocal(input))
+def print_reciprocals(last=99):
+    '''prints the output of the reciprocal function for every input from 1 to `last`'''
+    for input in range(1, last + 1):
+        print(reciprocal(input))
 
 '''
 As the input becomes larger and larger, we notice two things:
@@ -100,17 +102,33 @@ def reciprocal_plus_one(input):
     the sympy library: 
 '''
 
-import sympy as sym
+def limit_at_infinity(expression, variable):
+    '''returns the limit of `expression` as `variable` becomes arbitrarily large, worked out by sympy.
 
-inp = sym.Symbol('input')
+       sympy takes a while to import, so it is only imported the first time a limit is needed, and 
+       sympy takes a while to work out a limit, so calculus/limits.py remembers the answers.'''
+    from calculus.limits import limit
+    return limit(expression, variable)
 
-sym.limit(1 / inp, inp, sym.oo) # 0
+def reciprocal_limits():
+    '''returns the limits of h2 and of 1 + h2 as the input becomes arbitrarily large: (0, 1)'''
+    import sympy as sym
+    inp = sym.Symbol('input')
+    return limit_at_infinity(1 / inp, inp), limit_at_infinity(1 + (1 / inp), inp)
 
-'''likewise, we can compute:'''
+'''likewise, the limit of 1 + (1 / input) is 1, which reciprocal_limits() also works out.
 
-expression = 1 + (1 / inp)
+   The fact that two sequences with different domains can have the same limit 
+   will be importnat when we consider the derivative of a real-valued function of a real variable.
 
-sym.limit(expression, inp, sym.oo) # 1
+   To watch the outputs of the reciprocal function shrink, and to see the limits sympy finds, run:
 
-'''The fact that two sequences with different domains can have the same limit 
-   will be importnat when we consider the derivative of a real-valued function of a real variable.'''
\ No newline at end of file
+   python -m calculus.infinite_sequences
+'''
+
+def main():
+    print_reciprocals()
+    print(*reciprocal_limits())
+
+if __name__ == '__main__':
+    main()
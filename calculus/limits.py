@@ -0,0 +1,208 @@
+'''limits worked out by sympy, remembered so each one is only worked out once.
+
+   sym.limit can take hundreds of milliseconds, and the lessons ask for the same handful of limits over
+   and over, so limit() remembers its answers twice over: in a dictionary in this process, and in a
+   small sqlite database on disk that every worker process shares and that survives restarts.
+
+   limit(1 / inp, inp)       # 0, worked out by sympy the first time it is asked for
+   limit(1 / inp, inp)       # 0, straight from memory
+   limit((x + 1) / x - 1, x) # 0, found on disk: it simplifies to the same expression as 1 / inp
+
+   To recognize the same limit written differently, expressions are put in a 'canonical form': the
+   expression is simplified, the variable is renamed to VARIABLE (keeping its assumptions, like
+   positive=True), and the result is written out with srepr, which spells out its whole structure.
+   The database is keyed by a hash of that. Since simplifying takes a while too, the database also
+   remembers the hash of each expression exactly as it was asked for, which is much quicker to find.
+
+   The database keeps at most CACHE_ROWS answers; when it grows past that, the ones used longest ago
+   are forgotten.
+
+   Anyone who can write to the database decides what the answers are, so by default it lives in a
+   directory only the current user can write to (~/.cache/royal_road), and answers are read back by
+   building the expression from the srepr text node by node, out of sympy classes only, without ever
+   handing the text to eval (which sym.sympify would do).
+'''
+
+import ast
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from private_cache import CACHE_ROOT, private_directory
+
+LIMITS_IN_MEMORY = 1024
+CACHE_ROWS = 10000
+CACHE_PATH = os.environ.get('ROYAL_ROAD_LIMIT_CACHE', os.path.join(CACHE_ROOT, 'limits.sqlite3'))
+
+# the name every variable is renamed to in the canonical form
+VARIABLE = 'limit_variable'
+
+DIRECTIONS = ('+', '-', '+-')
+
+# the only sympy classes srepr text may pass a string to, as their first argument
+TAKE_STRINGS = ('Symbol', 'Dummy', 'Function', 'Float')
+
+# the lessons are served from several threads, so _memo, _connections and the connections in it are
+# only used while holding _lock (sympy itself runs outside it)
+_memo = {}
+_connections = {}
+_lock = threading.Lock()
+
+def _hash(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+def canonical_form(expression, variable):
+    '''returns the canonical form of an expression in a variable, as a string:
+
+       canonical_form(1 + 1 / inp, inp) # "Mul(Pow(Symbol('limit_variable', commutative=True), Integer(-1)), Add(...))"
+       canonical_form((x + 1) / x, x)   # the same string
+    '''
+    import sympy as sym
+    expression = sym.sympify(expression)
+    renamed = sym.Symbol(VARIABLE, **variable.assumptions0)
+    return sym.srepr(sym.simplify(expression.xreplace({variable: renamed})))
+
+def from_srepr(text):
+    '''returns the sympy expression written out by sym.srepr, like sym.sympify would but without eval:
+       the text may only call sympy classes and name sympy constants, with numbers, True and False, and
+       strings only where TAKE_STRINGS allows them (sympy would parse any other string
+       as an expression, with eval). Raises ValueError for anything else.
+
+       from_srepr("Add(Symbol('x'), Integer(1))") # x + 1
+    '''
+    import sympy as sym
+
+    def sympy_name(name):
+        value = getattr(sym, name, None) if not name.startswith('_') else None
+        if isinstance(value, sym.Basic) or isinstance(value, type) and issubclass(value, sym.Basic) or name == 'Function':
+            return value
+        # classes sympy does not export, like AccumulationBounds (exported as AccumBounds)
+        if name in _sympy_classes(sym.Basic):
+            return _sympy_classes(sym.Basic)[name]
+        raise ValueError(f'{name!r} is not a sympy class or constant')
+
+    def build(node, strings=False):
+        if isinstance(node, ast.Constant) and (isinstance(node.value, (int, float, bool)) or strings and isinstance(node.value, str)):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -build(node.operand)
+        if isinstance(node, ast.Tuple):
+            return tuple(build(element) for element in node.elts)
+        if isinstance(node, ast.Name):
+            return sympy_name(node.id)
+        if isinstance(node, ast.Call):
+            takes_strings = isinstance(node.func, ast.Name) and node.func.id in TAKE_STRINGS
+            function = sympy_name(node.func.id) if isinstance(node.func, ast.Name) else build(node.func)
+            if not callable(function):
+                raise ValueError(f'{ast.unparse(node.func)} cannot be called')
+            arguments = [build(argument, takes_strings and position == 0) for position, argument in enumerate(node.args)]
+            keywords = {keyword.arg: build(keyword.value) for keyword in node.keywords}
+            if None in keywords:
+                raise ValueError('srepr text never uses **')
+            return function(*arguments, **keywords)
+        raise ValueError(f'{ast.unparse(node)} does not belong in srepr text')
+
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError as error:
+        raise ValueError(f'not srepr text: {error}') from None
+    try:
+        return build(tree.body)
+    except TypeError as error:
+        raise ValueError(f'not srepr text: {error}') from None
+
+def _sympy_classes(basic):
+    '''returns {name: class} for every subclass of sympy's Basic imported so far'''
+    classes, unseen = {}, [basic]
+    while unseen:
+        cls = unseen.pop()
+        classes.setdefault(cls.__name__, cls)
+        unseen.extend(cls.__subclasses__())
+    return classes
+
+def _connection(path):
+    '''returns the connection to the database at path, creating the database if needed'''
+    if path not in _connections:
+        private_directory(os.path.dirname(os.path.abspath(path)))
+        connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # let readers in other processes carry on while one of them writes
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS limits (key TEXT PRIMARY KEY, answer TEXT NOT NULL, used REAL NOT NULL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS limits_used ON limits (used)')
+        _connections[path] = connection
+    return _connections[path]
+
+def _look_up(path, key):
+    '''returns the answer stored under key (as srepr text), or None'''
+    with _lock:
+        connection = _connection(path)
+        row = connection.execute('SELECT answer FROM limits WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            connection.execute('UPDATE limits SET used = ? WHERE key = ?', (time.time(), key))
+    return row and row[0]
+
+def _store(path, keys, answer):
+    '''stores the answer under every one of the keys, then forgets the answers used longest ago if there
+       are more than CACHE_ROWS'''
+    with _lock:
+        connection = _connection(path)
+        now = time.time()
+        connection.executemany('INSERT OR REPLACE INTO limits (key, answer, used) VALUES (?, ?, ?)',
+                               [(key, answer, now) for key in keys])
+        (rows,) = connection.execute('SELECT COUNT(*) FROM limits').fetchone()
+        if rows > CACHE_ROWS:
+            # forget a tenth at a time so this does not happen after every new answer
+            connection.execute('DELETE FROM limits WHERE key IN (SELECT key FROM limits ORDER BY used LIMIT ?)',
+                               (rows - CACHE_ROWS * 9 // 10,))
+
+def cache_size(path=CACHE_PATH):
+    '''returns how many answers the database at path holds'''
+    with _lock:
+        return _connection(path).execute('SELECT COUNT(*) FROM limits').fetchone()[0]
+
+def forget(path=None):
+    '''forgets the answers kept in memory, and also the ones stored in the database at path if it is given'''
+    with _lock:
+        _memo.clear()
+        if path is not None:
+            _connection(path).execute('DELETE FROM limits')
+
+def limit(expression, variable, point=None, direction='+', cache=CACHE_PATH):
+    '''returns the limit of expression as variable goes to point (infinity unless given), like
+       sym.limit(expression, variable, point, direction). cache is the path of the database to use,
+       or None to only remember answers in memory.'''
+    import sympy as sym
+    if direction not in DIRECTIONS:
+        raise ValueError(f'direction must be one of {DIRECTIONS}')
+    expression = sym.sympify(expression)
+    point = sym.oo if point is None else sym.sympify(point)
+    key = (expression, variable, point, direction, cache)
+    with _lock:
+        if key in _memo:
+            return _memo[key]
+
+    renamed = sym.Symbol(VARIABLE, **variable.assumptions0)
+    if cache is None:
+        answer = sym.srepr(sym.limit(expression, variable, point, direction).xreplace({variable: renamed}))
+    else:
+        # look the limit up as it was asked for, then in canonical form, and only then work it out
+        question = (sym.srepr(point), direction)
+        exact_key = _hash('exact', sym.srepr(expression.xreplace({variable: renamed})), *question)
+        answer = _look_up(cache, exact_key)
+        if answer is None:
+            canonical_key = _hash('canonical', canonical_form(expression, variable), *question)
+            answer = _look_up(cache, canonical_key)
+            if answer is None:
+                answer = sym.srepr(sym.limit(expression, variable, point, direction).xreplace({variable: renamed}))
+            _store(cache, [exact_key, canonical_key], answer)
+
+    # an answer sympy could not work out is still a Limit in the renamed variable
+    result = from_srepr(answer).xreplace({renamed: variable})
+    with _lock:
+        if key not in _memo and len(_memo) >= LIMITS_IN_MEMORY:
+            # forget the limit that was asked for longest ago
+            del _memo[next(iter(_memo))]
+        _memo[key] = result
+    return result
@@ -0,0 +1,157 @@
+'''derivatives and integrals of real functions, worked out numerically.
+
+   The derivative of f at x is the limit of the difference quotient (f(x + h) - f(x - h)) / 2h as h
+   goes to 0. Just like the sequences in sequences.py, we cannot take h all the way to 0: a computer
+   can only ever look at some of the quotients, and once h gets tiny, rounding errors in f(x + h) - f(x - h)
+   swamp the answer. So instead of making h tiny we look at h, h/2, h/4, ... and use Richardson
+   extrapolation: the quotient is the derivative plus c1 h^2 + c2 h^4 + ..., so combining quotients
+   for two values of h can cancel the h^2 term, combining those can cancel the h^4 term, and so on:
+
+   derivative(np.sin, 0.0) # Estimate(value=1.0, error=..., evaluations=...)
+
+   The integral of f from a to b is the limit of sums of areas of thin strips under f. Simpson's rule
+   fits a parabola through f at a, the middle and b; adaptive Simpson splits the interval in half where
+   that is not good enough yet and keeps the halves where it is, so it spends its evaluations where f
+   is hard to follow:
+
+   integrate(np.exp, 0.0, 1.0) # Estimate(value=1.718281828459045, error=..., evaluations=...)
+
+   Both work on whole arrays at once: derivative() takes an array of points, integrate() arrays of
+   bounds, and the function is called with arrays of all the points needed at each step, so it has
+   to work on NumPy arrays (like np.sin, or lambda x: x ** 2). No point is evaluated twice: every halving
+   of h only needs the new points, and every half of an interval reuses the ends and middle of the
+   interval it came from.
+'''
+
+from collections import namedtuple
+
+import numpy as np
+
+# the most values of h derivative() tries: h, h/2, ..., h / 2**(DERIVATIVE_LEVELS - 1)
+DERIVATIVE_LEVELS = 12
+
+# how many times integrate() may halve an interval
+INTEGRATION_DEPTH = 50
+
+# the most pieces integrate() works on in one round, for all the integrals together
+INTEGRATION_PIECES = 2 ** 16
+
+TOLERANCE = 1e-10
+
+Estimate = namedtuple('Estimate', ['value', 'error', 'evaluations'])
+
+def _evaluate(f, points):
+    '''returns f at the points as an array of floats, also when f gives back a single number (like
+       lambda x: 1.0 does)'''
+    return np.broadcast_to(np.asarray(f(points), dtype=np.float64), points.shape)
+
+def _shaped(values, shape):
+    '''returns the values as an array of the given shape, or as a float if the shape is ()'''
+    values = values.reshape(shape)
+    return float(values) if not shape else values
+
+def derivative(f, x, order=1, step=None, tolerance=TOLERANCE, levels=DERIVATIVE_LEVELS):
+    '''estimates the first (order=1) or second (order=2) derivative of f at x, a number or an array of
+       numbers, with central differences and Richardson extrapolation. Returns an Estimate(value, error,
+       evaluations), where value and error have the shape of x.
+
+       step is the first h to try, by default a tenth of |x| (or of 1 if |x| is smaller), and f has to
+       be defined from x - step to x + step. Points stop being refined once their error is below
+       tolerance, or once rounding errors make it grow again.'''
+    if order not in (1, 2):
+        raise ValueError('only first and second derivatives are supported')
+    x = np.asarray(x, dtype=np.float64)
+    points = x.ravel()
+    first_step = 0.1 * np.maximum(np.abs(points), 1) if step is None else np.broadcast_to(np.asarray(step, dtype=np.float64), x.shape).ravel()
+    if np.any(first_step <= 0):
+        raise ValueError('step must be greater than 0')
+    evaluations = 0
+    if order == 2:
+        at_points = _evaluate(f, points)
+        evaluations += points.size
+
+    best = np.full(points.size, np.nan)
+    errors = np.full(points.size, np.inf)
+    active = np.ones(points.size, dtype=bool)
+    previous_row = []
+    for level in range(levels):
+        if not active.any():
+            break
+        h = first_step[active] / 2 ** level
+        here = points[active]
+        values = _evaluate(f, np.concatenate([here + h, here - h]))
+        evaluations += values.size
+        above, below = values[:here.size], values[here.size:]
+        quotient = np.full(points.size, np.nan)
+        if order == 1:
+            quotient[active] = (above - below) / (2 * h)
+        else:
+            quotient[active] = (above - 2 * at_points[active] + below) / h ** 2
+
+        # each entry cancels one more power of h^2, using the entry before it and the one above it
+        row = [quotient]
+        for j, above_entry in enumerate(previous_row, 1):
+            row.append(row[-1] + (row[-1] - above_entry) / (4 ** j - 1))
+            error = np.maximum(np.abs(row[j] - row[j - 1]), np.abs(row[j] - above_entry))
+            better = active & (error < errors)
+            best[better], errors[better] = row[j][better], error[better]
+        if level == 0:
+            best[active] = quotient[active]
+        else:
+            # stop refining points that are good enough, and points where rounding errors have taken over
+            diagonal_error = np.abs(row[-1] - previous_row[-1])
+            active &= ~((errors <= tolerance * np.maximum(np.abs(best), 1)) | (diagonal_error > 2 * errors))
+        previous_row = row
+    return Estimate(_shaped(best, x.shape), _shaped(errors, x.shape), evaluations)
+
+def integrate(f, a, b, tolerance=TOLERANCE, depth=INTEGRATION_DEPTH, pieces=INTEGRATION_PIECES):
+    '''estimates the integral of f from a to b with adaptive Simpson's rule. a and b can be numbers or
+       arrays (of the same shape, or shapes NumPy can broadcast), for many integrals at once. Returns an
+       Estimate(value, error, evaluations), where value and error have the shape of the integrals.
+
+       Every integral is split until the error of each piece is below its share of tolerance, or the
+       pieces have been halved `depth` times. All the pieces of all the integrals that still need work
+       are refined together, with one call of f per round, and when there would be more than `pieces`
+       of them only the ones furthest from their share of tolerance are split. A piece where f is not
+       finite (like np.sqrt below 0) is not split at all, and makes its integral nan (or infinite).'''
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    shape = a.shape
+    a, b = a.ravel(), b.ravel()
+    middle = (a + b) / 2
+    fa, fm, fb = np.split(_evaluate(f, np.concatenate([a, middle, b])), 3)
+    evaluations = 3 * a.size
+    whole = (b - a) / 6 * (fa + 4 * fm + fb)
+    # which integral each piece belongs to, and how much error it may have
+    owner = np.arange(a.size)
+    allowed = np.full(a.size, float(tolerance))
+    totals, errors = np.zeros(a.size), np.zeros(a.size)
+
+    for level in range(depth + 1):
+        if not owner.size:
+            break
+        left_middle, right_middle = (a + middle) / 2, (middle + b) / 2
+        f_left, f_right = np.split(_evaluate(f, np.concatenate([left_middle, right_middle])), 2)
+        evaluations += 2 * owner.size
+        left = (middle - a) / 6 * (fa + 4 * f_left + fm)
+        right = (b - middle) / 6 * (fm + 4 * f_right + fb)
+        difference = left + right - whole
+        done = ~np.isfinite(difference) | (np.abs(difference) <= 15 * allowed)
+        if level == depth:
+            done[:] = True
+        elif 2 * np.count_nonzero(~done) > pieces:
+            # keep the pieces that are worst off
+            worst = np.flatnonzero(~done)
+            done[worst[np.argsort(allowed[worst] / np.abs(difference[worst]))[pieces // 2:]]] = True
+        # the difference also tells us the error of the halves, which lets us correct for it
+        np.add.at(totals, owner[done], (left + right + difference / 15)[done])
+        np.add.at(errors, owner[done], np.abs(difference[done]) / 15)
+
+        split = ~done
+        owner = np.concatenate([owner[split], owner[split]])
+        allowed = np.concatenate([allowed[split], allowed[split]]) / 2
+        a, middle, b = (np.concatenate([a[split], middle[split]]), np.concatenate([left_middle[split], right_middle[split]]),
+                        np.concatenate([middle[split], b[split]]))
+        fa, fm, fb = (np.concatenate([fa[split], fm[split]]), np.concatenate([f_left[split], f_right[split]]),
+                      np.concatenate([fm[split], fb[split]]))
+        whole = np.concatenate([left[split], right[split]])
+    return Estimate(_shaped(totals, shape), _shaped(errors, shape), evaluations)
@@ -0,0 +1,263 @@
+'''sequences, and how to find their limits from a few hundred terms instead of millions.
+
+   A Sequence wraps a function that takes natural numbers, like the reciprocal function in
+   infinite_sequences.py. Its terms can be computed one at a time, lazily:
+
+   reciprocals = Sequence(reciprocal)
+   reciprocals(4)                        # 0.25
+   list(itertools.islice(reciprocals, 3)) # [1.0, 0.5, 0.3333333333333333]
+
+   or in blocks, as NumPy arrays. When the term function also works on whole arrays of inputs
+   (vectorized=True), a block costs about as much as a single term:
+
+   Sequence(lambda n: 1 / n, vectorized=True)[1:5] # array([1.  , 0.5 , 0.33333333, 0.25])
+
+   Looking at the terms tells us where a sequence is headed, but slowly: 1 + 1/n is still 0.001 away from
+   its limit after a thousand terms. Most sequences we meet approach their limit in a regular way though,
+   and we can use that regularity to look ahead ('acceleration'):
+
+   - Richardson extrapolation assumes the terms are the limit plus c1/n + c2/n^2 + ... and solves for the
+     limit from the terms at n = 1, 2, 4, 8, ...
+   - Aitken's delta-squared process assumes each term is the limit plus an error that shrinks by about the
+     same factor every step, and solves for the limit from three terms in a row, again and again.
+   - Shanks' transformation (computed with Wynn's epsilon algorithm) assumes the error is a sum of a few
+     such shrinking errors. It is very good at the partial sums of series whose signs alternate.
+
+   Sequence(lambda n: (1 + 1 / n) ** n, vectorized=True).limit()
+   # Limit(value=2.718281828459..., error=..., method='richardson', terms=256)
+'''
+
+import itertools
+import math
+from collections import namedtuple
+
+import numpy as np
+
+METHODS = ('auto', 'richardson', 'aitken', 'shanks', 'none')
+
+# how many terms limit() looks at unless told otherwise
+LIMIT_TERMS = 256
+
+# the largest input epsilon_n() tries before giving up
+EPSILON_N_LAST = 2 ** 40
+
+# partial sums are added up this many terms at a time so huge indices do not need huge arrays
+PARTIAL_SUM_BLOCK = 2 ** 20
+
+Limit = namedtuple('Limit', ['value', 'error', 'method', 'terms'])
+
+'''Each acceleration method turns the terms into levels of better and better estimates of the limit,
+   until rounding errors take over and the estimates get worse again. The last estimate of a level is its
+   best, and how far it is from the one before it, and from the last estimate of the level before, tells
+   us how much to trust it. We keep the estimate we trust most.'''
+
+def _best_estimate(levels):
+    '''returns (value, error) for the most trustworthy last estimate of the levels'''
+    best, previous = (math.nan, math.inf), None
+    for level in levels:
+        level = level[np.isfinite(level)]
+        if not len(level):
+            break
+        differences = [abs(level[-1] - level[-2])] if len(level) > 1 else []
+        if previous is not None:
+            differences.append(abs(level[-1] - previous))
+        if differences and max(differences) < best[1]:
+            best = level[-1], max(differences)
+        previous = level[-1]
+    if math.isnan(best[0]) and previous is not None:
+        best = previous, math.inf
+    return best
+
+def aitken(terms):
+    '''one step of Aitken's delta-squared process: returns an array two shorter than `terms`, whose i-th
+       entry is the limit of a sequence that shrinks by the same factor every step through terms i to i+2.
+
+       aitken(np.array([1, 0.5, 0.25, 0.125])) # array([0., 0.])
+    '''
+    x = np.asarray(terms, dtype=np.float64)
+    first, second = np.diff(x), np.diff(x, 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accelerated = x[2:] - first[1:] ** 2 / second
+    # when the terms stop changing there is nothing to accelerate
+    return np.where(second == 0, x[2:], accelerated)
+
+def iterated_aitken(terms):
+    '''applies aitken() as long as there are terms left, and returns (value, error) for the best estimate'''
+    levels = [np.asarray(terms, dtype=np.float64)]
+    while len(levels[-1]) >= 3:
+        levels.append(aitken(levels[-1]))
+        if not np.all(np.isfinite(levels[-1])):
+            break
+    return _best_estimate(levels)
+
+def shanks(terms):
+    '''returns (value, error) for the best estimate of Shanks' transformations of the terms, computed with
+       Wynn's epsilon algorithm: with e(-1) = 0 and e(0) = the terms,
+
+       e(k + 1)[i] = e(k - 1)[i + 1] + 1 / (e(k)[i + 1] - e(k)[i])
+
+       and the even columns e(2), e(4), ... are the estimates. Every column is computed for all i at once.'''
+    previous, current = np.zeros(len(terms) + 1), np.asarray(terms, dtype=np.float64)
+    levels = [current]
+    for column in itertools.count(1):
+        if len(current) < 2:
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            previous, current = current, previous[1:-1] + 1 / np.diff(current)
+        if not np.all(np.isfinite(current)):
+            break
+        if column % 2 == 0:
+            levels.append(current)
+    return _best_estimate(levels)
+
+def richardson(indices, terms):
+    '''returns (value, error) for the best estimate of Richardson extrapolation: it treats the terms as the
+       values of a polynomial in h = 1 / index and works out its value at h = 0 with Neville's algorithm,
+       using more and more of the last terms. Indices growing like 1, 2, 4, 8, ... work best.
+
+       richardson([1, 2, 4, 8], [2, 1.5, 1.25, 1.125]) # (1.0, 0.0), the terms are exactly 1 + 1/n
+    '''
+    h = 1 / np.asarray(indices, dtype=np.float64)
+    levels = [np.asarray(terms, dtype=np.float64)]
+    for width in range(1, len(h)):
+        values = levels[-1]
+        levels.append((h[width:] * values[:-1] - h[:-width] * values[1:]) / (h[width:] - h[:-width]))
+    return _best_estimate(levels)
+
+class Sequence:
+    '''a sequence of real numbers: term(n) for n = start, start + 1, ...
+
+       When vectorized is True, term is also called with NumPy arrays of inputs (as floats, which cannot
+       overflow the way int64 can) to compute a whole block of terms at once. It can also be a separate
+       function that does that.'''
+
+    def __init__(self, term, start=1, vectorized=False):
+        self.term = term
+        self.start = start
+        if vectorized is True:
+            self.vectorized = term
+        else:
+            self.vectorized = vectorized or None
+
+    def __call__(self, n):
+        if n < self.start:
+            raise ValueError(f'the sequence starts at {self.start}')
+        return self.term(n)
+
+    def terms(self, first=None):
+        '''yields the terms one at a time, from n = first (or the start of the sequence) on'''
+        for n in itertools.count(self.start if first is None else first):
+            yield self(n)
+
+    def __iter__(self):
+        return self.terms()
+
+    def block(self, first, last):
+        '''returns a float array of the terms for n = first, ..., last - 1'''
+        if first < self.start:
+            raise ValueError(f'the sequence starts at {self.start}')
+        if last <= first:
+            return np.empty(0)
+        if self.vectorized is not None:
+            return np.broadcast_to(np.asarray(self.vectorized(np.arange(first, last, dtype=np.float64)), dtype=np.float64),
+                                   (last - first,))
+        return np.fromiter(map(self.term, range(first, last)), dtype=np.float64, count=last - first)
+
+    def blocks(self, size=1024, first=None):
+        '''yields the terms in arrays of `size` terms, from n = first (or the start of the sequence) on'''
+        for n in itertools.count(self.start if first is None else first, size):
+            yield self.block(n, n + size)
+
+    def __getitem__(self, index):
+        '''seq[n] is term n, and seq[first:last] is block(first, last)'''
+        if isinstance(index, slice):
+            if index.step not in (None, 1) or index.stop is None:
+                raise ValueError('only slices like seq[first:last] are supported')
+            return self.block(self.start if index.start is None else index.start, index.stop)
+        return self(index)
+
+    def partial_sums(self):
+        '''returns the sequence whose n-th term is the sum of the terms of this one up to n: the series'''
+        start = self.start
+
+        def partial_sum(n):
+            return math.fsum(self.block(first, min(first + PARTIAL_SUM_BLOCK, n + 1)).sum()
+                             for first in range(start, n + 1, PARTIAL_SUM_BLOCK))
+
+        def partial_sums(ns):
+            ns = np.asarray(ns, dtype=np.int64)
+            if not ns.size:
+                return np.empty(0)
+            sums = np.cumsum(self.block(start, int(ns.max()) + 1))
+            return sums[ns - start]
+
+        return Sequence(partial_sum, start, partial_sums)
+
+    def limit(self, method='auto', terms=LIMIT_TERMS):
+        '''estimates the limit of the sequence from its first `terms` terms. Returns a Limit(value, error,
+           method, terms), where error estimates how far off the value is.
+
+           method is one of METHODS: 'none' just takes the last term, and 'auto' tries every acceleration
+           method and keeps the one with the smallest error.
+
+           An acceleration method can get stuck on a wrong value that looks settled (Aitken's process does
+           on 1 + 1/n), so every method is also run on just the first half of the terms, and the error is
+           at least the difference between the two answers.'''
+        if method not in METHODS:
+            raise ValueError(f'method must be one of {METHODS}')
+        if terms < 6:
+            raise ValueError('at least 6 terms are needed')
+        values = self.block(self.start, self.start + terms)
+        results = {}
+        for name in (METHODS[1:] if method == 'auto' else [method]):
+            if name == 'none' and method == 'auto':
+                continue
+            (value, error), (half_value, _) = [self._accelerate(name, values[:count]) for count in (terms, terms // 2)]
+            results[name] = value, max(error, abs(value - half_value))
+        best = min(results, key=lambda name: (math.isnan(results[name][0]), results[name][1]))
+        value, error = results[best]
+        return Limit(float(value), float(error), best, terms)
+
+    def _accelerate(self, method, values):
+        '''returns (value, error) for the limit of the terms from the start on, by one method'''
+        if method == 'richardson':
+            # the terms at n = 1, 2, 4, 8, ... (or 2, 4, 8, ... if the sequence starts later)
+            last = self.start + len(values) - 1
+            indices = np.array([2 ** k for k in range(last.bit_length()) if 2 ** k >= max(self.start, 1)])
+            return richardson(indices, values[indices - self.start])
+        if method == 'aitken':
+            return iterated_aitken(values)
+        if method == 'shanks':
+            return shanks(values)
+        return values[-1], abs(values[-1] - values[-2])
+
+    def epsilon_n(self, epsilon, limit=None, last=EPSILON_N_LAST):
+        '''returns the first N whose term is within epsilon of the limit (estimated with limit() if not given):
+           the N in 'for every epsilon > 0 there is an N such that |term(n) - limit| < epsilon for n >= N'.
+
+           It doubles n until the term is close enough and then finds N by binary search between that n and
+           the one before, so it evaluates about 2 log2(N) terms instead of N. This assumes the terms stay
+           within epsilon once they get there, which is true when the distance to the limit keeps shrinking.
+
+           Sequence(reciprocal).epsilon_n(0.001, 0) # 1001
+        '''
+        if epsilon <= 0:
+            raise ValueError('epsilon must be greater than 0')
+        if limit is None:
+            limit = self.limit().value
+        close = lambda n: abs(self(n) - limit) < epsilon
+        if close(self.start):
+            return self.start
+        low, high = self.start, max(self.start, 1) * 2
+        while not close(high):
+            if high > last:
+                raise ValueError(f'the terms are not within {epsilon} of {limit} for any n up to {last}')
+            low, high = high, high * 2
+        # the term at low is too far from the limit, the one at high is close enough
+        while high - low > 1:
+            middle = (low + high) // 2
+            if close(middle):
+                high = middle
+            else:
+                low = middle
+        return high
@@ -0,0 +1,177 @@
+'''turns a Circuit from circuits.py into a single generated Python function.
+
+   Circuit.evaluate looks up every gate and calls a function for it, so most of its time goes into the
+   calls rather than the & and ^. Instead, we write the whole circuit out as Python source, one line
+   per gate, and compile it once:
+
+   half_adder = Circuit()
+   a, b = half_adder.add_input('a'), half_adder.add_input('b')
+   half_adder.output_bus('s', [half_adder.add_gate('XOR', a, b), half_adder.add_gate('AND', a, b)])
+   print(compile_circuit(half_adder).source)
+
+   def circuit(a, b, ones=ALL_ONES):
+       w0 = a ^ b
+       w1 = a & b
+       return (w0, w1)
+
+   The compiled function works on words like Circuit.evaluate (Python ints or NumPy arrays of uint64),
+   taking the input wires in the order of circuit.inputs and returning the output wires in the order
+   of circuit.outputs.
+
+   With mode='table' the function takes a single input of 0s and 1s instead. Every output that depends
+   on at most `table_inputs` inputs is looked up in its truth table, a number whose bit i is the output
+   for input number i, worked out when compiling. The other outputs are computed gate by gate.
+
+   Compiled functions are kept by the hash of the netlist, so compiling the same circuit again costs
+   nothing and evaluating it costs one function call.
+'''
+
+import hashlib
+import keyword
+
+from circuits import ALL_ONES, ONE, WORD_GATES, ZERO
+
+# how each gate is written, with `ones` the word with every bit set
+EXPRESSIONS = {
+    'AND': '{0} & {1}',
+    'NAND': '({0} & {1}) ^ ones',
+    'OR': '{0} | {1}',
+    'XOR': '{0} ^ {1}',
+    'NOT': '{0} ^ ones',
+    'NOR': '({0} | {1}) ^ ones',
+    'XNOR': '{0} ^ {1} ^ ones',
+}
+
+MODES = ('bitwise', 'table')
+TABLE_INPUTS = 8
+COMPILED_IN_MEMORY = 128
+
+_compiled = {}
+
+def netlist_hash(circuit):
+    '''returns a hex digest that changes whenever the inputs, gates or outputs of the circuit do'''
+    netlist = repr((circuit.inputs, [tuple(gate) for gate in circuit.gates], circuit.outputs))
+    return hashlib.sha256(netlist.encode()).hexdigest()
+
+def topological_order(circuit):
+    '''returns the gates in an order where every gate comes after the gates its inputs come from,
+       keeping the original order wherever it already works (Kahn's algorithm)'''
+    drivers = {gate.output: position for position, gate in enumerate(circuit.gates)}
+    if len(drivers) != len(circuit.gates):
+        raise ValueError('two gates drive the same wire')
+    known = set(circuit.inputs) | {ZERO, ONE}
+    waiting_on = []
+    readers = {}
+    for position, gate in enumerate(circuit.gates):
+        sources = {wire for wire in gate.inputs if wire not in known}
+        for wire in sources:
+            if wire not in drivers:
+                raise ValueError(f'wire {wire!r} is not an input and no gate drives it')
+            readers.setdefault(drivers[wire], []).append(position)
+        waiting_on.append(len(sources))
+
+    ready = [position for position, count in enumerate(waiting_on) if count == 0]
+    ready.reverse()
+    order = []
+    while ready:
+        position = ready.pop()
+        order.append(circuit.gates[position])
+        for reader in sorted(readers.get(position, []), reverse=True):
+            waiting_on[reader] -= 1
+            if waiting_on[reader] == 0:
+                ready.append(reader)
+    if len(order) != len(circuit.gates):
+        raise ValueError('the circuit has a loop, so its gates cannot be put in order')
+    return order
+
+def input_cones(circuit, gates=None):
+    '''returns {wire: the set of circuit inputs its value depends on}'''
+    cones = {wire: frozenset([wire]) for wire in circuit.inputs}
+    cones[ZERO] = cones[ONE] = frozenset()
+    for gate in gates or topological_order(circuit):
+        cones[gate.output] = frozenset().union(*[cones[wire] for wire in gate.inputs])
+    return cones
+
+def truth_table(circuit, wire, inputs, gates=None):
+    '''returns the truth table of the wire as a number: bit i is its value when input j (of `inputs`) is bit j of i.
+       The wire should only depend on `inputs`.'''
+    lanes = 2 ** len(inputs)
+    ones = 2 ** lanes - 1
+    values = {ZERO: 0, ONE: ones}
+    values.update((name, 0) for name in circuit.inputs)
+    for j, name in enumerate(inputs):
+        values[name] = sum(1 << lane for lane in range(lanes) if lane >> j & 1)
+    for output, kind, gate_inputs in gates or topological_order(circuit):
+        values[output] = WORD_GATES[kind](ones, *[values[name] for name in gate_inputs])
+    return values[wire]
+
+def _variable_names(circuit, gates):
+    '''returns {wire: the Python name used for it in the generated source}'''
+    names = {ZERO: '0', ONE: 'ones'}
+    wires = list(circuit.inputs) + [gate.output for gate in gates]
+    # a made-up name must not be taken, or be the name of a wire that comes later
+    used = {'ones'} | set(wires)
+    for wire in wires:
+        if wire.isidentifier() and not keyword.iskeyword(wire) and wire not in names.values():
+            name = wire
+        else:
+            number = len(names)
+            while f'_wire{number}' in used:
+                number += 1
+            name = f'_wire{number}'
+        names[wire] = name
+        used.add(name)
+    return names
+
+def generate_source(circuit, mode='bitwise', table_inputs=TABLE_INPUTS):
+    '''returns the source of the function compile_circuit would make'''
+    if mode not in MODES:
+        raise ValueError(f'unknown mode {mode!r}, expected one of {MODES}')
+    gates = topological_order(circuit)
+    names = _variable_names(circuit, gates)
+    parameters = [names[wire] for wire in circuit.inputs]
+    lines = []
+    if mode == 'bitwise':
+        lines.append(f'def circuit({", ".join(parameters + ["ones=ALL_ONES"])}):')
+        needed = gates
+    else:
+        lines.append(f'def circuit({", ".join(parameters)}):')
+        lines.append('    ones = 1')
+        cones = input_cones(circuit, gates)
+        looked_up = set()
+        for wire in dict.fromkeys(circuit.outputs):
+            inputs = sorted(cones[wire], key=circuit.inputs.index)
+            if wire in names and wire not in circuit.inputs and wire not in (ZERO, ONE) and len(inputs) <= table_inputs:
+                index = ' | '.join(names[name] if j == 0 else f'{names[name]} << {j}' for j, name in enumerate(inputs)) or '0'
+                lines.append(f'    {names[wire]} = {hex(truth_table(circuit, wire, inputs, gates))} >> ({index}) & 1')
+                looked_up.add(wire)
+        # the gates still needed by the outputs that were too big for a table
+        still_needed = {wire for wire in circuit.outputs if wire not in looked_up}
+        for gate in reversed(gates):
+            if gate.output in still_needed:
+                still_needed.update(gate.inputs)
+        needed = [gate for gate in gates if gate.output in still_needed]
+
+    for output, kind, inputs in needed:
+        lines.append(f'    {names[output]} = {EXPRESSIONS[kind].format(*[names[wire] for wire in inputs])}')
+    results = [names[wire] for wire in circuit.outputs]
+    lines.append(f'    return ({", ".join(results)}{"," if len(results) == 1 else ""})')
+    return '\n'.join(lines) + '\n'
+
+def compile_circuit(circuit, mode='bitwise', table_inputs=TABLE_INPUTS):
+    '''returns the circuit compiled into a Python function, see the top of this module.
+       The function has the attributes source, inputs and outputs.'''
+    key = (netlist_hash(circuit), mode, table_inputs)
+    if key not in _compiled:
+        source = generate_source(circuit, mode, table_inputs)
+        namespace = {'ALL_ONES': ALL_ONES}
+        exec(compile(source, f'<circuit {key[0][:12]}>', 'exec'), namespace)
+        function = namespace['circuit']
+        function.source = source
+        function.inputs = list(circuit.inputs)
+        function.outputs = list(circuit.outputs)
+        if len(_compiled) >= COMPILED_IN_MEMORY:
+            # forget the circuit that was compiled longest ago
+            del _compiled[next(iter(_compiled))]
+        _compiled[key] = function
+    return _compiled[key]
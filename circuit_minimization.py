@@ -0,0 +1,585 @@
+'''making circuits smaller without changing what they compute, so that simulating them is cheaper.
+
+   There are two steps.
+
+   simplify_netlist tidies a circuit gate by gate: gates fed by constants or by the same wire twice,
+   NOT(NOT(x)), and gates that already exist elsewhere in the circuit disappear, and a few gates that
+   together compute what a single gate could (like the four NANDs of a hand-built XOR) are replaced
+   by that gate. Gates no output needs are dropped.
+
+   minimize then looks at every output that depends on only a few inputs, works out its truth table and
+   writes it as an OR of ANDs (a 'sum of products'), using as few ANDs as it can find:
+
+   - Quine-McCluskey, for functions of at most QUINE_MCCLUSKEY_INPUTS inputs, finds every 'prime implicant'
+     (an AND of inputs that cannot lose an input without becoming wrong) by repeatedly merging ANDs that
+     differ in one input, then picks the fewest of them that cover the function.
+   - an Espresso-style heuristic, for functions of up to ESPRESSO_INPUTS inputs, starts from the 1s of the
+     truth table and repeatedly makes each AND as big as it can (expand), drops the ones the others
+     already cover (irredundant) and shrinks them again (reduce) to try another way, until the cover
+     stops getting cheaper.
+
+   The sum of products only replaces the output's gates when it needs fewer of them (an adder's sum bit,
+   for example, is much smaller as XORs). minimize then checks the answer with equivalent, by trying every
+   input, or only random ones when there are too many to try them all: it raises a ValueError if the
+   minimized circuit computes something else, and warns (with a RuntimeWarning) when it could only try
+   some of the inputs.
+
+   An AND of inputs is stored as a Cube(mask, value): bit j of mask says whether input j is in the AND, and
+   bit j of value whether it appears as itself (1) or negated (0). Sets of inputs, like the 1s of a truth
+   table or the inputs a cube is 1 on, are numbers whose bit i is set when input number i is in the set.
+'''
+
+import functools
+import time
+import warnings
+from collections import namedtuple
+
+import numpy as np
+
+from circuit_compiler import input_cones, topological_order, truth_table
+from circuits import ALL_ONES, ONE, WORD_BITS, WORD_GATES, ZERO, Circuit, exhaustive_planes
+
+METHODS = ('auto', 'quine-mccluskey', 'espresso')
+QUINE_MCCLUSKEY_INPUTS = 6
+ESPRESSO_INPUTS = 16
+EQUIVALENCE_INPUTS = 32
+# how many words of random inputs equivalent tries for outputs with more than EQUIVALENCE_INPUTS inputs
+RANDOM_WORDS = 2 ** 12
+# how many branches the search for the smallest cover may try before settling for the best so far
+COVER_SEARCH_STEPS = 10000
+
+Cube = namedtuple('Cube', ['mask', 'value'])
+
+Report = namedtuple('Report', ['gates_before', 'gates_after', 'seconds_before', 'seconds_after', 'counterexample', 'certain'])
+
+Equivalence = namedtuple('Equivalence', ['counterexample', 'certain'])
+
+@functools.lru_cache(maxsize=None)
+def variable_patterns(n):
+    '''returns, for each of n inputs, the set of input numbers (from 0 to 2 ** n - 1) in which it is 1'''
+    lanes = 2 ** n
+    everything = 2 ** lanes - 1
+    patterns = []
+    for j in range(n):
+        block = 2 ** j
+        # block 0s then block 1s, repeated all the way
+        patterns.append((2 ** block - 1 << block) * (everything // (2 ** (2 * block) - 1)))
+    return patterns
+
+@functools.lru_cache(maxsize=None)
+def _negated_patterns(n):
+    everything = 2 ** 2 ** n - 1
+    return [everything ^ pattern for pattern in variable_patterns(n)]
+
+def cube_minterms(cube, n):
+    '''returns the set of input numbers the cube is 1 on'''
+    if cube.mask == 2 ** n - 1:
+        # a cube with every input in it is 1 on a single input number
+        return 1 << cube.value
+    patterns, negated = variable_patterns(n), _negated_patterns(n)
+    minterms = 2 ** 2 ** n - 1
+    for j in range(cube.mask.bit_length()):
+        if cube.mask >> j & 1:
+            minterms &= patterns[j] if cube.value >> j & 1 else negated[j]
+    return minterms
+
+def supercube(minterms, n):
+    '''returns the smallest cube that is 1 on all the input numbers in the set'''
+    mask = value = 0
+    for j, (pattern, negated) in enumerate(zip(variable_patterns(n), _negated_patterns(n))):
+        if not minterms & negated:
+            mask, value = mask | 1 << j, value | 1 << j
+        elif not minterms & pattern:
+            mask |= 1 << j
+    return Cube(mask, value)
+
+def _members(minterms):
+    '''returns the input numbers in a set, smallest first'''
+    members = []
+    while minterms:
+        lowest = minterms & -minterms
+        members.append(lowest.bit_length() - 1)
+        minterms ^= lowest
+    return members
+
+def cover_cost(cover):
+    '''returns (number of cubes, number of inputs in them), which we try to make as small as possible'''
+    return len(cover), sum(bin(cube.mask).count('1') for cube in cover)
+
+def prime_implicants(on, n, dont_cares=0):
+    '''returns the prime implicants of the function that is 1 on the set `on`, treating the set
+       `dont_cares` as free to be either, by merging cubes that differ in one input (Quine-McCluskey)'''
+    current = {Cube(2 ** n - 1, minterm) for minterm in _members(on | dont_cares)}
+    primes = []
+    while current:
+        by_mask = {}
+        for cube in current:
+            by_mask.setdefault(cube.mask, set()).add(cube.value)
+        merged, used = set(), set()
+        for cube in current:
+            for j in range(n):
+                bit = 1 << j
+                if cube.mask & bit and not cube.value & bit and cube.value | bit in by_mask[cube.mask]:
+                    merged.add(Cube(cube.mask & ~bit, cube.value))
+                    used.update([cube, Cube(cube.mask, cube.value | bit)])
+        primes.extend(sorted(current - used))
+        current = merged
+    return primes
+
+def quine_mccluskey(on, n, dont_cares=0):
+    '''returns a smallest list of cubes whose OR is 1 on `on` and 0 outside `on | dont_cares`'''
+    primes = prime_implicants(on, n, dont_cares)
+    covers = [cube_minterms(prime, n) & on for prime in primes]
+    cost = lambda chosen: cover_cost([primes[i] for i in chosen])
+
+    # start from the greedy answer, which also bounds the search below
+    chosen, remaining = [], on
+    while remaining:
+        best = max(range(len(primes)), key=lambda i: (bin(covers[i] & remaining).count('1'), -bin(primes[i].mask).count('1')))
+        chosen.append(best)
+        remaining &= ~covers[best]
+    best_cover, steps = list(chosen), 0
+
+    def search(remaining, chosen):
+        nonlocal best_cover, steps
+        steps += 1
+        if not remaining:
+            if cost(chosen) < cost(best_cover):
+                best_cover = list(chosen)
+            return
+        # every cube we add costs at least one more cube, so stop if that is already no better
+        if (len(chosen) + 1, cost(chosen)[1]) >= cost(best_cover) or steps > COVER_SEARCH_STEPS:
+            return
+        # some prime has to cover the smallest input number not covered yet; try each of them
+        lowest = remaining & -remaining
+        for i in sorted((i for i in range(len(primes)) if covers[i] & lowest), key=lambda i: -bin(covers[i] & remaining).count('1')):
+            search(remaining & ~covers[i], chosen + [i])
+
+    search(on, [])
+    return [primes[i] for i in best_cover]
+
+def espresso(on, n, dont_cares=0):
+    '''returns a small (not always smallest) list of cubes whose OR is 1 on `on` and 0 outside
+       `on | dont_cares`, by repeating expand, irredundant and reduce'''
+    off = (2 ** 2 ** n - 1) & ~(on | dont_cares)
+    best = _irredundant(_expand([Cube(2 ** n - 1, minterm) for minterm in _members(on)], off, n), on, dont_cares, n)
+    while True:
+        cover = _irredundant(_expand(_reduce(best, on, dont_cares, n), off, n), on, dont_cares, n)
+        if cover_cost(cover) >= cover_cost(best):
+            return best
+        best = cover
+
+def _flip(minterms, j, n):
+    '''returns the set with input j of every input number flipped'''
+    pattern, shift = variable_patterns(n)[j], 2 ** j
+    return (minterms & pattern) >> shift | (minterms & ~pattern) << shift & pattern
+
+def _expand(cover, off, n):
+    '''makes every cube as big as it can be without covering the off-set, dropping the cubes that
+       end up inside a bigger one'''
+    expanded, covered = [], 0
+    for cube in sorted(cover, key=lambda cube: bin(cube.mask).count('1')):
+        minterms = cube_minterms(cube, n)
+        if not minterms & ~covered:
+            continue
+        for j in range(n):
+            bit = 1 << j
+            if cube.mask & bit:
+                # dropping input j adds the input numbers with input j flipped
+                bigger_minterms = minterms | _flip(minterms, j, n)
+                if not bigger_minterms & off:
+                    cube, minterms = Cube(cube.mask & ~bit, cube.value & ~bit), bigger_minterms
+        expanded.append(cube)
+        covered |= minterms
+    # a cube that cannot grow any more is never inside another cube without the off-set, unless it is
+    # the same cube, so dropping repeats is enough
+    return list(dict.fromkeys(expanded))
+
+class _CoverCounts:
+    '''counts, for every input number, how many cubes of a cover are 1 on it. The counts are kept
+       bit-sliced: bit i of planes[k] is bit k of the count for input number i.'''
+
+    def __init__(self, sets):
+        self.planes = []
+        for minterms in sets:
+            self.add(minterms)
+
+    def add(self, minterms):
+        carry = minterms
+        for k, plane in enumerate(self.planes):
+            self.planes[k], carry = plane ^ carry, plane & carry
+        if carry:
+            self.planes.append(carry)
+
+    def remove(self, minterms):
+        borrow = minterms
+        for k, plane in enumerate(self.planes):
+            self.planes[k], borrow = plane ^ borrow, ~plane & borrow
+
+    def at_least_twice(self):
+        twice = 0
+        for plane in self.planes[1:]:
+            twice |= plane
+        return twice
+
+    def exactly_once(self):
+        return self.planes[0] & ~self.at_least_twice() if self.planes else 0
+
+def _irredundant(cover, on, dont_cares, n):
+    '''drops cubes, smallest first, whose part of the on-set the other cubes already cover'''
+    cover = sorted(cover, key=lambda cube: -bin(cube.mask).count('1'))
+    minterms = [cube_minterms(cube, n) for cube in cover]
+    counts = _CoverCounts(minterms)
+    kept = []
+    for cube, cube_minterms_ in zip(cover, minterms):
+        if cube_minterms_ & on & ~(counts.at_least_twice() | dont_cares):
+            kept.append(cube)
+        else:
+            counts.remove(cube_minterms_)
+    return kept
+
+def _reduce(cover, on, dont_cares, n):
+    '''shrinks every cube, biggest first, to the smallest cube around the part of the on-set only it covers'''
+    cover = sorted(cover, key=lambda cube: bin(cube.mask).count('1'))
+    minterms = [cube_minterms(cube, n) for cube in cover]
+    counts = _CoverCounts(minterms)
+    reduced = []
+    for cube_minterms_ in minterms:
+        alone = cube_minterms_ & on & counts.exactly_once() & ~dont_cares
+        counts.remove(cube_minterms_)
+        if alone:
+            smaller = supercube(alone, n)
+            reduced.append(smaller)
+            counts.add(cube_minterms(smaller, n))
+    return reduced
+
+def minimize_cover(on, n, dont_cares=0, method='auto'):
+    '''returns a list of cubes for the function, with Quine-McCluskey for small functions and
+       the Espresso-style heuristic for bigger ones'''
+    if method not in METHODS:
+        raise ValueError(f'unknown method {method!r}, expected one of {METHODS}')
+    if method == 'quine-mccluskey' or method == 'auto' and n <= QUINE_MCCLUSKEY_INPUTS:
+        return quine_mccluskey(on, n, dont_cares)
+    return espresso(on, n, dont_cares)
+
+def sum_of_products_size(cover):
+    '''returns how many 2-input gates (and NOTs) a cover takes as an OR of ANDs'''
+    if not cover:
+        return 0
+    negated = {j for cube in cover for j in range(cube.mask.bit_length()) if cube.mask >> j & 1 and not cube.value >> j & 1}
+    ands = sum(max(bin(cube.mask).count('1') - 1, 0) for cube in cover)
+    return len(negated) + ands + len(cover) - 1
+
+'''Building the smaller circuit.
+
+   A _Builder adds gates to a new circuit, but first checks whether the gate is needed at all. For every
+   wire it remembers a few 'cuts': sets of at most two wires further back that the wire is a function of,
+   with its truth table over them. If some cut shows that a new gate is really a constant, an existing
+   wire, or a single gate of wires further back, that is used instead. Gates are also looked up before
+   being added, so the same gate is never built twice.'''
+
+CUTS_PER_WIRE = 8
+
+def _pattern(position, count):
+    '''the truth table of leaf number `position` out of `count`, over 2 ** count input numbers'''
+    return variable_patterns(count)[position]
+
+def _spread(leaves, table, union):
+    '''returns the truth table over `leaves` rewritten over the bigger tuple of wires `union`'''
+    spread = 0
+    for lane in range(2 ** len(union)):
+        index = sum((lane >> union.index(leaf) & 1) << i for i, leaf in enumerate(leaves))
+        spread |= (table >> index & 1) << lane
+    return spread
+
+def _match(leaves, table):
+    '''returns a wire, a (kind, inputs) gate, or None: the cheapest way to compute the truth table'''
+    ones = 2 ** 2 ** len(leaves) - 1
+    if table == 0:
+        return ZERO
+    if table == ones:
+        return ONE
+    patterns = [_pattern(i, len(leaves)) for i in range(len(leaves))]
+    for leaf, pattern in zip(leaves, patterns):
+        if table == pattern:
+            return leaf
+    for leaf, pattern in zip(leaves, patterns):
+        if table == ones ^ pattern:
+            return ('NOT', (leaf,))
+    if len(leaves) == 2:
+        for kind, function in WORD_GATES.items():
+            if kind != 'NOT' and function(ones, *patterns) == table:
+                return (kind, leaves)
+    return None
+
+class _Builder:
+    def __init__(self, inputs):
+        self.circuit = Circuit()
+        for wire in inputs:
+            self.circuit.add_input(wire)
+        self.existing = {}
+        self.cuts = {ZERO: [((), 0)], ONE: [((), 1)]}
+        for wire in inputs:
+            self.cuts[wire] = [((wire,), 0b10)]
+
+    def gate(self, kind, *inputs):
+        '''returns a wire computing the gate of the (new circuit's) wires, adding as few gates as it can'''
+        cuts = {}
+        for combination in ([cut] for cut in self.cuts[inputs[0]]) if kind == 'NOT' else \
+                ([cut1, cut2] for cut1 in self.cuts[inputs[0]] for cut2 in self.cuts[inputs[1]]):
+            union = tuple(sorted(set().union(*[leaves for leaves, _ in combination])))
+            if len(union) > 2 or union in cuts:
+                continue
+            tables = [_spread(leaves, table, union) for leaves, table in combination]
+            cuts[union] = WORD_GATES[kind](2 ** 2 ** len(union) - 1, *tables)
+
+        replacement = None
+        for leaves, table in cuts.items():
+            match = _match(leaves, table)
+            if isinstance(match, str):
+                return match
+            if match is not None and (replacement is None or set(match[1]) != set(inputs)):
+                replacement = match
+        if replacement is not None:
+            kind, inputs = replacement
+
+        key = (kind, tuple(sorted(inputs)))
+        if key not in self.existing:
+            wire = self.circuit.add_gate(kind, *inputs)
+            self.existing[key] = wire
+            self.cuts[wire] = [((wire,), 0b10)] + list(cuts.items())[:CUTS_PER_WIRE - 1]
+        return self.existing[key]
+
+    def reduce(self, kind, wires):
+        '''combines the wires with a balanced tree of gates'''
+        while len(wires) > 1:
+            wires = [self.gate(kind, wires[i], wires[i + 1]) for i in range(0, len(wires) - 1, 2)] + wires[len(wires) - len(wires) % 2:]
+        return wires[0]
+
+    def sum_of_products(self, cover, inputs):
+        if not cover:
+            return ZERO
+        products = []
+        for cube in cover:
+            literals = [inputs[j] if cube.value >> j & 1 else self.gate('NOT', inputs[j])
+                        for j in range(len(inputs)) if cube.mask >> j & 1]
+            products.append(self.reduce('AND', literals) if literals else ONE)
+        return self.reduce('OR', products)
+
+    def copy(self, circuit, wires, mapping):
+        '''copies the gates of `circuit` that the wires need, returning their wires in the new circuit'''
+        drivers = {gate.output: gate for gate in circuit.gates}
+        for wire in wires:
+            stack = [wire]
+            while stack:
+                current = stack[-1]
+                if current in mapping:
+                    stack.pop()
+                    continue
+                gate = drivers[current]
+                missing = [source for source in gate.inputs if source not in mapping]
+                if missing:
+                    stack.extend(missing)
+                else:
+                    mapping[current] = self.gate(gate.kind, *[mapping[source] for source in gate.inputs])
+                    stack.pop()
+        return [mapping[wire] for wire in wires]
+
+def _finish(builder, original, mapping):
+    '''returns a copy of the builder's circuit without the gates no output needs, with the outputs
+       and buses of the original circuit'''
+    outputs = [mapping[wire] for wire in original.outputs]
+    live = set(outputs)
+    for gate in reversed(builder.circuit.gates):
+        if gate.output in live:
+            live.update(gate.inputs)
+    circuit = Circuit()
+    renamed = {ZERO: ZERO, ONE: ONE}
+    for wire in original.inputs:
+        renamed[wire] = circuit.add_input(wire)
+    for gate in builder.circuit.gates:
+        if gate.output in live:
+            renamed[gate.output] = circuit.add_gate(gate.kind, *[renamed[wire] for wire in gate.inputs])
+    circuit.input_buses = {name: list(wires) for name, wires in original.input_buses.items()}
+    circuit.outputs = [renamed[wire] for wire in outputs]
+    circuit.output_buses = {name: [renamed[mapping[wire]] for wire in wires] for name, wires in original.output_buses.items()}
+    return circuit
+
+def simplify_netlist(circuit):
+    '''returns an equivalent circuit with the same inputs and outputs, tidied gate by gate (see the top of this module)'''
+    builder = _Builder(circuit.inputs)
+    mapping = {wire: wire for wire in list(circuit.inputs) + [ZERO, ONE]}
+    for gate in topological_order(circuit):
+        mapping[gate.output] = builder.gate(gate.kind, *[mapping[wire] for wire in gate.inputs])
+    return _finish(builder, circuit, mapping)
+
+def minimize(circuit, method='auto', check=True, seed=0):
+    '''returns an equivalent circuit with the same inputs and outputs and at most as many gates,
+       writing the outputs that depend on at most ESPRESSO_INPUTS inputs as sums of products
+       when that takes fewer gates.
+
+       With check=True the result is compared with the circuit by equivalent (with the given seed):
+       a difference raises a ValueError, and a RuntimeWarning says so when equivalent could not try
+       every input. Checking tries up to 2 ** EQUIVALENCE_INPUTS inputs, which for the 32 inputs of a
+       16-bit adder takes much longer than minimizing does.'''
+    minimized = _minimize(circuit, method)
+    if check:
+        _check_minimized(circuit, minimized, seed)
+    return minimized
+
+def _minimize(circuit, method):
+    if method not in METHODS:
+        raise ValueError(f'unknown method {method!r}, expected one of {METHODS}')
+    cleaned = simplify_netlist(circuit)
+    gates = topological_order(cleaned)
+    cones = input_cones(cleaned, gates)
+    drivers = {gate.output: gate for gate in gates}
+
+    builder = _Builder(cleaned.inputs)
+    mapping = {wire: wire for wire in list(cleaned.inputs) + [ZERO, ONE]}
+    for wire in dict.fromkeys(cleaned.outputs):
+        if wire in mapping:
+            continue
+        inputs = sorted(cones[wire], key=cleaned.inputs.index)
+        if len(inputs) <= ESPRESSO_INPUTS:
+            # the gates this output needs now
+            needed, stack = set(), [wire]
+            while stack:
+                current = stack.pop()
+                if current in drivers and current not in needed:
+                    needed.add(current)
+                    stack.extend(drivers[current].inputs)
+            cover = minimize_cover(truth_table(cleaned, wire, inputs, gates), len(inputs), method=method)
+            if sum_of_products_size(cover) < len(needed):
+                mapping[wire] = builder.sum_of_products(cover, inputs)
+                continue
+        builder.copy(cleaned, [wire], mapping)
+    minimized = _finish(builder, cleaned, mapping)
+    return minimized if len(minimized) < len(cleaned) else cleaned
+
+def _check_minimized(circuit, minimized, seed):
+    '''returns equivalent(circuit, minimized), after raising a ValueError if they differ and warning if
+       that is not certain'''
+    equivalence = equivalent(circuit, minimized, seed=seed)
+    if equivalence.counterexample is not None:
+        raise ValueError(f'the minimized circuit computes something else for the input {equivalence.counterexample}')
+    if not equivalence.certain:
+        warnings.warn('the minimized circuit agrees with the original on the random inputs tried, but some of '
+                      f'its outputs depend on more than EQUIVALENCE_INPUTS={EQUIVALENCE_INPUTS} inputs, so '
+                      'it could not be tried on all of them', RuntimeWarning, stacklevel=3)
+    return equivalence
+
+def minimize_truth_table(table, inputs, dont_cares=0, method='auto'):
+    '''returns a circuit with the given input wires and one output bus f computing the truth table
+       (bit i is the output for the input number i, where input j is bit j of i)'''
+    builder = _Builder(inputs)
+    cover = minimize_cover(table, len(inputs), dont_cares, method)
+    output = builder.sum_of_products(cover, list(inputs))
+    original = Circuit()
+    original.inputs = list(inputs)
+    original.output_bus('f', ['f'])
+    return _finish(builder, original, {'f': output})
+
+'''Checking that two circuits compute the same thing.
+
+   We try every input, bit-sliced like circuits.verify does. If the outputs together depend on at most
+   EQUIVALENCE_INPUTS inputs, both circuits are evaluated on all of them at once; otherwise each output
+   is checked on just the inputs it depends on. An output that depends on more inputs than that (the top
+   bits of a 32-bit adder depend on 64) cannot be tried on every input, so those outputs are only tried on
+   random_words x 64 random inputs: that can find a difference, but not prove there is none.'''
+
+def equivalent(circuit1, circuit2, chunk_words=2 ** 15, random_words=RANDOM_WORDS, seed=0):
+    '''returns Equivalence(counterexample, certain): counterexample is None if the circuits compute the
+       same outputs (in the same order) on every input tried, or else an input (a dict of input wires
+       to 0 or 1) on which they differ. certain says whether the answer is sure: a counterexample
+       always is, but no counterexample only is when every input was tried, not just random ones.'''
+    if set(circuit1.inputs) != set(circuit2.inputs) or len(circuit1.outputs) != len(circuit2.outputs):
+        raise ValueError('the circuits should have the same inputs and the same number of outputs')
+    cones1, cones2 = input_cones(circuit1), input_cones(circuit2)
+    pairs = list(zip(circuit1.outputs, circuit2.outputs))
+
+    def inputs_of(group):
+        return sorted(set().union(*[cones1[wire1] | cones2[wire2] for wire1, wire2 in group]), key=circuit1.inputs.index)
+
+    groups = [pairs] if len(inputs_of(pairs)) <= EQUIVALENCE_INPUTS else [[pair] for pair in pairs]
+    too_many_inputs = []
+    for group in groups:
+        inputs = inputs_of(group)
+        if len(inputs) > EQUIVALENCE_INPUTS:
+            too_many_inputs.extend(group)
+            continue
+        counterexample = _compare_exhaustively(circuit1, circuit2, group, inputs, chunk_words)
+        if counterexample is not None:
+            return Equivalence(counterexample, True)
+    if too_many_inputs:
+        counterexample = _compare_randomly(circuit1, circuit2, too_many_inputs, random_words, seed)
+        return Equivalence(counterexample, counterexample is not None)
+    return Equivalence(None, True)
+
+def _compare_exhaustively(circuit1, circuit2, pairs, inputs, chunk_words):
+    total_words = max(1, 2 ** len(inputs) // WORD_BITS)
+    lanes = np.uint64(2 ** min(2 ** len(inputs), WORD_BITS) - 1)
+    zero = np.uint64(0)
+    for first_word in range(0, total_words, chunk_words):
+        words = min(chunk_words, total_words - first_word)
+        planes = {wire: zero for wire in circuit1.inputs}
+        planes.update(zip(inputs, exhaustive_planes(len(inputs), first_word, words)))
+        difference = _first_difference(circuit1, circuit2, pairs, planes, words, lanes)
+        if difference is not None:
+            word, lane = difference
+            number = (first_word + word) * WORD_BITS + lane
+            counterexample = {wire: 0 for wire in circuit1.inputs}
+            counterexample.update({wire: number >> j & 1 for j, wire in enumerate(inputs)})
+            return counterexample
+    return None
+
+def _compare_randomly(circuit1, circuit2, pairs, words, seed):
+    generator = np.random.default_rng(seed)
+    planes = {wire: generator.integers(0, 2 ** 64, words, dtype=np.uint64) for wire in circuit1.inputs}
+    difference = _first_difference(circuit1, circuit2, pairs, planes, words, ALL_ONES)
+    if difference is None:
+        return None
+    word, lane = difference
+    return {wire: int(plane[word]) >> lane & 1 for wire, plane in planes.items()}
+
+def _first_difference(circuit1, circuit2, pairs, planes, words, lanes):
+    '''returns (word, lane) of the first input on which a pair of outputs differs, or None'''
+    outputs1, outputs2 = _outputs(circuit1, planes), _outputs(circuit2, planes)
+    wrong = np.zeros(words, dtype=np.uint64)
+    for wire1, wire2 in pairs:
+        wrong |= outputs1[wire1] ^ outputs2[wire2]
+    wrong &= lanes
+    if not wrong.any():
+        return None
+    word = int(np.flatnonzero(wrong)[0])
+    return word, (int(wrong[word]) & -int(wrong[word])).bit_length() - 1
+
+def _outputs(circuit, planes):
+    '''evaluates the circuit, with its output wires (which may be inputs or constants) as words'''
+    values = {ZERO: np.uint64(0), ONE: ALL_ONES}
+    values.update(planes)
+    values.update(circuit.evaluate({wire: planes[wire] for wire in circuit.inputs}))
+    return values
+
+def minimization_report(circuit, method='auto', words=2 ** 10, seed=0):
+    '''minimizes the circuit and returns (the minimized circuit, a Report) with the gate counts before
+       and after, the time Circuit.evaluate takes on `words` x 64 random inputs before and after, and
+       the counterexample and certain from equivalent (None and True when the two agree on every input;
+       None and False when they agree on every input that was tried, but not all of them could be, in
+       which case it also warns like minimize does)'''
+    minimized = minimize(circuit, method, check=False)
+    generator = np.random.default_rng(seed)
+    planes = {wire: generator.integers(0, 2 ** 64, words, dtype=np.uint64) for wire in circuit.inputs}
+    seconds = []
+    for version in (circuit, minimized):
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            version.evaluate(planes)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        seconds.append(best)
+    equivalence = equivalent(circuit, minimized, seed=seed)
+    if equivalence.counterexample is None and not equivalence.certain:
+        warnings.warn('the minimized circuit could only be tried on random inputs', RuntimeWarning, stacklevel=2)
+    return minimized, Report(len(circuit), len(minimized), seconds[0], seconds[1], *equivalence)
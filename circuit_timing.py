@@ -0,0 +1,176 @@
+'''how long a circuit takes to answer: signals that travel through gates with delays.
+
+   In a real circuit a gate does not answer the moment its inputs change, it takes a little while (its
+   delay). A ripple-carry adder has to wait for the carry to travel through every column one after the
+   other, while a carry-lookahead adder works out its carries side by side:
+
+   critical_path(adder_circuit(16, 'ripple'))[0] # 32
+   critical_path(adder_circuit(16, 'lookahead'))[0] # 14
+
+   The TimingSimulator follows the signals as they travel. It keeps a queue of 'events' (this wire becomes
+   this value at this time), sorted by time with heapq. Only the gates reading a wire that just changed
+   are evaluated, with the functions in logic_gates.py, and a gate whose answer changes schedules an event
+   for its output after its delay. Since a change usually only reaches a small part of a big circuit, this
+   is much cheaper than evaluating every gate again:
+
+   simulator = TimingSimulator(adder_circuit(4))
+   simulator.apply({'a0': 1, 'a1': 1, 'a2': 1, 'a3': 1}) # 4, the time the outputs take to settle
+   simulator.apply({'b0': 1})                            # 7, the carry ripples through every column
+   print(simulator.waveform())
+
+   s0 __----______
+   s1 ____---_____
+   s2 ____-----___
+   s3 ____-------_
+   s4 ___________-
+'''
+
+import heapq
+import itertools
+
+from circuit_compiler import topological_order
+from circuits import GATES, ONE, ZERO
+
+# in units of the delay of a simple gate; an XOR takes about as long as two of them
+DEFAULT_DELAYS = {
+    'AND': 1,
+    'NAND': 1,
+    'OR': 1,
+    'NOR': 1,
+    'NOT': 1,
+    'XOR': 2,
+    'XNOR': 2,
+}
+
+def gate_delay(gate, delays=None):
+    '''returns the delay of a gate. delays maps gate kinds, or the output wires of single gates,
+       to their delays; anything not in it gets its delay from DEFAULT_DELAYS.'''
+    delays = delays or {}
+    return delays.get(gate.output, delays.get(gate.kind, DEFAULT_DELAYS[gate.kind]))
+
+def critical_path(circuit, delays=None):
+    '''returns (latency, path): the longest time any output can take to settle after an input changes,
+       and the wires along the slowest path, from an input to an output'''
+    arrivals = {wire: 0 for wire in circuit.inputs}
+    arrivals[ZERO] = arrivals[ONE] = 0
+    slowest_input = {}
+    for gate in topological_order(circuit):
+        slowest_input[gate.output] = max(gate.inputs, key=arrivals.__getitem__)
+        arrivals[gate.output] = arrivals[slowest_input[gate.output]] + gate_delay(gate, delays)
+    if not circuit.outputs:
+        return 0, []
+    wire = max(circuit.outputs, key=arrivals.__getitem__)
+    latency, path = arrivals[wire], [wire]
+    while wire in slowest_input:
+        wire = slowest_input[wire]
+        path.append(wire)
+    return latency, path[::-1]
+
+class TimingSimulator:
+    '''simulates a circuit over time. It starts with every input at 0 and every wire settled.
+
+       The wires are numbered so the state is kept in lists, which keeps circuits with hundreds of
+       thousands of gates manageable.'''
+
+    def __init__(self, circuit, delays=None, watch=None, inertial=True):
+        gates = topological_order(circuit)
+        self.wires = [ZERO, ONE] + list(circuit.inputs) + [gate.output for gate in gates]
+        self.numbers = number = {wire: i for i, wire in enumerate(self.wires)}
+        self.functions = [GATES[gate.kind] for gate in gates]
+        self.gate_inputs = [tuple(number[wire] for wire in gate.inputs) for gate in gates]
+        self.gate_outputs = [number[gate.output] for gate in gates]
+        self.delays = [gate_delay(gate, delays) for gate in gates]
+        self.readers = [[] for _ in self.wires]
+        for position, inputs in enumerate(self.gate_inputs):
+            for wire in set(inputs):
+                self.readers[wire].append(position)
+        self.inputs = {wire: number[wire] for wire in circuit.inputs}
+
+        # settle the circuit with every input at 0
+        self.values = [0] * len(self.wires)
+        self.values[number[ONE]] = 1
+        for function, inputs, output in zip(self.functions, self.gate_inputs, self.gate_outputs):
+            self.values[output] = int(function(*[self.values[wire] for wire in inputs]))
+        # the value each wire will have once its scheduled events have happened
+        self.projected = list(self.values)
+        # events for a wire only count if they carry its latest version
+        self.versions = [0] * len(self.wires)
+        self.inertial = inertial
+
+        self.watched = {number[wire] for wire in (circuit.outputs if watch is None else watch)}
+        self.initial = {self.wires[wire]: self.values[wire] for wire in self.watched}
+        # waveforms show a wire of a bus by the bus name and bit, like s3
+        self.labels = {wire: f'{name}{i}' for buses in (circuit.input_buses, circuit.output_buses)
+                       for name, bus in buses.items() for i, wire in enumerate(bus)}
+        self.trace = []
+        self.time = 0
+        self.evaluations = 0
+        self.events = []
+        self._order = itertools.count()
+
+    def value(self, wire):
+        return self.values[self.numbers[wire]]
+
+    def schedule(self, time, wire, value):
+        '''makes the wire take the value at the given time. With inertial delays a new answer from a
+           gate replaces the one it had scheduled before, so pulses shorter than the delay of a gate
+           never come out of it; with transport delays every answer comes out in turn.'''
+        if self.inertial:
+            self.versions[wire] += 1
+        self.projected[wire] = value
+        if value != self.values[wire] or not self.inertial:
+            heapq.heappush(self.events, (time, next(self._order), wire, value, self.versions[wire]))
+
+    def apply(self, bits):
+        '''changes the inputs (a dict mapping input wires to 0 or 1) at the current time, runs until the
+           circuit settles and returns how long that took'''
+        start = self.time
+        for wire, bit in bits.items():
+            if wire not in self.inputs:
+                raise ValueError(f'{wire!r} is not an input of the circuit')
+            if bit != self.projected[self.inputs[wire]]:
+                self.schedule(start, self.inputs[wire], bit)
+        last_change = self.run()
+        return max(last_change, start) - start
+
+    def run(self):
+        '''processes events until none are left, and returns the time of the last change'''
+        values, readers, events = self.values, self.readers, self.events
+        last_change = self.time
+        while events:
+            now = events[0][0]
+            # apply every change happening now, then evaluate each gate reading a changed wire once
+            touched = set()
+            while events and events[0][0] == now:
+                _, _, wire, value, version = heapq.heappop(events)
+                if version == self.versions[wire] and values[wire] != value:
+                    values[wire] = value
+                    touched.update(readers[wire])
+                    last_change = now
+                    if wire in self.watched:
+                        self.trace.append((now, self.wires[wire], value))
+            for position in touched:
+                output = self.gate_outputs[position]
+                value = int(self.functions[position](*[values[wire] for wire in self.gate_inputs[position]]))
+                self.evaluations += 1
+                if value != self.projected[output]:
+                    self.schedule(now + self.delays[position], output, value)
+            self.time = now
+        return last_change
+
+    def waveform(self, wires=None, end=None):
+        '''returns the trace of (some of) the watched wires as text, one line per wire and one character per
+           unit of time: _ for 0 and - for 1'''
+        wires = wires or [self.wires[wire] for wire in sorted(self.watched)]
+        end = self.time + 1 if end is None else end
+        labels = [self.labels.get(wire, wire) for wire in wires]
+        width = max(len(label) for label in labels)
+        lines = []
+        for wire, label in zip(wires, labels):
+            value, changes, line = self.initial[wire], [(time, bit) for time, name, bit in self.trace if name == wire], []
+            for time in range(end):
+                while changes and changes[0][0] <= time:
+                    value = changes.pop(0)[1]
+                line.append('-' if value else '_')
+            lines.append(f'{label:>{width}} {"".join(line)}')
+        return '\n'.join(lines)
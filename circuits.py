@@ -0,0 +1,360 @@
+'''circuits built out of the gates in logic_gates.py: adders and multipliers, the way a computer
+   actually does its arithmetic.
+
+   A Circuit is a list of gates, each one taking the values on some wires and putting its answer on a
+   new wire. We can build a 4-bit adder and check it one input at a time, with the functions from
+   logic_gates.py:
+
+   adder = adder_circuit(4)
+   adder.compute(a=[5], b=[9]) # {'s': array([14], dtype=uint64)}
+
+   One input at a time is far too slow to check every input of a 16-bit adder (2 ** 32 of them),
+   so circuits are evaluated 'bit-sliced': a wire does not carry a single 0 or 1, but a whole word
+   whose 64 bits are the values of that wire for 64 independent inputs. One & between two words does
+   the work of 64 AND gates. With NumPy arrays of uint64 words, a wire carries 64 x (length of the array)
+   inputs at once, so that
+
+   verify(adder_circuit(16, 'lookahead'), add_planes)
+
+   tries all 2 ** 32 pairs of 16-bit numbers in seconds.
+'''
+
+from collections import namedtuple
+
+import numpy as np
+
+import logic_gates
+
+GATES = {
+    'AND': logic_gates.AND,
+    'NAND': logic_gates.NAND,
+    'OR': logic_gates.OR,
+    'XOR': logic_gates.XOR,
+    'NOT': logic_gates.NOT,
+    'NOR': logic_gates.NOR,
+    'XNOR': logic_gates.XNOR,
+}
+
+# the same gates on whole words; `ones` is the word with every bit set, so x ^ ones flips every bit
+WORD_GATES = {
+    'AND': lambda ones, a, b: a & b,
+    'NAND': lambda ones, a, b: (a & b) ^ ones,
+    'OR': lambda ones, a, b: a | b,
+    'XOR': lambda ones, a, b: a ^ b,
+    'NOT': lambda ones, a: a ^ ones,
+    'NOR': lambda ones, a, b: (a | b) ^ ones,
+    'XNOR': lambda ones, a, b: a ^ b ^ ones,
+}
+
+# wires that always carry 0 or 1
+ZERO = '0'
+ONE = '1'
+
+WORD_BITS = 64
+ALL_ONES = np.uint64(2 ** WORD_BITS - 1)
+
+Gate = namedtuple('Gate', ['output', 'kind', 'inputs'])
+
+class Circuit:
+    '''a combinational circuit: named input wires, gates in an order where every gate comes after the
+       gates its inputs come from, and output wires. Related wires can be grouped into 'buses' that hold
+       the bits of a number, least significant bit first.'''
+
+    def __init__(self):
+        self.inputs = []
+        self.gates = []
+        self.outputs = []
+        self.input_buses = {}
+        self.output_buses = {}
+
+    def add_input(self, name):
+        self.inputs.append(name)
+        return name
+
+    def add_gate(self, kind, *inputs):
+        '''adds a gate and returns the wire it puts its answer on'''
+        if kind not in GATES:
+            raise ValueError(f'unknown gate {kind!r}, expected one of {sorted(GATES)}')
+        if len(inputs) != (1 if kind == 'NOT' else 2):
+            raise TypeError(f'{kind} takes {1 if kind == "NOT" else 2} inputs, got {len(inputs)}')
+        output = f'w{len(self.gates)}'
+        self.gates.append(Gate(output, kind, inputs))
+        return output
+
+    def add_output(self, wire):
+        self.outputs.append(wire)
+        return wire
+
+    def input_bus(self, name, width):
+        '''adds the inputs name0, name1, ... for the bits of a number and returns their wires'''
+        wires = [self.add_input(f'{name}{i}') for i in range(width)]
+        self.input_buses[name] = wires
+        return wires
+
+    def output_bus(self, name, wires):
+        '''marks the wires as the outputs holding the bits of a number'''
+        self.output_buses[name] = [self.add_output(wire) for wire in wires]
+        return wires
+
+    def __len__(self):
+        return len(self.gates)
+
+    def simulate(self, bits):
+        '''evaluates the circuit on a single input, one gate at a time with the functions in logic_gates.py.
+           bits maps each input wire to 0 or 1; returns a dict mapping each output wire to 0 or 1.'''
+        values = {ZERO: 0, ONE: 1}
+        values.update(bits)
+        for output, kind, inputs in self.gates:
+            values[output] = int(GATES[kind](*[values[wire] for wire in inputs]))
+        return {wire: values[wire] for wire in self.outputs}
+
+    def evaluate(self, words, ones=ALL_ONES):
+        '''evaluates the circuit on many inputs at once. words maps each input wire to a word (a Python int
+           or a NumPy array of uint64) whose bits are the values of that wire for independent inputs.
+           For Python ints, pass ones=2 ** lanes - 1 for the number of inputs packed into each int.
+           Returns a dict mapping each output wire to its word.'''
+        values = {ZERO: ones ^ ones, ONE: ones}
+        values.update(words)
+        # forget each wire after the last gate that reads it, so big arrays can be reused
+        finished = self._finished_wires()
+        for position, (output, kind, inputs) in enumerate(self.gates):
+            values[output] = WORD_GATES[kind](ones, *[values[wire] for wire in inputs])
+            for wire in finished.get(position, ()):
+                del values[wire]
+        return {wire: values[wire] for wire in self.outputs}
+
+    def _finished_wires(self):
+        '''returns {position of a gate: the wires no gate after it reads}, leaving out the outputs'''
+        last_reads = {}
+        for position, gate in enumerate(self.gates):
+            for wire in gate.inputs:
+                last_reads[wire] = position
+        finished = {}
+        for wire, position in last_reads.items():
+            if wire not in self.outputs and wire not in (ZERO, ONE):
+                finished.setdefault(position, []).append(wire)
+        return finished
+
+    def compute(self, **operands):
+        '''evaluates the circuit on arrays of numbers, one for each input bus, and returns a dict of arrays
+           of numbers, one for each output bus:
+
+           multiplier_circuit(8).compute(a=[3, 200], b=[5, 100]) # {'p': array([15, 20000], dtype=uint64)}
+        '''
+        if set(operands) != set(self.input_buses):
+            raise TypeError(f'expected the operands {sorted(self.input_buses)}, got {sorted(operands)}')
+        numbers = {name: np.atleast_1d(np.asarray(values, dtype=np.uint64)) for name, values in operands.items()}
+        count = len(next(iter(numbers.values())))
+        words = {}
+        for name, wires in self.input_buses.items():
+            if len(numbers[name]) != count:
+                raise ValueError('all operands should have the same length')
+            words.update(zip(wires, pack_bits(numbers[name], len(wires))))
+        values = self.evaluate(words)
+        # outputs wired to a constant are single words, so spread them over every word
+        length = -(-count // WORD_BITS)
+        return {name: unpack_bits([np.broadcast_to(values[wire], length) for wire in wires], count)
+                for name, wires in self.output_buses.items()}
+
+'''Moving between numbers and bit planes.
+
+   For a bus of width n, we turn an array of numbers into n 'bit planes': plane i is an array of uint64
+   words holding bit i of every number, 64 numbers to a word.'''
+
+def pack_bits(numbers, width):
+    '''returns the `width` bit planes of an array of (at most 64-bit) numbers'''
+    numbers = np.asarray(numbers, dtype=np.uint64)
+    padded = np.zeros(-(-len(numbers) // WORD_BITS) * WORD_BITS, dtype=np.uint64)
+    padded[:len(numbers)] = numbers
+    planes = []
+    for i in range(width):
+        bits = ((padded >> np.uint64(i)) & np.uint64(1)).astype(np.uint8).reshape(-1, WORD_BITS)
+        planes.append(np.packbits(bits, axis=1, bitorder='little').view('<u8').ravel().astype(np.uint64))
+    return planes
+
+def unpack_bits(planes, count):
+    '''returns the `count` numbers whose bits are stored in the bit planes'''
+    numbers = np.zeros(len(planes[0]) * WORD_BITS if planes else count, dtype=np.uint64)
+    for i, plane in enumerate(planes):
+        bits = np.unpackbits(np.ascontiguousarray(plane, dtype='<u8').view(np.uint8), bitorder='little')
+        numbers |= bits.astype(np.uint64) << np.uint64(i)
+    return numbers[:count]
+
+'''Building blocks. Each one adds its gates to a circuit and returns the wires holding its answers.
+   A bit that is None is a bit that is known to be 0, so no gates are spent on it.'''
+
+def half_adder(circuit, a, b):
+    '''returns the (sum, carry) wires of a + b for two bits'''
+    return circuit.add_gate('XOR', a, b), circuit.add_gate('AND', a, b)
+
+def full_adder(circuit, a, b, carry):
+    '''returns the (sum, carry) wires of a + b + carry for three bits'''
+    partial_sum, carry1 = half_adder(circuit, a, b)
+    total, carry2 = half_adder(circuit, partial_sum, carry)
+    return total, circuit.add_gate('OR', carry1, carry2)
+
+def _add_column(circuit, bits):
+    '''adds up to three bits, skipping the ones that are None'''
+    bits = [bit for bit in bits if bit is not None]
+    if not bits:
+        return None, None
+    if len(bits) == 1:
+        return bits[0], None
+    if len(bits) == 2:
+        return half_adder(circuit, *bits)
+    return full_adder(circuit, *bits)
+
+def _pad(a, b):
+    width = max(len(a), len(b))
+    return list(a) + [None] * (width - len(a)), list(b) + [None] * (width - len(b))
+
+def ripple_carry_adder(circuit, a, b, carry=None):
+    '''returns the sum wires (one more than the wider operand) of the numbers on the wires a and b,
+       adding one column at a time and passing the carry to the next column, like column addition'''
+    sums = []
+    for bit_a, bit_b in zip(*_pad(a, b)):
+        total, carry = _add_column(circuit, [bit_a, bit_b, carry])
+        sums.append(total)
+    return sums + [carry]
+
+def _reduce(circuit, kind, wires):
+    '''combines the wires with 2-input gates arranged as a balanced tree, so the depth is only logarithmic'''
+    wires = [wire for wire in wires if wire is not None]
+    if not wires:
+        return None
+    while len(wires) > 1:
+        pairs = [circuit.add_gate(kind, wires[i], wires[i + 1]) for i in range(0, len(wires) - 1, 2)]
+        wires = pairs + wires[len(wires) - len(wires) % 2:]
+    return wires[0]
+
+def carry_lookahead_adder(circuit, a, b, carry=None, block_size=4):
+    '''returns the sum wires of the numbers on the wires a and b.
+
+       A column 'generates' a carry when both its bits are 1, and 'propagates' a carry coming into it when
+       exactly one of them is. So the carry into column k+1 is 1 exactly when some column j <= k generates
+       a carry and every column between j and k propagates it. Inside each block of `block_size` columns,
+       every carry is worked out directly from that rule instead of waiting for the column below. The
+       carry coming into the block only has to pass one AND (with all the propagates of the block, which
+       are ready early) and one OR, so it crosses a block in two gate delays instead of two per column.'''
+    a, b = _pad(a, b)
+    propagates = [circuit.add_gate('XOR', x, y) if x is not None and y is not None else (x if y is None else y)
+                  for x, y in zip(a, b)]
+    generates = [circuit.add_gate('AND', x, y) if x is not None and y is not None else None for x, y in zip(a, b)]
+    sums = []
+    for start in range(0, len(a), block_size):
+        block_carry = carry
+        for k in range(start, min(start + block_size, len(a))):
+            sums.append(propagates[k] if carry is None else
+                        carry if propagates[k] is None else circuit.add_gate('XOR', propagates[k], carry))
+            # the carry generated in column j survives up to column k
+            terms = []
+            for j in range(start, k + 1):
+                if generates[j] is not None and all(propagates[m] is not None for m in range(j + 1, k + 1)):
+                    terms.append(_reduce(circuit, 'AND', [generates[j]] + propagates[j + 1:k + 1]))
+            carry = _reduce(circuit, 'OR', terms)
+            # and so does the carry coming into the block, if every column up to k propagates it
+            if block_carry is not None and all(propagate is not None for propagate in propagates[start:k + 1]):
+                carried = circuit.add_gate('AND', block_carry, _reduce(circuit, 'AND', propagates[start:k + 1]))
+                carry = carried if carry is None else circuit.add_gate('OR', carry, carried)
+    return sums + [carry]
+
+ADDERS = {'ripple': ripple_carry_adder, 'lookahead': carry_lookahead_adder}
+
+def array_multiplier(circuit, a, b):
+    '''returns the product wires (len(a) + len(b) of them) of the numbers on the wires a and b.
+       Like long multiplication: row i is a AND-ed with bit i of b, shifted i columns, and each row
+       is added to the running total with a row of adders.'''
+    product = []
+    total = [circuit.add_gate('AND', bit_a, b[0]) for bit_a in a]
+    for i in range(1, len(b)):
+        row = [circuit.add_gate('AND', bit_a, b[i]) for bit_a in a]
+        product.append(total[0])
+        total = ripple_carry_adder(circuit, total[1:], row)
+    product.extend(total)
+    product.extend([None] * (len(a) + len(b) - len(product)))
+    return product
+
+def _constant_zero(wires):
+    return [ZERO if wire is None else wire for wire in wires]
+
+def adder_circuit(width, kind='ripple'):
+    '''returns a circuit adding the `width`-bit numbers on the buses a and b into the bus s'''
+    if kind not in ADDERS:
+        raise ValueError(f'unknown adder {kind!r}, expected one of {sorted(ADDERS)}')
+    circuit = Circuit()
+    a, b = circuit.input_bus('a', width), circuit.input_bus('b', width)
+    circuit.output_bus('s', _constant_zero(ADDERS[kind](circuit, a, b)))
+    return circuit
+
+def multiplier_circuit(width):
+    '''returns a circuit multiplying the `width`-bit numbers on the buses a and b into the bus p'''
+    circuit = Circuit()
+    a, b = circuit.input_bus('a', width), circuit.input_bus('b', width)
+    circuit.output_bus('p', _constant_zero(array_multiplier(circuit, a, b)))
+    return circuit
+
+'''Checking a circuit against every possible input.
+
+   We number the inputs so that bit j of the input number goes to the j-th input wire (in the order
+   of circuit.inputs), and put input number 64 x w + l in lane l of word w. Then the planes of the
+   first six input wires are the same in every word (0xAAAA..., 0xCCCC..., ...) and every other
+   plane is a word of all zeros or all ones, so the inputs cost nothing to produce.'''
+
+LANE_PATTERNS = [np.uint64(sum(1 << lane for lane in range(WORD_BITS) if lane >> j & 1)) for j in range(6)]
+
+def exhaustive_planes(count, first_word, words):
+    '''returns the planes of `count` input wires for the input numbers 64 x first_word up to 64 x (first_word + words)'''
+    indices = np.arange(first_word, first_word + words, dtype=np.uint64)
+    planes = []
+    for j in range(count):
+        if j < 6:
+            planes.append(np.full(words, LANE_PATTERNS[j], dtype=np.uint64))
+        else:
+            planes.append(((indices >> np.uint64(j - 6)) & np.uint64(1)) * ALL_ONES)
+    return planes
+
+def add_planes(planes, ones=ALL_ONES):
+    '''the reference for adders: adds the buses a and b directly with word operations'''
+    total, carry = [], ones ^ ones
+    for x, y in zip(planes['a'], planes['b']):
+        total.append(x ^ y ^ carry)
+        carry = (x & y) | (carry & (x ^ y))
+    return {'s': total + [carry]}
+
+def multiply_planes(planes, ones=ALL_ONES):
+    '''the reference for multipliers: shift-and-add of the buses a and b with word operations'''
+    a, b = planes['a'], planes['b']
+    zero = ones ^ ones
+    total = [zero] * (len(a) + len(b))
+    for i, y in enumerate(b):
+        carry = zero
+        for j in range(i, len(total)):
+            x = a[j - i] & y if j - i < len(a) else zero
+            total[j], carry = total[j] ^ x ^ carry, (total[j] & x) | (carry & (total[j] ^ x))
+    return {'p': total}
+
+def verify(circuit, reference, chunk_words=2 ** 15):
+    '''evaluates the circuit on every possible input, `chunk_words` x 64 inputs at a time, and compares
+       its output buses with reference(planes of the input buses). Returns None if they always agree,
+       or else a dict with the numbers on the input buses for the first input where they differ.'''
+    count = len(circuit.inputs)
+    total_words = max(1, 2 ** count // WORD_BITS)
+    # with fewer than 64 inputs in total, only the lowest lanes are real inputs
+    lanes = np.uint64(2 ** min(2 ** count, WORD_BITS) - 1)
+    for first_word in range(0, total_words, chunk_words):
+        words = min(chunk_words, total_words - first_word)
+        inputs = dict(zip(circuit.inputs, exhaustive_planes(count, first_word, words)))
+        outputs = circuit.evaluate(inputs)
+        expected = reference({name: [inputs[wire] for wire in wires] for name, wires in circuit.input_buses.items()})
+        wrong = np.zeros(words, dtype=np.uint64)
+        for name, wires in circuit.output_buses.items():
+            for wire, plane in zip(wires, expected[name]):
+                wrong |= outputs[wire] ^ plane
+        wrong &= lanes
+        if wrong.any():
+            word = int(np.flatnonzero(wrong)[0])
+            lane = (int(wrong[word]) & -int(wrong[word])).bit_length() - 1
+            number = (first_word + word) * WORD_BITS + lane
+            bits = {wire: number >> j & 1 for j, wire in enumerate(circuit.inputs)}
+            return {name: sum(bits[wire] << i for i, wire in enumerate(wires)) for name, wires in circuit.input_buses.items()}
+    return None
@@ -0,0 +1 @@
+'''lets the tests in tests/ import the modules at the top of the repository, however pytest is started'''
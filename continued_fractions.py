@@ -0,0 +1,202 @@
+'''continued fractions, and how they turn floats back into fractions.
+
+   Every fraction can be written as a continued fraction by repeatedly splitting off the whole part
+   and flipping what is left over, which is just Euclid's algorithm:
+
+   43/19 = 2 + 5/19 = 2 + 1/(19/5) = 2 + 1/(3 + 4/5) = 2 + 1/(3 + 1/(1 + 1/4))
+
+   so 43/19 = [2; 3, 1, 4]. Cutting the continued fraction off early gives the 'convergents'
+   2, 7/3, 9/4, 43/19, which are the best approximations of 43/19 with small denominators.
+
+   This is how we recover the fraction a float came from: 0.1 is stored as 3602879701896397/36028797018963968,
+   but the best approximation with a denominator below a million is 1/10:
+
+   best_rational_approximation(0.1, 10**6) # 1/10
+
+   Finding it takes one step per term of the continued fraction, so about log(max_denominator) steps,
+   instead of trying every denominator.
+'''
+
+import numpy as np
+
+from fraction_algorithms import Fraction
+from fraction_arrays import FractionArray
+
+def from_float(x):
+    '''returns the exact value of a float (or int) as a Fraction:
+
+       from_float(0.5) # 1/2
+       from_float(0.1) # 3602879701896397/36028797018963968
+    '''
+    if isinstance(x, Fraction):
+        return x
+    numerator, denominator = x.as_integer_ratio()
+    return Fraction._from_lowest_terms(numerator, denominator)
+
+def continued_fraction(x):
+    '''yields the terms of the continued fraction of a Fraction, int or float:
+
+       list(continued_fraction(Fraction(43, 19))) # [2, 3, 1, 4]
+    '''
+    x = from_float(x)
+    numerator, denominator = x.numerator, x.denominator
+    while denominator:
+        term, remainder = divmod(numerator, denominator)
+        yield term
+        numerator, denominator = denominator, remainder
+
+def convergents(x):
+    '''yields the convergents of a Fraction, int or float, ending with the number itself:
+
+       list(convergents(Fraction(43, 19))) # [2/1, 7/3, 9/4, 43/19]
+    '''
+    previous_numerator, previous_denominator = 0, 1
+    numerator, denominator = 1, 0
+    for term in continued_fraction(x):
+        previous_numerator, numerator = numerator, term * numerator + previous_numerator
+        previous_denominator, denominator = denominator, term * denominator + previous_denominator
+        # consecutive convergents never share a factor, so these are in lowest terms
+        yield Fraction._from_lowest_terms(numerator, denominator)
+
+def limit_denominator(x, max_denominator):
+    '''returns the Fraction closest to x whose denominator is at most max_denominator.
+
+       The answer is either the last convergent whose denominator fits, or a fraction between that
+       convergent and the one before it (a 'semiconvergent'), so we only walk along the convergents:
+
+       limit_denominator(Fraction(43, 19), 4) # 9/4
+    '''
+    if max_denominator < 1:
+        raise ValueError('max_denominator should be at least 1')
+    x = from_float(x)
+    if x.denominator <= max_denominator:
+        return x
+
+    previous_numerator, previous_denominator, numerator, denominator = 0, 1, 1, 0
+    remaining_numerator, remaining_denominator = x.numerator, x.denominator
+    while True:
+        term = remaining_numerator // remaining_denominator
+        next_denominator = previous_denominator + term * denominator
+        if next_denominator > max_denominator:
+            break
+        previous_numerator, previous_denominator, numerator, denominator = (
+            numerator, denominator, previous_numerator + term * numerator, next_denominator)
+        remaining_numerator, remaining_denominator = remaining_denominator, remaining_numerator - term * remaining_denominator
+
+    # the largest semiconvergent whose denominator still fits
+    steps = (max_denominator - previous_denominator) // denominator
+    semiconvergent = Fraction(previous_numerator + steps * numerator, previous_denominator + steps * denominator)
+    convergent = Fraction._from_lowest_terms(numerator, denominator)
+    if abs(convergent - x) <= abs(semiconvergent - x):
+        return convergent
+    return semiconvergent
+
+def best_rational_approximation(x, max_denominator):
+    '''returns the fraction with denominator at most max_denominator that is closest to the float
+       (or Fraction) x, see limit_denominator'''
+    return limit_denominator(x, max_denominator)
+
+def stern_brocot_path(x):
+    '''returns the path from 1/1 down to the positive fraction x in the Stern-Brocot tree, as a list of
+       (direction, number of steps) pairs. Each term of the continued fraction is a run of steps in one
+       direction:
+
+       stern_brocot_path(Fraction(43, 19)) # [('R', 2), ('L', 3), ('R', 1), ('L', 3)]
+    '''
+    terms = list(continued_fraction(x))
+    if from_float(x) <= Fraction(0, 1):
+        raise ValueError('only positive fractions are in the Stern-Brocot tree')
+    # the last step lands on x itself, so the last run is one step shorter
+    terms[-1] -= 1
+    return [('RL'[i % 2], term) for i, term in enumerate(terms) if term]
+
+'''The batch version works on a whole NumPy array of floats at once.
+
+   A float is a whole number M of at most 53 bits times a power of two 2 ** E. When that power of two,
+   and every number the algorithm meets, fits into an int64, the steps of limit_denominator can be done
+   on all the floats at once with int64 arrays. The few floats for which that is not the case (very large,
+   very small, not finite...) go through the one-at-a-time version instead.'''
+
+_INT64_LIMIT = 2 ** 62
+
+def _integer_ratios(values):
+    '''returns int64 numerators and denominators for the floats, and a mask of the floats that did not fit'''
+    mantissas, exponents = np.frexp(np.where(np.isfinite(values), values, 0.0))
+    numerators = (mantissas * 2.0 ** 53).astype(np.int64)
+    exponents = exponents.astype(np.int64) - 53
+    fits = np.isfinite(values) & (exponents > -62) & (exponents < 62 - 53)
+    exponents = np.where(fits, exponents, 0)
+    denominators = np.where(exponents < 0, np.left_shift(1, np.maximum(-exponents, 0)), 1)
+    numerators = np.where(exponents > 0, np.left_shift(numerators, np.maximum(exponents, 0)), numerators)
+    common = np.gcd(numerators, denominators)
+    return numerators // common, denominators // common, ~fits
+
+def from_floats(values, max_denominator=None):
+    '''returns a FractionArray holding the exact value of each float, or with max_denominator,
+       the best approximation of each float with a denominator at most max_denominator:
+
+       from_floats(np.array([0.5, 0.1, 1 / 3]), 1000) # FractionArray([1/2, 1/10, 1/3])
+    '''
+    values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+    numerators, denominators, slow = _integer_ratios(values)
+    if max_denominator is None:
+        slow_values = values[slow]
+    else:
+        if max_denominator < 1:
+            raise ValueError('max_denominator should be at least 1')
+        # keep every numerator p of a candidate p/q with q <= max_denominator inside an int64
+        slow |= max_denominator >= _INT64_LIMIT or np.abs(values) >= _INT64_LIMIT / 4 / max_denominator
+        numerators = np.where(slow, 0, numerators)
+        denominators = np.where(slow, 1, denominators)
+        numerators, denominators, undecided = _limit_denominators(numerators, denominators, max_denominator)
+        slow |= undecided
+        slow_values = values[slow]
+
+    if not slow.any():
+        return FractionArray._from_lowest_terms(numerators, denominators)
+    if not np.isfinite(slow_values).all():
+        raise ValueError('cannot turn infinity or NaN into a fraction')
+    numerators, denominators = numerators.astype(object), denominators.astype(object)
+    for index, value in zip(np.flatnonzero(slow), slow_values):
+        fraction = from_float(float(value)) if max_denominator is None else limit_denominator(float(value), max_denominator)
+        numerators[index], denominators[index] = fraction.numerator, fraction.denominator
+    return FractionArray._from_lowest_terms(numerators, denominators)
+
+def _limit_denominators(numerators, denominators, max_denominator):
+    '''limit_denominator for int64 arrays of fractions in lowest terms. Also returns a mask of the
+       fractions that are exactly halfway between their convergent and semiconvergent in terms of the
+       continued fraction, which are left for the exact version to decide.'''
+    previous_numerators = np.zeros_like(numerators)
+    previous_denominators = np.ones_like(denominators)
+    current_numerators = np.ones_like(numerators)
+    current_denominators = np.zeros_like(denominators)
+    remaining_numerators, remaining_denominators = numerators.copy(), denominators.copy()
+    terms = np.zeros_like(numerators)
+    active = denominators > max_denominator
+
+    while active.any():
+        safe_denominators = np.where(active, remaining_denominators, 1)
+        term = remaining_numerators // safe_denominators
+        # next_denominator = previous + term * current > max_denominator, without overflowing
+        room = (max_denominator - previous_denominators) // np.maximum(current_denominators, 1)
+        stop = active & (current_denominators > 0) & (term > room)
+        terms = np.where(stop, term, terms)
+        step = active & ~stop
+        term = np.where(step, term, 0)
+        previous_numerators, current_numerators = (np.where(step, current_numerators, previous_numerators),
+                                                   np.where(step, previous_numerators + term * current_numerators, current_numerators))
+        previous_denominators, current_denominators = (np.where(step, current_denominators, previous_denominators),
+                                                       np.where(step, previous_denominators + term * current_denominators, current_denominators))
+        remaining_numerators, remaining_denominators = (np.where(step, remaining_denominators, remaining_numerators),
+                                                        np.where(step, remaining_numerators - term * safe_denominators, remaining_denominators))
+        active = step
+
+    # the semiconvergent that uses `steps` of the next term is closer than the convergent exactly
+    # when it uses more than half of that term; at exactly half it depends on the later terms
+    limited = denominators > max_denominator
+    steps = (max_denominator - previous_denominators) // np.maximum(current_denominators, 1)
+    use_semiconvergent = limited & (2 * steps > terms)
+    undecided = limited & (2 * steps == terms)
+    result_numerators = np.where(limited, np.where(use_semiconvergent, previous_numerators + steps * current_numerators, current_numerators), numerators)
+    result_denominators = np.where(limited, np.where(use_semiconvergent, previous_denominators + steps * current_denominators, current_denominators), denominators)
+    return result_numerators, result_denominators, undecided
@@ -0,0 +1,98 @@
+'''precomputed addition, multiplication and division facts for the drill pages.
+
+   Instead of working out 7 x 8 with the loops in arithmetic_algorithms.py every time a drill page
+   asks, we work out every fact up to some size once, store it in a table on disk, and from then on
+   answering is a single lookup:
+
+   multiplication_fact(7, 8) # 56
+   division_fact(17, 5) # (3, 2)
+
+   A table of size n holds the facts for every pair of numbers from 0 to n. It is stored as a .npy file
+   using the smallest unsigned integer type that holds its largest entry, and read back with
+   np.load(mmap_mode='r'), so the operating system only pages in the parts that are used and all
+   worker processes share the same copy. The most recently used tables are also kept open in memory.
+
+   The tables live in a directory only the current user can write to (~/.cache/royal_road/fact_tables
+   unless ROYAL_ROAD_FACT_TABLES says otherwise): anyone who can replace a table decides what the
+   drill pages say 7 x 8 is.
+'''
+
+import functools
+import numbers
+import os
+import tempfile
+
+import numpy as np
+
+from private_cache import CACHE_ROOT, private_directory
+
+OPERATIONS = ('addition', 'multiplication', 'division')
+DEFAULT_SIZE = 100
+TABLES_IN_MEMORY = 16
+TABLE_DIRECTORY = os.environ.get('ROYAL_ROAD_FACT_TABLES', os.path.join(CACHE_ROOT, 'fact_tables'))
+
+def build_table(operation, size):
+    '''returns the table of facts for every pair of numbers from 0 to `size`, as an in-memory array.
+       table[a, b] is a + b or a x b; for division, table[a, b] is the pair (quotient, remainder),
+       and column 0 (division by 0) is filled with zeros.'''
+    if operation not in OPERATIONS:
+        raise ValueError(f'unknown operation {operation!r}, expected one of {OPERATIONS}')
+    if size < 0:
+        raise ValueError('the size of a table cannot be negative')
+    a = np.arange(size + 1, dtype=np.int64)[:, None]
+    b = np.arange(size + 1, dtype=np.int64)[None, :]
+    if operation == 'addition':
+        table = a + b
+    elif operation == 'multiplication':
+        table = a * b
+    else:
+        divisor = np.maximum(b, 1)
+        table = np.stack(np.broadcast_arrays(a // divisor, a % divisor), axis=-1)
+        table[:, 0] = 0
+    return table.astype(np.min_scalar_type(int(table.max(initial=0))))
+
+def table_path(operation, size, directory=None):
+    '''returns where the table is stored on disk'''
+    return os.path.join(directory or TABLE_DIRECTORY, f'{operation}_{size}.npy')
+
+@functools.lru_cache(maxsize=TABLES_IN_MEMORY)
+def fact_table(operation, size=DEFAULT_SIZE, directory=None):
+    '''returns the read-only, memory-mapped table of facts, building and saving it first if needed'''
+    path = table_path(operation, size, directory)
+    private_directory(os.path.dirname(path))
+    if not os.path.exists(path):
+        table = build_table(operation, size)
+        # write to a temporary file first, so other processes never map a half-written table
+        handle, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.npy')
+        with os.fdopen(handle, 'wb') as file:
+            np.save(file, table)
+        os.replace(temporary_path, path)
+    return np.load(path, mmap_mode='r')
+
+def _in_table(a, b, size):
+    '''whether a and b are whole numbers the table has a row and a column for. Anything else, like 2.5
+       or 3.0, is worked out instead, since a table cannot be indexed with it.'''
+    return (isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral)
+            and 0 <= a <= size and 0 <= b <= size)
+
+def addition_fact(a, b, size=DEFAULT_SIZE):
+    '''returns a + b, looked up in the addition table when both numbers are in it'''
+    if _in_table(a, b, size):
+        return int(fact_table('addition', size)[int(a), int(b)])
+    return a + b
+
+def multiplication_fact(a, b, size=DEFAULT_SIZE):
+    '''returns a x b, looked up in the multiplication table when both numbers are in it'''
+    if _in_table(a, b, size):
+        return int(fact_table('multiplication', size)[int(a), int(b)])
+    return a * b
+
+def division_fact(a, b, size=DEFAULT_SIZE):
+    '''returns the quotient and the remainder when a is divided by b,
+       looked up in the division table when both numbers are in it'''
+    if b == 0:
+        raise ZeroDivisionError
+    if _in_table(a, b, size):
+        quotient, remainder = fact_table('division', size)[int(a), int(b)]
+        return int(quotient), int(remainder)
+    return divmod(a, b)
@@ -12,6 +12,9 @@
    See https://codereview.stackexchange.com/questions/83322/fraction-class-in-python
 '''
 
+import math
+import sys
+
 def gcd(m,n):
     '''used to find common denominator when adding two fractions'''
     while m % n != 0:
@@ -23,20 +26,37 @@ def gcd(m,n):
     return n
 
 class Fraction:
+    '''a fraction is always stored in lowest terms with a positive denominator:
+
+       Fraction(6, -4) # -3/2
+    '''
+    # _approximation and _hash start as None and are filled in the first time they are needed
+    __slots__ = ('numerator', 'denominator', '_approximation', '_hash')
+
     def __init__(self, numerator, denominator):
-        greatest_factor = Fraction.gcd(numerator, denominator)
+        # denominator cannot be 0
+        if denominator == 0:
+            raise ZeroDivisionError
+
+        greatest_factor = math.gcd(numerator, denominator)
+
+        # denominator cannot be negative
+        if denominator < 0:
+            greatest_factor = -greatest_factor
 
         self.numerator = numerator // greatest_factor
         self.denominator = denominator // greatest_factor
-        
-        # denominator cannot be negative
-        if self.denominator < 0:
-            self.denominator = abs(self.denominator)
-            self.numerator = -1 * self.numerator
+        self._approximation = self._hash = None
 
-        # denominator cannot be 0
-        elif self.denominator == 0:
-            raise ZeroDivisionError
+    @classmethod
+    def _from_lowest_terms(cls, numerator, denominator):
+        '''returns a Fraction without checking that it is in lowest terms with a positive denominator.
+           Only for results that are known to be in that form already.'''
+        fraction = object.__new__(cls)
+        fraction.numerator = numerator
+        fraction.denominator = denominator
+        fraction._approximation = fraction._hash = None
+        return fraction
 
     @staticmethod
     def gcd(a, b):
@@ -48,69 +68,247 @@ class Fraction:
     def simplify(numerator, denominator):
         '''returns an eqivalent but simpler Fraction by finding the GCD of the numerator and denominator,
            then dividing both by the GCD.'''
-        greatest_factor = Fraction.gcd(numerator, denominator)
-        return Fraction(numerator // greatest_factor, denominator // greatest_factor)
+        return Fraction(numerator, denominator)
 
     def __add__(self,other):
-        '''returns the sum in simplified form'''
-        new_numerator = self.numerator * other.denominator + self.denominator * other.numerator
-        new_denominator = self.denominator * other.denominator
-        return Fraction.simplify(new_numerator, new_denominator)
+        '''returns the sum in simplified form.
+
+           Instead of multiplying the denominators together, we use their least common multiple as
+           the common denominator. The only factors the sum can then be simplified by are the ones
+           the two denominators share, so the final gcd is taken with those alone (Knuth, TAOCP 4.5.1):
+
+           1/6 + 1/10 = (1 x 5 + 1 x 3)/30 = 8/30 = 4/15
+        '''
+        return Fraction._combine(self.numerator, self.denominator, other.numerator, other.denominator)
 
     def __sub__(self, other):
-        '''returns the difference in unsimplified form'''
-        return Fraction.simplify(self.numerator * other.denominator - self.denominator * other.numerator, self.denominator * other.denominator)
+        '''returns the difference in simplified form, see __add__'''
+        return Fraction._combine(self.numerator, self.denominator, -other.numerator, other.denominator)
+
+    @staticmethod
+    def _combine(numerator1, denominator1, numerator2, denominator2):
+        '''returns numerator1/denominator1 + numerator2/denominator2 for two fractions in lowest terms'''
+        shared = math.gcd(denominator1, denominator2)
+        if shared == 1:
+            return Fraction._from_lowest_terms(numerator1 * denominator2 + numerator2 * denominator1, denominator1 * denominator2)
+        rest1 = denominator1 // shared
+        numerator = numerator1 * (denominator2 // shared) + numerator2 * rest1
+        common = math.gcd(numerator, shared)
+        return Fraction._from_lowest_terms(numerator // common, rest1 * (denominator2 // common))
+
+    @staticmethod
+    def sum(fractions):
+        '''returns the sum of an iterable of fractions (or ints):
 
-    def __mult__(self, other):
-        '''returns the product in unsimplified form'''
-        return Fraction.simplify(self.numerator * other.numerator, self.denominator * other.denominator)
+           Fraction.sum(Fraction(1, n) for n in range(1, 11)) # 7381/2520
+
+           Adding left to right makes one running total that every fraction is added to, so the
+           running total's denominator grows with every step and each step costs more than the last.
+           Instead we add the fractions in pairs, then the pairs in pairs, and so on, like the rounds
+           of a tournament, so most additions are between small fractions. Only one partial sum per
+           round is kept while reading the iterable, so memory stays logarithmic in its length.
+        '''
+        return Fraction._tournament(fractions, Fraction.__add__, Fraction(0, 1))
+
+    @staticmethod
+    def prod(fractions):
+        '''returns the product of an iterable of fractions (or ints), multiplying in balanced pairs like sum'''
+        return Fraction._tournament(fractions, Fraction.__mul__, Fraction(1, 1))
+
+    @staticmethod
+    def _tournament(fractions, combine, empty):
+        # (round, partial result) pairs, with rounds strictly decreasing from the bottom of the stack
+        waiting = []
+        for fraction in fractions:
+            if not isinstance(fraction, Fraction):
+                fraction = Fraction(fraction, 1)
+            round_number = 0
+            while waiting and waiting[-1][0] == round_number:
+                fraction = combine(waiting.pop()[1], fraction)
+                round_number += 1
+            waiting.append((round_number, fraction))
+        if not waiting:
+            return empty
+        result = waiting.pop()[1]
+        while waiting:
+            result = combine(waiting.pop()[1], result)
+        return result
+
+    def __mul__(self, other):
+        '''returns the product in simplified form.
+
+           Both fractions are already in lowest terms, so anything the product could be simplified by
+           has to be shared between a numerator and the other fraction's denominator. We cancel those
+           common factors before multiplying (Henrici's trick), which keeps the numbers small and means
+           the product needs no simplifying afterwards:
+
+           2/9 x 3/4 = (1 x 1)/(3 x 2) = 1/6
+        '''
+        factor1 = math.gcd(self.numerator, other.denominator)
+        factor2 = math.gcd(other.numerator, self.denominator)
+        return Fraction._from_lowest_terms((self.numerator // factor1) * (other.numerator // factor2),
+                                           (self.denominator // factor2) * (other.denominator // factor1))
 
     def __truediv__(self, other):
-        '''returns the quotient in unsimplified form'''
-        return Fraction.simplify(self.numerator * other.denominator, self.denominator * other.numerator)
+        '''returns the quotient in simplified form, by multiplying by the flipped fraction'''
+        if other.numerator == 0:
+            raise ZeroDivisionError
+        factor1 = math.gcd(self.numerator, other.numerator)
+        factor2 = math.gcd(self.denominator, other.denominator)
+        numerator = (self.numerator // factor1) * (other.denominator // factor2)
+        denominator = (self.denominator // factor2) * (other.numerator // factor1)
+        if denominator < 0:
+            return Fraction._from_lowest_terms(-numerator, -denominator)
+        return Fraction._from_lowest_terms(numerator, denominator)
+
+    # fractions never change, so the in-place operators give back a new fraction
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+
+    @property
+    def approximation(self):
+        '''the float nearest to the fraction (plus or minus infinity if it is too big for a float),
+           worked out once and then remembered'''
+        if self._approximation is None:
+            try:
+                self._approximation = self.numerator / self.denominator
+            except OverflowError:
+                self._approximation = math.inf if self.numerator > 0 else -math.inf
+        return self._approximation
+
+    def sort_key(self):
+        '''a key for sorted() and list.sort() that compares fractions almost as fast as floats:
 
-    def __iadd__(self,other):
-        '''returns the sum in simplified form'''
-        new_numerator = self.numerator * other.denominator + self.denominator * other.numerator
-        new_denominator = self.denominator * other.denominator
-        return Fraction.simplify(new_numerator, new_denominator)
+           sorted(fractions, key=Fraction.sort_key)
 
-    def __isub__(self, other):
-        '''returns the difference in unsimplified form'''
-        return Fraction.simplify(self.numerator * other.denominator - self.denominator * other.numerator, self.denominator * other.denominator)
+           Python compares the tuples itself, so the fractions are only compared exactly when
+           their floats are equal.'''
+        return (self.approximation, self)
 
-    def __imult__(self, other):
-        '''returns the product in unsimplified form'''
-        return Fraction.simplify(self.numerator * other.numerator, self.denominator * other.denominator)
+    def __hash__(self):
+        '''the same hash Python gives numbers, so that Fraction(2, 1) and 2, or Fraction(1, 2) and 0.5,
+           land on the same key of a set or dict. It is the numerator times the inverse of the
+           denominator, modulo the prime sys.hash_info.modulus.'''
+        if self._hash is None:
+            try:
+                inverse = pow(self.denominator, -1, sys.hash_info.modulus)
+            except ValueError:
+                # the denominator is a multiple of the modulus, which Python hashes like infinity
+                result = sys.hash_info.inf
+            else:
+                result = hash(hash(abs(self.numerator)) * inverse)
+            if self.numerator < 0:
+                result = -result
+            self._hash = -2 if result == -1 else result
+        return self._hash
 
-    def __itruediv__(self, other):
-        '''returns the quotient in unsimplified form'''
-        return Fraction.simplify(self.numerator * other.denominator, self.denominator * other.numerator)
+    @staticmethod
+    def _as_fraction(other):
+        '''returns ints and finite floats as Fractions, and anything else unchanged'''
+        if isinstance(other, int):
+            return Fraction._from_lowest_terms(other, 1)
+        if isinstance(other, float) and math.isfinite(other):
+            return Fraction._from_lowest_terms(*other.as_integer_ratio())
+        return other
+
+    '''Comparisons look at the floats first. Rounding to the nearest float never changes the order of
+       two numbers, so when the floats differ they already give the answer, and the exact comparison
+       (two cross multiplications of possibly big numbers) is only needed when the floats are equal.
+       sorted() compares fractions with each other, so for another Fraction we read the floats straight
+       from their slots, and only convert ints and floats the slower way.
+
+       Infinities and nan have no exact value, but they need none: every fraction lies between -inf and
+       inf, and nothing is smaller or larger than nan, so comparing any finite float with them gives the
+       answer (0.0 < math.inf, not 0.0 < math.nan). Anything that is not a number gives NotImplemented,
+       so Python tries the other side and then raises TypeError.'''
 
     def __eq__(self, other):
-        return self.numerator * other.denominator == other.numerator * self.denominator
+        other = Fraction._as_fraction(other)
+        if not isinstance(other, Fraction):
+            return NotImplemented
+        # both fractions are in lowest terms, so equal fractions are written the same way
+        return self.numerator == other.numerator and self.denominator == other.denominator
 
     def __ne__(self, other):
-        return not self == other
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
 
     def __lt__(self, other):
+        if type(other) is not Fraction:
+            other = Fraction._as_fraction(other)
+            if isinstance(other, float):
+                return 0.0 < other
+            if not isinstance(other, Fraction):
+                return NotImplemented
+        mine, theirs = self._approximation, other._approximation
+        if mine is None:
+            mine = self.approximation
+        if theirs is None:
+            theirs = other.approximation
+        if mine != theirs:
+            return mine < theirs
         return self.numerator * other.denominator < other.numerator * self.denominator
 
     def __gt__(self, other):
+        if type(other) is not Fraction:
+            other = Fraction._as_fraction(other)
+            if isinstance(other, float):
+                return 0.0 > other
+            if not isinstance(other, Fraction):
+                return NotImplemented
+        mine, theirs = self._approximation, other._approximation
+        if mine is None:
+            mine = self.approximation
+        if theirs is None:
+            theirs = other.approximation
+        if mine != theirs:
+            return mine > theirs
         return self.numerator * other.denominator > other.numerator * self.denominator
 
     def __ge__(self, other):
+        if type(other) is not Fraction:
+            other = Fraction._as_fraction(other)
+            if isinstance(other, float):
+                return 0.0 >= other
+            if not isinstance(other, Fraction):
+                return NotImplemented
+        mine, theirs = self._approximation, other._approximation
+        if mine is None:
+            mine = self.approximation
+        if theirs is None:
+            theirs = other.approximation
+        if mine != theirs:
+            return mine > theirs
         return self.numerator * other.denominator >= other.numerator * self.denominator
 
     def __le__(self, other):
+        if type(other) is not Fraction:
+            other = Fraction._as_fraction(other)
+            if isinstance(other, float):
+                return 0.0 <= other
+            if not isinstance(other, Fraction):
+                return NotImplemented
+        mine, theirs = self._approximation, other._approximation
+        if mine is None:
+            mine = self.approximation
+        if theirs is None:
+            theirs = other.approximation
+        if mine != theirs:
+            return mine < theirs
         return self.numerator * other.denominator <= other.numerator * self.denominator
 
     def __invert__(self):
         '''returns a fraction where the numerator is the previous denominator and vice-versa'''
-        return Fraction(self.denominator, self.numerator)
+        if self.numerator == 0:
+            raise ZeroDivisionError
+        if self.numerator < 0:
+            return Fraction._from_lowest_terms(-self.denominator, -self.numerator)
+        return Fraction._from_lowest_terms(self.denominator, self.numerator)
 
     def __abs__(self):
-        return Fraction(abs(self.denominator), abs(self.numerator))
+        return Fraction._from_lowest_terms(abs(self.numerator), self.denominator)
 
     def __repr__(self):
-        return str(self.numerator) + "/" + str(self.denominator)
\ No newline at end of file
+        return str(self.numerator) + "/" + str(self.denominator)
@@ -0,0 +1,173 @@
+'''FractionArray: many fractions at once, the array version of Fraction in fraction_algorithms.py.
+
+   Checking a million answers one Fraction at a time means a million Python-level operations. A FractionArray
+   keeps all the numerators in one NumPy array and all the denominators in another, so each operation is
+   done on every fraction at once, at C speed:
+
+   answers = FractionArray([1, 2, 3], [2, 4, 9])
+   answers # FractionArray([1/2, 1/2, 1/3])
+   answers == FractionArray.from_fractions([Fraction(1, 2), Fraction(2, 3), Fraction(1, 3)]) # array([ True, False,  True])
+
+   Like Fraction, every fraction is kept in lowest terms with a positive denominator.
+
+   The arrays hold int64s. Before any multiplication we check whether the product might not fit; the
+   fractions for which that happens are computed with Python ints instead, and the arrays switch to
+   dtype=object until the numbers are small enough to fit into int64s again.'''
+
+import numpy as np
+
+from fraction_algorithms import Fraction
+
+def _integers(values):
+    '''returns `values` as an int64 array, or as an object array of Python ints if some of them do not fit'''
+    array = np.asarray(values)
+    if array.dtype.kind not in 'biuO':
+        raise TypeError(f'numerators and denominators must be integers, got an array of {array.dtype}')
+    if array.dtype.kind == 'u' and array.size and array.max() > np.iinfo(np.int64).max:
+        return np.array([int(value) for value in array.flat], dtype=object).reshape(array.shape)
+    if array.dtype.kind == 'O':
+        try:
+            return array.astype(np.int64)
+        except (OverflowError, TypeError):
+            return array
+    return array.astype(np.int64)
+
+def _multiply(a, b):
+    '''returns the elementwise product, switching to Python ints for the products that might not fit into an int64'''
+    if a.dtype == object or b.dtype == object:
+        return a * b
+    # the float products are off by far less than the factor of two of headroom this leaves
+    might_overflow = np.abs(a.astype(np.float64)) * np.abs(b.astype(np.float64)) >= 2.0 ** 62
+    if not might_overflow.any():
+        return a * b
+    a, b = np.broadcast_arrays(a, b)
+    product = (a * b).astype(object)
+    product[might_overflow] = [int(x) * int(y) for x, y in zip(a[might_overflow], b[might_overflow])]
+    return product
+
+def _lowest_terms(numerators, denominators):
+    '''divides each numerator and denominator by their gcd and moves signs into the numerators'''
+    if np.any(denominators == 0):
+        raise ZeroDivisionError
+    greatest_factors = np.gcd(numerators, denominators)
+    greatest_factors = np.where(denominators < 0, -greatest_factors, greatest_factors)
+    return _integers(numerators // greatest_factors), _integers(denominators // greatest_factors)
+
+class FractionArray:
+    '''a one-dimensional array of fractions, stored as an array of numerators and an array of denominators'''
+    __slots__ = ('numerators', 'denominators')
+
+    def __init__(self, numerators, denominators=1):
+        numerators, denominators = np.broadcast_arrays(_integers(numerators), _integers(denominators))
+        self.numerators, self.denominators = _lowest_terms(np.atleast_1d(numerators), np.atleast_1d(denominators))
+
+    @classmethod
+    def _from_lowest_terms(cls, numerators, denominators):
+        '''returns a FractionArray without reducing, for results that are in lowest terms already'''
+        fractions = object.__new__(cls)
+        fractions.numerators = _integers(numerators)
+        fractions.denominators = _integers(denominators)
+        return fractions
+
+    @classmethod
+    def from_fractions(cls, fractions):
+        '''returns a FractionArray holding the given Fraction objects'''
+        fractions = list(fractions)
+        numerators = np.array([fraction.numerator for fraction in fractions], dtype=object)
+        denominators = np.array([fraction.denominator for fraction in fractions], dtype=object)
+        return cls._from_lowest_terms(numerators, denominators)
+
+    def to_fractions(self):
+        '''returns a list of Fraction objects'''
+        return [Fraction._from_lowest_terms(int(numerator), int(denominator))
+                for numerator, denominator in zip(self.numerators, self.denominators)]
+
+    @staticmethod
+    def _operands(other):
+        '''returns the numerators and denominators of a FractionArray, a Fraction, an int, or an array of ints'''
+        if isinstance(other, FractionArray):
+            return other.numerators, other.denominators
+        if isinstance(other, Fraction):
+            return _integers(other.numerator), _integers(other.denominator)
+        numerators = _integers(other)
+        return numerators, np.ones_like(numerators)
+
+    def __add__(self, other):
+        '''returns the sums in simplified form, using the least common multiple of the denominators'''
+        numerators, denominators = self._operands(other)
+        common = np.gcd(self.denominators, denominators)
+        return FractionArray(_multiply(self.numerators, denominators // common) + _multiply(numerators, self.denominators // common),
+                             _multiply(self.denominators // common, denominators))
+
+    def __sub__(self, other):
+        '''returns the differences in simplified form'''
+        numerators, denominators = self._operands(other)
+        common = np.gcd(self.denominators, denominators)
+        return FractionArray(_multiply(self.numerators, denominators // common) - _multiply(numerators, self.denominators // common),
+                             _multiply(self.denominators // common, denominators))
+
+    def __mul__(self, other):
+        '''returns the products in simplified form, cancelling common factors first like Fraction.__mul__'''
+        numerators, denominators = self._operands(other)
+        factors1 = np.gcd(self.numerators, denominators)
+        factors2 = np.gcd(numerators, self.denominators)
+        return FractionArray._from_lowest_terms(_multiply(self.numerators // factors1, numerators // factors2),
+                                                _multiply(self.denominators // factors2, denominators // factors1))
+
+    def __truediv__(self, other):
+        '''returns the quotients in simplified form'''
+        numerators, denominators = self._operands(other)
+        if np.any(numerators == 0):
+            raise ZeroDivisionError
+        factors1 = np.gcd(self.numerators, numerators)
+        factors2 = np.gcd(self.denominators, denominators)
+        new_numerators = _multiply(self.numerators // factors1, denominators // factors2)
+        new_denominators = _multiply(self.denominators // factors2, numerators // factors1)
+        signs = np.where(new_denominators < 0, -1, 1)
+        return FractionArray._from_lowest_terms(new_numerators * signs, new_denominators * signs)
+
+    def __neg__(self):
+        return FractionArray._from_lowest_terms(-self.numerators, self.denominators)
+
+    def _cross_products(self, other):
+        numerators, denominators = self._operands(other)
+        return _multiply(self.numerators, denominators), _multiply(numerators, self.denominators)
+
+    def __eq__(self, other):
+        # both sides are in lowest terms, so equal fractions have equal numerators and denominators
+        numerators, denominators = self._operands(other)
+        return (self.numerators == numerators) & (self.denominators == denominators)
+
+    def __ne__(self, other):
+        return ~(self == other)
+
+    def __lt__(self, other):
+        left, right = self._cross_products(other)
+        return left < right
+
+    def __gt__(self, other):
+        left, right = self._cross_products(other)
+        return left > right
+
+    def __ge__(self, other):
+        left, right = self._cross_products(other)
+        return left >= right
+
+    def __le__(self, other):
+        left, right = self._cross_products(other)
+        return left <= right
+
+    def __len__(self):
+        return len(self.numerators)
+
+    def __getitem__(self, index):
+        '''returns a Fraction for an integer index, and a FractionArray for a slice or a mask'''
+        if isinstance(index, (int, np.integer)):
+            return Fraction._from_lowest_terms(int(self.numerators[index]), int(self.denominators[index]))
+        return FractionArray._from_lowest_terms(self.numerators[index], self.denominators[index])
+
+    def __iter__(self):
+        return iter(self.to_fractions())
+
+    def __repr__(self):
+        return 'FractionArray([' + ', '.join(repr(fraction) for fraction in self) + '])'
@@ -11,11 +11,14 @@
    
    sudo apt install graphviz.
    
-   The following is a simple demonstration involving a tree with one root that has two children:
+   demo() is a simple demonstration involving a tree with one root that has two children; run it with:
+
+   python -m mishnah.trees
+
+   anytree (and its graphviz exporter) is only imported by demo(), so the trees below can be used 
+   without it.
 '''
 
-from anytree import Node, RenderTree
-from anytree.exporter import DotExporter   
 from queue import Queue
 
 
@@ -252,7 +255,11 @@ class ListClass:
     def __iter__(self):
         return (item for item in self.items)
 
-if __name__ == "__main__":
+def demo(picture='root.png'):
+    '''builds a tree with anytree, prints it, and saves an image of it called `picture`'''
+    from anytree import Node, RenderTree
+    from anytree.exporter import DotExporter
+
     # wire up the nodes to each other, making a linked structure
     root = Node("root")
     left_child = Node("left_child", parent=root)
@@ -265,4 +272,7 @@ if __name__ == "__main__":
         print("%s%s" % (pre, node.name))
 
     # save an image of the tree starting from the root in the current working directory called 'root.png'
-    DotExporter(root).to_picture("root.png")
\ No newline at end of file
+    DotExporter(root).to_picture(picture)
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,25 @@
+'''where the caches kept on disk live, and how their directories are made private.
+
+   Every cache that the lessons keep on disk (the fact tables of fact_tables.py, the limits of
+   calculus/limits.py) lives under CACHE_ROOT, which is $XDG_CACHE_HOME/royal_road, or
+   ~/.cache/royal_road when XDG_CACHE_HOME is not set:
+
+   os.path.join(CACHE_ROOT, 'fact_tables') # ~/.cache/royal_road/fact_tables
+
+   Anyone who can write to a cache decides what it answers, so private_directory refuses to use a
+   directory that someone else could have put something in.
+'''
+
+import os
+
+CACHE_ROOT = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'royal_road')
+
+def private_directory(directory):
+    '''creates the directory if needed, readable and writable only by the current user, and raises
+       PermissionError if it already exists and belongs to someone else or others can write to it'''
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, 'getuid'):
+        return
+    status = os.stat(directory)
+    if status.st_uid != os.getuid() or status.st_mode & 0o022:
+        raise PermissionError(f'{directory} must belong to the current user and not be writable by anyone else')
@@ -1,7 +1,10 @@
 import math
+import numbers
 from functools import reduce
 from itertools import combinations
 
+import numpy as np
+
 
 '''a module to implement basic ideas in quantum computing'''
 
@@ -24,7 +27,7 @@ def gram_schmidt(list_of_vectors):
     basis = gram_schmidt(list_of_vectors[0: -1])
 
     # compute the last orthonormal basis vector
-    w = (u - sum_all(ComplexVector(u.projection_onto(v)  for v in basis)))
+    w = (u - sum_all([u.projection_onto(v) for v in basis]))
 
     # append this orthonormal vector to the rest of the orthonormal basis
     basis.append(w.normalize())
@@ -66,50 +69,138 @@ def linear_combination(list_of_vectors, list_of_scalars):
       list_of_vectors = [v1, v2]
       linear_combination(list_of_vectors, [1,2])
     '''
-    length = len(list_of_vectors[0])
-    vectors_and_scalars = list(zip(list_of_vectors, list_of_scalars))
-    scaled_vectors = []
-    for vector_scalar in vectors_and_scalars:
-        scalar = vector_scalar[-1]
-        vector = vector_scalar[:-1][0]
-        new_vector = [u.scalar_multiplication(scalar) for u in vector]
-        scaled_vectors.append(new_vector)
-    vectors_to_add = [(x[0], x[1]) for x in list(zip(*scaled_vectors))]
-    answer= []
-    for i in range(length):
-        answer.append(reduce(Complex.__add__, vectors_to_add[i]))
-    return ComplexVector(answer)
+    total = sum(_amplitudes(vector) * scalar for vector, scalar in zip(list_of_vectors, list_of_scalars))
+    return ComplexVector(total)
+
+def _amplitudes(values):
+    '''returns a ComplexVector, a NumPy array, or a list of Complex objects (or numbers) as a complex128 array'''
+    if isinstance(values, ComplexVector):
+        return values.amplitudes
+    if isinstance(values, np.ndarray):
+        return np.ascontiguousarray(values, dtype=np.complex128)
+    return np.array([complex(z) for z in values], dtype=np.complex128)
 
 class Complex():
     '''represents a complex number:
     
        c = Complex(1, 2)
+
+       Complex numbers mix with Python's built-in complex numbers (and ints and floats), and
+       complex(c) turns one into a built-in complex number:
+
+       Complex(1, 2) + 1j # (1.0, 3.0)
+       complex(Complex(1, 2)) # (1+2j)
+
+       A Complex object only has room for x and y (__slots__), so it is smaller and quicker to make
+       than an object with a __dict__. += and *= change the number itself instead of making a new one,
+       which is what we want in a loop adding up many numbers, but it means that after a = b, a += c
+       changes b as well.
     '''
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y=0.0):
         self.x = x
         self.y = y
+
+    @staticmethod
+    def _as_complex(other):
+        '''returns any other kind of number (like 1j, 2 or 0.5) as a Complex, or None'''
+        # built-in numbers first, since isinstance with the numbers ABCs is slow
+        if type(other) is float or type(other) is int:
+            return Complex(other, 0)
+        if type(other) is complex:
+            return Complex(other.real, other.imag)
+        if isinstance(other, numbers.Real):
+            return Complex(other, 0)
+        if isinstance(other, numbers.Complex):
+            return Complex(other.real, other.imag)
+        return None
+
+    def __complex__(self):
+        return complex(self.x, self.y)
      
     def __add__(self, other):
         '''returns the sum of two complex numbers'''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
         return Complex(other.x + self.x, other.y + self.y)
 
+    __radd__ = __add__
+
+    def __iadd__(self, other):
+        '''adds another complex number to this one, without making a new Complex object'''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
+        self.x += other.x
+        self.y += other.y
+        return self
+
     def sum_all(self, list_of_complex_numbers):
         '''returns the result of summing this complex number with a list of complex numbers'''
         return reduce((lambda x, y: x + y), list_of_complex_numbers)
 
     def __sub__(self, other):
         '''returns the result of subtracting this complex number from antoher complex number'''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
         return Complex(self.x - other.x, self.y - other.y)
 
+    def __rsub__(self, other):
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
+        return Complex(other.x - self.x, other.y - self.y)
+
     def __mul__(self, other):
         '''returns the product of two complex numbers'''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
         return Complex(self.x * other.x - self.y * other.y, self.x * other.y + self.y * other.x)
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other):
+        '''multiplies this complex number by another one, without making a new Complex object'''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
+        self.x, self.y = self.x * other.x - self.y * other.y, self.x * other.y + self.y * other.x
+        return self
      
     def __truediv__(self, other):
-        '''returns the quotient of two complex numbers using the complex conjugate of the denominator'''
-        numerator = self * other.complex_conjugate()
-        denominator = other * other.complex_conjugate()
-        return numerator.scalar_multiplication(1/denominator.x)
+        '''returns the quotient of two complex numbers using the complex conjugate of the denominator:
+        
+           (a + bi) / (c + di) = (a + bi)(c - di) / (c^2 + d^2) = ((ac + bd) + (bc - ad)i) / (c^2 + d^2)
+        '''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
+        return Complex._divide(self.x, self.y, other.x, other.y)
+
+    def __rtruediv__(self, other):
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
+        return Complex._divide(other.x, other.y, self.x, self.y)
+
+    @staticmethod
+    def _divide(a, b, c, d):
+        denominator = c * c + d * d
+        if denominator == 0:
+            raise ZeroDivisionError('complex division by zero')
+        return Complex((a * c + b * d) / denominator, (b * c - a * d) / denominator)
 
     def scalar_multiplication(self, scalar):
         '''returns the result of scalar multiplciaiotn of this Copmlex object with a scalar value'''
@@ -125,7 +216,7 @@ class Complex():
     
     def modulus_squared(self):
         '''returns the squared magnitude of this complex number as a single, real number'''
-        return (self * self.complex_conjugate()).x
+        return self.x * self.x + self.y * self.y
 
     def __neg__(self):
         '''returns the negation of this complex number'''
@@ -138,6 +229,10 @@ class Complex():
         c2 = Complex(2, -5)
         c1 == c2 # True
         '''
+        if not isinstance(other, Complex):
+            other = Complex._as_complex(other)
+            if other is None:
+                return NotImplemented
         return abs(self.x - other.x) < epsilon and abs(self.y - other.y) < epsilon
     
     def __str__(self):
@@ -147,32 +242,64 @@ class Complex():
         return f'({self.x}, {self.y})'
 
 class ComplexVector():
-    '''represents a list of Copmlex objects'''
+    '''represents a list of Copmlex objects.
+
+       The numbers are stored side by side in a NumPy array of complex128 (pairs of floats), called
+       amplitudes, so operations on the whole vector run in NumPy instead of making a new Complex
+       object for every number. Indexing and iterating still hand out Complex objects, made from the
+       stored numbers:
+
+       v = ComplexVector([Complex(1, 2), Complex(3, 4)])
+       v[0] # (1.0, 2.0)
+       v.inner_product(v) # (30.0, 0.0)
+
+       A ComplexVector made from a NumPy array, another ComplexVector or a slice of one gets its own
+       copy of the numbers, so changing one never changes the other.
+    '''
     def __init__(self, list_of_complex_numbers):
-        self.list_of_complex_numbers = list_of_complex_numbers
+        self.amplitudes = np.array(_amplitudes(list_of_complex_numbers), dtype=np.complex128)
+        if self.amplitudes.ndim != 1:
+            raise ValueError('a ComplexVector holds a one-dimensional list of numbers')
         self.current_index = 0
-    
+
+    @classmethod
+    def _from_amplitudes(cls, amplitudes):
+        '''returns a ComplexVector holding the array itself, for arrays just worked out (nobody else
+           has them, so there is no need to copy them)'''
+        vector = cls.__new__(cls)
+        vector.amplitudes = amplitudes
+        vector.current_index = 0
+        return vector
+
+    @property
+    def list_of_complex_numbers(self):
+        '''the numbers of this vector as a list of Complex objects'''
+        return list(self)
+
+    def _other_amplitudes(self, other):
+        amplitudes = _amplitudes(other)
+        if len(amplitudes) != len(self.amplitudes):
+            raise ValueError(f'cannot combine vectors of lengths {len(self.amplitudes)} and {len(amplitudes)}')
+        return amplitudes
+
     def hermitian_conjugate(self):
         '''returns the hermitian conjugate of a ComplexVector'''
-        return ComplexVector([v.complex_conjugate() for v in self])
+        return ComplexVector._from_amplitudes(self.amplitudes.conj())
 
     def inner_product(self, other):
         '''returns the inner product of this vector with some other vector'''
-        sum_so_far = Complex(0,0)
-        bra = self.hermitian_conjugate()
-        product_pairs = zip(bra, other)
-        for z1, z2 in product_pairs:
-            sum_so_far += z1 * z2
-        return sum_so_far
+        # vdot conjugates its first argument, so there is no need to build the conjugated vector
+        product = np.vdot(self.amplitudes, self._other_amplitudes(other))
+        return Complex(float(product.real), float(product.imag))
 
     def norm(self):
         '''returns the norm of this vector'''
-        return math.sqrt(self.inner_product(self).x)
+        return math.sqrt(np.vdot(self.amplitudes, self.amplitudes).real)
 
     def normalize(self):
         '''returns a normalized version of this vector'''
         norm = self.norm()
-        return self.scalar_multiplication(1/norm)
+        return ComplexVector._from_amplitudes(self.amplitudes * (1/norm))
 
     def is_normalized(self, epsilon=0.1):
         '''returns True if this vector is normalized, False otherwise'''
@@ -184,13 +311,12 @@ class ComplexVector():
 
     def projection_onto(self, other):
         '''returns the projection of this vector onto some other vector'''
-        unit_vector = other.normalize()
-        return unit_vector.scalar_multiplication(self.inner_product(unit_vector))
+        unit_vector = _amplitudes(other) * (1/other.norm())
+        return ComplexVector._from_amplitudes(unit_vector * np.vdot(self.amplitudes, unit_vector))
 
     def __add__(self, other):
         '''returns the sum of two complex vectors'''
-        pairs = zip(self, other)
-        return ComplexVector([u + v for (u, v) in pairs])
+        return ComplexVector._from_amplitudes(self.amplitudes + self._other_amplitudes(other))
 
     def sum_all(self, list_of_complex_vectors):
         '''returns the result of summing this ComplexVector with a list of ComplexVectors'''
@@ -198,50 +324,57 @@ class ComplexVector():
 
     def __sub__(self, other):
         '''returns the result of subtracting this complex vector from antoher complex vector'''
-        pairs = zip(self, other)
-        return ComplexVector([u - v for (u, v) in pairs])
+        return ComplexVector._from_amplitudes(self.amplitudes - self._other_amplitudes(other))
 
     def __mul__(self, other):
         '''returns the component-wise product of two complex vectors'''
-        pairs = zip(self, other)
-        return ComplexVector([u * v for (u, v) in pairs])
+        return ComplexVector._from_amplitudes(self.amplitudes * self._other_amplitudes(other))
 
     def __truediv__(self, other):
         '''returns the component-wise division of two complex vectors'''
-        pairs = zip(self, other)
-        return ComplexVector([u / v for (u, v) in pairs])
+        other = self._other_amplitudes(other)
+        if not other.all():
+            raise ZeroDivisionError('complex division by zero')
+        return ComplexVector._from_amplitudes(self.amplitudes / other)
 
     def scalar_multiplication(self, scalar):
         '''returns the component-wise scalar multiplication of a complex vector with a scalar'''
-        if type(scalar) == Complex:
-            return ComplexVector([u * scalar for u in self.list_of_complex_numbers]) 
-        return ComplexVector([u.scalar_multiplication(scalar) for u in self.list_of_complex_numbers])
+        return ComplexVector._from_amplitudes(self.amplitudes * complex(scalar))
     
     def complex_conjugate(self):
         '''returns the component-wise complex-conjugate of a complex vector'''
-        return ComplexVector([u.complex_conjugate() for u in self.list_of_complex_numbers])
+        return ComplexVector._from_amplitudes(self.amplitudes.conj())
 
     def __len__(self):
-        return len(self.list_of_complex_numbers)
+        return len(self.amplitudes)
+
+    def __getitem__(self, index):
+        '''returns the Complex number at index, or a ComplexVector for a slice'''
+        if isinstance(index, slice):
+            return ComplexVector(self.amplitudes[index])
+        z = self.amplitudes[index]
+        return Complex(float(z.real), float(z.imag))
+
+    def __setitem__(self, index, value):
+        self.amplitudes[index] = complex(value)
 
     def __iter__(self):
         '''allows complex vectors to be used with the zip() function'''
-        return (x for x in self.list_of_complex_numbers)
+        return (Complex(z.real, z.imag) for z in self.amplitudes.tolist())
 
     def __next__(self):
         '''allows complex vectors to be used in for loops'''
-        try: 
-            current = self.list_of_complex_numbers[self.current_index]
-        except IndexError:
+        if self.current_index >= len(self.amplitudes):
             raise StopIteration
+        current = self[self.current_index]
         self.current_index += 1
         return current
         
     def __str__(self):
-        list_of_strings = [str(c) for c in self.list_of_complex_numbers]
+        list_of_strings = [str(c) for c in self]
         return '[' + ','.join(list_of_strings) + ']'
      
     def __repr__(self):
-        list_of_strings = [repr(c) for c in self.list_of_complex_numbers]
+        list_of_strings = [repr(c) for c in self]
         return '[' + ','.join(list_of_strings) + ']'
 
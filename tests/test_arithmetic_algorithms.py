@@ -0,0 +1,187 @@
+'''tests for arithmetic_algorithms.py. Every engine has to give the same answers as the pedagogical loops,
+   including their errors, and every way of multiplying long numbers the same answers as Python.'''
+
+import decimal
+import fractions
+import itertools
+import random
+
+import pytest
+
+import arithmetic_algorithms as arithmetic
+
+def outcome(function, inputs, engine):
+    try:
+        result = function(*inputs, engine=engine)
+    except Exception as error:
+        return ('error', type(error))
+    return ('value', result, type(result))
+
+def assert_engines_agree(function, inputs, engine):
+    '''the engine has to give what the pedagogical loop gives, except that add rounds floats once where
+       the loop rounds after every + 1, so there the values only have to be close'''
+    fast, pedagogical = outcome(function, inputs, engine), outcome(function, inputs, 'pedagogical')
+    if function not in DIVISION_FUNCTIONS and fast[0] == 'value' and any(isinstance(number, float) for number in inputs):
+        assert fast[1] == pytest.approx(pedagogical[1], rel=1e-15)
+        fast, pedagogical = fast[::2], pedagogical[::2]
+    assert fast == pedagogical
+
+DIVISION_FUNCTIONS = [arithmetic.quotient, arithmetic.remainder, arithmetic.quotient_and_remainder,
+                      arithmetic.quotient_and_remainder2]
+
+# decimals that floats cannot hold exactly, negatives, zero, and halves that range() rejects
+DIVISION_INPUTS = [(0.5, 0.1), (1.2, 0.3), (1.0, 0.1), (0.3, 0.1), (7.7, 1.1), (2.5, 0.5), (10, 0.3),
+                   (960, 4), (17, 5), (5, 17), (0, 3), (0, 0.1), (3, 0), (0.5, 0), (-7, 2), (-0.7, 0.2),
+                   (-5, -3), (-0.5, -0.1), (4, 4), (4.0, 4), (9, 2.5),
+                   (102.6, 1.8), (142.8, 0.2), (12345.678, 0.03), (3.0, 1.5), (2.0 ** 53 + 2, 2.0 ** 52 + 1),
+                   (float('nan'), 1.0), (1.0, float('nan')), (2.0, float('inf'))]
+
+@pytest.mark.parametrize('function', DIVISION_FUNCTIONS, ids=lambda function: function.__name__)
+@pytest.mark.parametrize('inputs', DIVISION_INPUTS, ids=str)
+@pytest.mark.parametrize('engine', arithmetic.DIVISION_ENGINES[1:])
+def test_division_engines_agree(function, inputs, engine):
+    assert_engines_agree(function, inputs, engine)
+
+def test_negative_divisor_raises_instead_of_looping_forever():
+    for engine in arithmetic.DIVISION_ENGINES[1:]:
+        with pytest.raises(ValueError):
+            arithmetic.quotient(5, -2, engine=engine)
+
+@pytest.mark.parametrize('function', [arithmetic.add, arithmetic.multiply, arithmetic.multiplication],
+                         ids=lambda function: function.__name__)
+@pytest.mark.parametrize('inputs', [(3, 4), (0, 5), (5, 0), (-3, 4), (3, -4), (-3, -4), (2.5, 3), (3, 2.5),
+                                    (0.1, 3), (3, 0.1), (0.0, 0), (1e16, 3), (2.0 ** 53, 5), (-1e16, 4),
+                                    (1e15 + 0.5, 7), (1e300, 2)], ids=str)
+def test_engines_agree(function, inputs):
+    assert_engines_agree(function, inputs, 'fast')
+
+def test_fast_engine_rounds_floats_once():
+    # 1e16 + 1 rounds back to 1e16, so the loop never gets anywhere
+    assert arithmetic.add(1e16, 3) == 1e16
+    assert arithmetic.add(1e16, 3, engine='fast') == 1e16 + 4 == float(10 ** 16 + 3)
+
+def test_fast_division_of_floats_does_not_loop():
+    assert arithmetic.quotient(1e12, 1.0, engine='fast') == 10 ** 12
+    # the loop drifts away from divmod, and the fast engine drifts with it
+    assert arithmetic.quotient_and_remainder(1.0, 0.1, engine='fast') == (10, 1.3877787807814457e-16)
+    assert divmod(1.0, 0.1) == (9.0, 0.09999999999999995)
+    assert arithmetic.quotient(1e6, 0.1, engine='fast') == arithmetic.quotient(1e6, 0.1)
+    assert arithmetic.quotient_and_remainder(7.5, 2.0, engine='long') == (3, 1.5)
+    quotient, remainder = arithmetic.quotient_and_remainder(float('inf'), float('inf'), engine='fast')
+    assert quotient == 1 and remainder != remainder
+    # subtracting 0.5 from 1e16 rounds back to 1e16, and subtracting from infinity gives infinity
+    for inputs in [(1e16, 0.5), (float('inf'), 2.0)]:
+        with pytest.raises(ValueError):
+            arithmetic.quotient(*inputs, engine='fast')
+
+def test_generalized_addition_engines_agree():
+    for inputs in [(), (1, 2, 3), (-1, 2, 0), (0.5, 2), (1, 0.1)]:
+        assert_engines_agree(arithmetic.generalized_addition, inputs, 'fast')
+
+def test_check_engines_finds_no_disagreements():
+    assert arithmetic.check_engines(trials=300, largest=50) == []
+
+def test_long_division_trace():
+    steps = []
+    assert arithmetic.long_quotient_and_remainder(960, 4, trace=steps) == (240, 0)
+    assert steps[0] == arithmetic.DivisionStep(place=2, digit=2, subtracted=800, remainder=160)
+
+@pytest.mark.parametrize('numerator, denominator, expected', [
+    (1, 4, '0.25'), (6, 3, '2'), (5, 4, '1.25'), (0, 5, '0'), (1, 8, '0.125'), (3, 1024, '0.0029296875'),
+    (1, 7, '0.(142857)'), (22, 7, '3.(142857)'), (1, 3, '0.(3)'), (1, 6, '0.1(6)'), (7, 12, '0.58(3)'),
+    (1, 81, '0.(012345679)'), (1, 11, '0.(09)'), (14, 21, '0.(6)'), (1, 70, '0.0(142857)')], ids=str)
+def test_repeating_decimal(numerator, denominator, expected):
+    assert arithmetic.repeating_decimal(numerator, denominator) == expected
+
+def test_decimal_expansion_matches_fractions():
+    generator = random.Random(0)
+    for _ in range(500):
+        numerator, denominator = generator.randint(0, 10 ** 4), generator.randint(1, 2000)
+        integer_part, non_repeating, repeating = arithmetic.decimal_expansion(numerator, denominator)
+        shift = 10 ** len(non_repeating)
+        value = int(integer_part) + fractions.Fraction(int(non_repeating or 0), shift)
+        if repeating:
+            value += fractions.Fraction(int(repeating), shift * (10 ** len(repeating) - 1))
+            # the block cannot be shorter, and cannot start any sooner
+            assert not any(repeating == repeating[:length] * (len(repeating) // length)
+                           for length in range(1, len(repeating)) if len(repeating) % length == 0)
+            assert not non_repeating or non_repeating[-1] != repeating[-1]
+        assert value == fractions.Fraction(numerator, denominator)
+
+def test_decimal_expansion_errors():
+    with pytest.raises(ZeroDivisionError):
+        arithmetic.decimal_expansion(1, 0)
+    with pytest.raises(ValueError):
+        arithmetic.repeating_decimal(-1, 3)
+    with pytest.raises(ValueError):
+        arithmetic.decimal_expansion(1, -3)
+
+@pytest.mark.parametrize('numerator, denominator', [(10, 3), (1, 7), (125, 1000), (0, 7), (960, 4), (22, 7), (12345, 99)],
+                         ids=str)
+def test_long_division_outputs_agree(numerator, denominator):
+    steps = 25
+    strings = list(itertools.islice(arithmetic.long_division(numerator, denominator, output='string'), steps))
+    digits = list(itertools.islice(arithmetic.long_division(numerator, denominator, output='digit'), steps))
+    decimals = list(itertools.islice(arithmetic.long_division(numerator, denominator, output='decimal'), steps))
+    floats = list(itertools.islice(arithmetic.long_division(numerator, denominator), steps))
+    # the digits written above the dividend, then the ones after the decimal point
+    places = len(str(numerator))
+    integer_part, non_repeating, repeating = arithmetic.decimal_expansion(numerator, denominator)
+    expected = integer_part.zfill(places) + non_repeating + (repeating or '0') * steps
+    assert digits == [int(digit) for digit in expected[:steps]]
+    for step, string in enumerate(strings, start=1):
+        prefix = expected[:min(step, places)].lstrip('0') or '0'
+        if step > places:
+            prefix += '.' + expected[places:step]
+        assert string == prefix
+        # the same digits, trailing zeros included
+        assert decimals[step - 1].as_tuple() == decimal.Decimal(prefix).as_tuple()
+        assert floats[step - 1] == float(prefix)
+
+def test_long_division_examples():
+    assert list(itertools.islice(arithmetic.long_division(10, 3, output='digit'), 4)) == [0, 3, 3, 3]
+    assert list(itertools.islice(arithmetic.long_division(10, 3, output='string'), 4)) == ['0', '3', '3.3', '3.33']
+    assert list(itertools.islice(arithmetic.long_division(0, 7, output='string'), 3)) == ['0', '0.0', '0.00']
+    assert list(itertools.islice(arithmetic.long_division(1, 8, output='decimal'), 4))[-1] == decimal.Decimal('0.125')
+    # a float holds about 17 digits, so after that the same float comes back
+    floats = list(itertools.islice(arithmetic.long_division(1, 3), 40))
+    assert floats[-1] == floats[-2] == 1 / 3
+
+def test_long_division_errors():
+    with pytest.raises(ValueError):
+        arithmetic.long_division(1, 3, output='fraction')
+    # the other errors come with the first digit
+    with pytest.raises(ZeroDivisionError):
+        next(arithmetic.long_division(1, 0))
+    with pytest.raises(ValueError):
+        next(arithmetic.long_division(-1, 3, output='digit'))
+
+@pytest.mark.parametrize('definition, inputs', [
+    (arithmetic.division, (1.0, 0.1)), (arithmetic.division, (0.5, 0.1)), (arithmetic.division, (10**4, 3)),
+    (arithmetic.add_recursive, (100 / 7, 3000)), (arithmetic.add_integers, (100 / 7, 3000)),
+    (arithmetic.subtract_integers, (0.1, -2000)), (arithmetic.multiply_integers, (0.1, 300)),
+    (arithmetic.multiply_integers, (7, -300)), (arithmetic.multiply_recursive, (7, 300))], ids=str)
+def test_folding_does_not_change_results(definition, inputs):
+    assert arithmetic.run_recursive(definition, *inputs, fold=True) == arithmetic.run_recursive(definition, *inputs)
+
+def test_folded_division_matches_division():
+    assert arithmetic.run_recursive(arithmetic.division, 1.0, 0.1, fold=True) == arithmetic.division(1.0, 0.1) == 10
+
+@pytest.mark.parametrize('cutoffs', [(arithmetic.KARATSUBA_CUTOFF, arithmetic.TOOM3_CUTOFF), (2, float('inf')), (2, 3),
+                                     (float('inf'), float('inf'))], ids=str)
+def test_limb_multiplication_matches_python(cutoffs):
+    generator = random.Random(0)
+    for digits_x, digits_y in [(1, 1), (30, 30), (400, 400), (401, 1500), (1500, 7), (2000, 1999)]:
+        x, y = generator.randrange(10 ** digits_x), generator.randrange(10 ** digits_y)
+        limbs = arithmetic._multiply_limbs(arithmetic._to_limbs(x), arithmetic._to_limbs(y), *cutoffs)
+        assert arithmetic._from_limbs(limbs) == x * y
+
+def test_long_integer_multiplication():
+    assert arithmetic.long_integer_multiplication(123, 45, show_partial_products=True) == (5535, [615, 4920])
+    assert arithmetic.long_integer_multiplication(-3 ** 2000, 7 ** 900) == -3 ** 2000 * 7 ** 900
+    assert arithmetic.long_integer_multiplication(0, 10 ** 500) == 0
+
+def test_long_decimal_multiplication():
+    assert arithmetic.long_decimal_multiplication('0.1', '0.3') == '0.03'
+    assert arithmetic.long_decimal_multiplication('-1.25', '0.40') == '-0.5000'
+    assert ''.join(arithmetic.long_decimal_multiplication('2.5', 4, stream=True)) == '10.0'
@@ -0,0 +1,83 @@
+'''tests for arithmetic_arrays.py. Every function has to give, for each pair, what the function of the
+   same name in arithmetic_algorithms.py gives, whether the batch fits into int64s or not.'''
+
+import itertools
+
+import numpy as np
+import pytest
+
+import arithmetic_algorithms as arithmetic
+import arithmetic_arrays as arrays
+
+SMALL = [-7, -2, -1, 0, 1, 2, 3, 5, 12]
+
+# the loops in arithmetic_algorithms.py would take forever on these, so they are checked with the fast engine
+LARGE = [arrays.INT64_MAX, arrays.INT64_MAX - 1, 2 ** 40, 3 ** 30, 7]
+
+FUNCTIONS = ['add', 'multiply', 'multiplication']
+
+def pairs(numbers):
+    return [list(column) for column in zip(*itertools.product(numbers, repeat=2))]
+
+def expected(name, first, second, engine='pedagogical'):
+    return [getattr(arithmetic, name)(a, b, engine=engine) for a, b in zip(first, second)]
+
+@pytest.mark.parametrize('name', FUNCTIONS)
+def test_small_numbers_match_the_loops(name):
+    first, second = pairs(SMALL)
+    result = getattr(arrays, name)(np.array(first), np.array(second))
+    assert result.dtype == np.int64
+    assert result.tolist() == expected(name, first, second)
+
+@pytest.mark.parametrize('name', FUNCTIONS)
+def test_large_numbers_switch_to_python_ints(name):
+    first, second = pairs(LARGE)
+    result = getattr(arrays, name)(np.array(first), np.array(second))
+    # some of these answers do not fit into an int64, so the whole batch is done with Python ints
+    assert result.dtype == object
+    assert result.tolist() == expected(name, first, second, engine='fast')
+
+def test_the_switch_happens_just_past_int64():
+    assert arrays.add([arrays.INT64_MAX - 1], [1]).dtype == np.int64
+    result = arrays.add([arrays.INT64_MAX], [1])
+    assert result.dtype == object and result.tolist() == [2 ** 63]
+    assert arrays.multiplication([2 ** 30], [2 ** 31]).dtype == np.int64
+    assert arrays.multiplication([2 ** 32], [2 ** 31]).tolist() == [2 ** 63]
+    assert arrays.add_integers([arrays.INT64_MIN], [-1]).tolist() == [-2 ** 63 - 1]
+    assert arrays.subtract_integers([arrays.INT64_MIN], [1]).tolist() == [-2 ** 63 - 1]
+
+def test_operands_that_do_not_fit_any_numpy_integer():
+    result = arrays.add(np.array([2 ** 64, 1], dtype=object), [1, 2 ** 70])
+    assert result.tolist() == [2 ** 64 + 1, 1 + 2 ** 70]
+    assert arrays.multiply(np.array([2 ** 63 + 1], dtype=np.uint64), [2]).tolist() == [2 ** 64 + 2]
+
+def test_division_matches_the_loops():
+    first, second = pairs(SMALL)
+    for a, b in zip(first, second):
+        try:
+            # the loop never ends for a negative divisor, where the fast engine raises ValueError
+            answer = arithmetic.quotient_and_remainder(a, b, engine='fast')
+        except (ZeroDivisionError, ValueError) as error:
+            with pytest.raises(type(error)):
+                arrays.quotient_and_remainder([a], [b])
+        else:
+            quotients, remainders = arrays.quotient_and_remainder([a], [b])
+            assert (quotients.tolist()[0], remainders.tolist()[0]) == answer
+    assert arrays.quotient([arrays.INT64_MIN, 17], [-1, 5]).tolist() == [0, 3]
+    assert arrays.remainder([2 ** 70], [3]).tolist() == [arithmetic.remainder(2 ** 70, 3, engine='fast')]
+
+@pytest.mark.parametrize('name', ['add_integers', 'subtract_integers', 'multiply_integers'])
+def test_integer_functions_match_the_recursive_ones(name):
+    first, second = pairs(SMALL)
+    result = getattr(arrays, name)(first, second)
+    assert result.tolist() == [getattr(arithmetic, name)(a, b) for a, b in zip(first, second)]
+    first, second = pairs(LARGE + [-arrays.INT64_MAX])
+    operator = {'add_integers': int.__add__, 'subtract_integers': int.__sub__, 'multiply_integers': int.__mul__}[name]
+    assert getattr(arrays, name)(first, second).tolist() == [operator(a, b) for a, b in zip(first, second)]
+
+@pytest.mark.parametrize('operand', [np.array([2.5, 1.0]), np.array([2.5, 2 ** 70], dtype=object),
+                                     np.array([2, '3'], dtype=object), np.array([1 + 2j])], ids=str)
+def test_numbers_that_are_not_integers_are_refused(operand):
+    # int() would cut 2.5 down to 2 on the way to Python ints
+    with pytest.raises(TypeError):
+        arrays.add(operand, np.ones(operand.shape, dtype=np.int64))
@@ -0,0 +1,107 @@
+'''tests for calculus/limits.py'''
+
+import os
+import stat
+import threading
+
+import pytest
+import sympy as sym
+
+from calculus import limits
+
+inp = sym.Symbol('input')
+x = sym.Symbol('x')
+
+@pytest.fixture
+def cache(tmp_path):
+    limits.forget()
+    yield str(tmp_path / 'royal_road' / 'limits.sqlite3')
+    limits.forget()
+
+@pytest.mark.parametrize('expression', [
+    sym.oo, -sym.oo, sym.zoo, sym.nan, sym.E, sym.pi, sym.I, sym.EulerGamma, sym.true,
+    sym.Integer(-5), sym.Rational(1, 2), sym.Float(2.5), sym.Float('-1e-30'),
+    sym.AccumBounds(-1, 1), sym.sqrt(2) * sym.pi, sym.sin(inp) / inp + inp ** sym.Rational(-3, 2),
+    sym.Limit(sym.Function('f')(inp) / inp, inp, sym.oo, '-'),
+])
+def test_srepr_text_is_read_back(expression):
+    result = limits.from_srepr(sym.srepr(expression))
+    assert result is sym.nan if expression is sym.nan else result == expression
+
+@pytest.mark.parametrize('text', [
+    "__import__('os').system('true')",
+    "Add('__import__(\"os\")')",
+    "Function('f')('1 + 1')",
+    "Symbol('x').__class__",
+    "Integer(1) + Integer(2)",
+    "sympify('1')",
+    "Symbol(**{'name': 'x'})",
+    "lambda: 1",
+    "Add(Symbol('x'), dir=1)",
+    "Integer(",
+])
+def test_anything_else_is_refused(text):
+    with pytest.raises(ValueError):
+        limits.from_srepr(text)
+
+def test_limits_match_sympy(cache):
+    assert limits.limit(1 / inp, inp, cache=cache) == 0
+    assert limits.limit(sym.sin(inp) / inp, inp, 0, cache=cache) == 1
+    assert limits.limit((1 + 1 / inp) ** inp, inp, cache=cache) == sym.E
+    assert limits.limit(1 / inp, inp, 0, '-', cache=cache) == -sym.oo
+    with pytest.raises(ValueError):
+        limits.limit(1 / inp, inp, direction='up', cache=cache)
+
+def test_answers_survive_a_restart(cache):
+    limits.limit(sym.sin(inp) / inp, inp, 0, cache=cache)
+    assert limits.cache_size(cache) == 2
+    limits.forget()
+    assert limits.limit(sym.sin(inp) / inp, inp, 0, cache=cache) == 1
+    assert limits.cache_size(cache) == 2
+
+def test_the_same_limit_written_differently_is_found(cache):
+    assert limits.canonical_form(1 + 1 / inp, inp) == limits.canonical_form((x + 1) / x, x)
+    limits.limit(1 + 1 / inp, inp, cache=cache)
+    limits.limit((x + 1) / x, x, cache=cache)
+    # the second one only adds its exact form
+    assert limits.cache_size(cache) == 3
+
+def test_planted_answers_are_not_run(cache, tmp_path):
+    limits.limit(1 / inp, inp, cache=cache)
+    marker = tmp_path / 'ran'
+    limits._connection(cache).execute('UPDATE limits SET answer = ?', (f"__import__('pathlib').Path({str(marker)!r}).touch()",))
+    limits.forget()
+    with pytest.raises(ValueError):
+        limits.limit(1 / inp, inp, cache=cache)
+    assert not marker.exists()
+
+def test_the_cache_is_private(cache):
+    limits.limit(1 / inp, inp, cache=cache)
+    assert stat.S_IMODE(os.stat(os.path.dirname(cache)).st_mode) & 0o077 == 0
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='needs POSIX permissions')
+def test_directory_others_can_write_to_is_refused(tmp_path):
+    directory = tmp_path / 'shared'
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        limits.limit(1 / inp, inp, cache=str(directory / 'limits.sqlite3'))
+
+def test_threads_share_the_memory(cache, monkeypatch):
+    monkeypatch.setattr(limits, 'LIMITS_IN_MEMORY', 3)
+    expressions = [1 / inp, sym.sin(inp) / inp, 1 + 1 / inp, inp / (inp + 1), (inp + 2) / inp]
+    answers, errors = [], []
+
+    def ask():
+        try:
+            for _ in range(5):
+                answers.extend(limits.limit(expression, inp, cache=None) for expression in expressions)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=ask) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors and len(answers) == 100 and len(limits._memo) <= 3
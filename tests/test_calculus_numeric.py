@@ -0,0 +1,47 @@
+'''tests for calculus/numeric.py'''
+
+import numpy as np
+import pytest
+
+from calculus.numeric import derivative, integrate
+
+def test_derivatives():
+    assert derivative(np.sin, 0.0).value == pytest.approx(1.0, abs=1e-10)
+    assert derivative(np.exp, 1.0, order=2).value == pytest.approx(np.e, rel=1e-7)
+    points = np.linspace(-2, 2, 9)
+    assert derivative(lambda x: x ** 3, points).value == pytest.approx(3 * points ** 2, abs=1e-8)
+    with pytest.raises(ValueError):
+        derivative(np.sin, 0.0, order=3)
+    with pytest.raises(ValueError):
+        derivative(np.sin, 0.0, step=0)
+
+def test_integrals():
+    estimate = integrate(np.exp, 0.0, 1.0)
+    assert estimate.value == pytest.approx(np.e - 1, abs=1e-10)
+    assert estimate.error < 1e-10
+    values = integrate(lambda x: x ** 2, 0.0, np.array([1.0, 2.0, 3.0])).value
+    assert values == pytest.approx([1 / 3, 8 / 3, 9], abs=1e-10)
+
+def test_constant_functions():
+    # a function that gives back one number instead of an array
+    assert integrate(lambda x: 1.0, 0, 2).value == pytest.approx(2.0)
+    assert integrate(lambda x: 3, np.zeros(2), np.array([1.0, 2.0])).value == pytest.approx([3.0, 6.0])
+    assert derivative(lambda x: 1.0, 1.0).value == pytest.approx(0.0)
+    assert derivative(lambda x: 1.0, np.array([1.0, 2.0]), order=2).value == pytest.approx([0.0, 0.0])
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_functions_that_are_not_defined_give_nan():
+    # np.sqrt is nan below 0: the pieces there must not be split forever
+    estimate = integrate(np.sqrt, -1.0, 1.0)
+    assert np.isnan(estimate.value)
+    assert estimate.evaluations < 100
+    values = integrate(np.sqrt, np.array([0.0, -1.0]), 1.0).value
+    assert values[0] == pytest.approx(2 / 3, abs=1e-8)
+    assert np.isnan(values[1])
+
+def test_pieces_are_capped():
+    # sin(1 / x) wiggles faster and faster towards 0, so it would keep splitting
+    estimate = integrate(lambda x: np.sin(1 / x), 1e-6, 1.0, pieces=256)
+    # every round evaluates the two new points of at most 256 pieces
+    assert estimate.evaluations <= 3 + 2 * 256 * 51
+    assert estimate.value == pytest.approx(0.504067, abs=1e-3)
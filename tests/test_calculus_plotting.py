@@ -0,0 +1,58 @@
+'''tests for calculus/plotting.py'''
+
+import numpy as np
+import pytest
+import sympy as sym
+
+from calculus import plotting
+from calculus.plotting import compile_expression, sample
+
+inp = sym.Symbol('input')
+
+def test_compiled_expressions_work_on_arrays():
+    reciprocal = compile_expression(1 / inp, inp)
+    assert reciprocal(np.array([1.0, 2.0, 4.0])) == pytest.approx([1.0, 0.5, 0.25])
+    assert reciprocal.expression == 1 / inp and reciprocal.variable == inp
+    assert compile_expression(sym.Integer(2), inp)(np.zeros(3)) == pytest.approx([2, 2, 2])
+
+def test_compiled_expressions_are_kept(monkeypatch):
+    monkeypatch.setattr(plotting, '_compiled', {})
+    monkeypatch.setattr(plotting, 'COMPILED_IN_MEMORY', 2)
+    first = compile_expression(inp + 1, inp)
+    assert compile_expression(inp + 1, inp) is first
+    compile_expression(inp + 2, inp)
+    compile_expression(inp + 1, inp)
+    # inp + 2 is now the one used longest ago
+    compile_expression(inp + 3, inp)
+    assert list(plotting._compiled) == [(inp + 1, inp), (inp + 3, inp)]
+
+def test_two_points_per_column():
+    xs, ys = sample(inp ** 2, inp, -1, 1, width=4, oversampling=4)
+    assert xs.shape == ys.shape == (8,)
+    assert np.all(np.diff(xs) > 0)
+    assert ys == pytest.approx(xs ** 2)
+    assert ys.max() == pytest.approx(1.0)
+
+def test_gaps_where_the_expression_is_not_defined():
+    xs, ys = sample(sym.sqrt(inp), inp, -1, 1, width=4, oversampling=4)
+    # the two columns below 0 have no values at all
+    assert np.isnan(ys[:4]).all()
+    assert ys[4:] == pytest.approx(np.sqrt(xs[4:]))
+
+def test_spikes_are_kept():
+    xs, ys = sample(1 / inp, inp, -1, 1, width=2, oversampling=3)
+    # 1/input at -1, -0.6, -0.2 | 0.2, 0.6, 1: the lowest and highest of each column, left to right
+    assert xs == pytest.approx([-1, -0.2, 0.2, 1])
+    assert ys == pytest.approx([-1, -5, 5, 1])
+
+def test_infinities_become_nan():
+    xs, ys = sample(1 / inp, inp, -1, 1, width=1, oversampling=3)
+    # 0 is one of the points, where 1/input is infinite
+    assert xs == pytest.approx([-1, 1])
+    assert np.isfinite(ys).all()
+
+def test_bad_sizes():
+    with pytest.raises(ValueError):
+        sample(inp, inp, 0, 1, width=0)
+    with pytest.raises(ValueError):
+        sample(inp, inp, 0, 1, width=10, oversampling=0)
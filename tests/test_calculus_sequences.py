@@ -0,0 +1,60 @@
+'''tests for calculus/sequences.py'''
+
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from calculus.infinite_sequences import reciprocal
+from calculus.sequences import Sequence, aitken, iterated_aitken, richardson, shanks
+
+def test_terms_and_blocks():
+    reciprocals = Sequence(reciprocal)
+    assert reciprocals(4) == 0.25
+    assert list(itertools.islice(reciprocals, 3)) == [1.0, 0.5, 1 / 3]
+    assert np.allclose(Sequence(lambda n: 1 / n, vectorized=True)[1:5], [1, 0.5, 1 / 3, 0.25])
+    # the one-at-a-time and the vectorized blocks agree
+    assert np.array_equal(reciprocals[1:100], Sequence(lambda n: 1 / n, vectorized=True)[1:100])
+    assert [len(block) for block in itertools.islice(reciprocals.blocks(10), 3)] == [10, 10, 10]
+    with pytest.raises(ValueError):
+        reciprocals(0)
+
+def test_partial_sums():
+    sums = Sequence(lambda n: 1 / n ** 2, vectorized=True).partial_sums()
+    assert sums(3) == pytest.approx(1 + 1 / 4 + 1 / 9)
+    assert np.allclose(sums[1:4], [1, 1.25, 1 + 1 / 4 + 1 / 9])
+
+def test_acceleration_examples():
+    assert richardson([1, 2, 4, 8], [2, 1.5, 1.25, 1.125]) == (1.0, 0.0)
+    assert aitken(np.array([1, 0.5, 0.25, 0.125])).tolist() == [0, 0]
+    value, error = iterated_aitken([2 - 0.5 ** n for n in range(10)])
+    assert value == pytest.approx(2) and error < 1e-9
+    # the partial sums of 1 - 1/2 + 1/3 - ... approach log(2) slowly, Shanks speeds them up
+    partial_sums = np.cumsum([(-1) ** (n + 1) / n for n in range(1, 30)])
+    value, error = shanks(partial_sums)
+    assert abs(value - math.log(2)) < 1e-10
+
+@pytest.mark.parametrize('term, expected', [
+    (lambda n: (1 + 1 / n) ** n, math.e),
+    (lambda n: 1 + 1 / n, 1.0),
+    (lambda n: n * np.sin(1 / n), 1.0),
+])
+def test_limit(term, expected):
+    limit = Sequence(term, vectorized=True).limit()
+    assert abs(limit.value - expected) < 1e-8
+    # the error estimate is honest
+    assert abs(limit.value - expected) <= max(limit.error, 1e-12) * 10
+
+def test_limit_of_alternating_series():
+    limit = Sequence(lambda n: (-1) ** (n + 1) / n, vectorized=True).partial_sums().limit()
+    assert abs(limit.value - math.log(2)) < 1e-10
+
+def test_epsilon_n():
+    assert Sequence(reciprocal).epsilon_n(0.001, 0) == 1001
+    assert Sequence(lambda n: n ** -2).epsilon_n(1e-4, 0) == 101
+    assert Sequence(lambda n: 2.0 ** -n).epsilon_n(0.3, 0) == 2
+    with pytest.raises(ValueError):
+        Sequence(lambda n: n).epsilon_n(0.1, 0, last=2 ** 10)
+    with pytest.raises(ValueError):
+        Sequence(reciprocal).epsilon_n(0, 0)
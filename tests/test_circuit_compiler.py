@@ -0,0 +1,94 @@
+'''tests for circuit_compiler.py: compiled netlists have to agree with Circuit.simulate'''
+
+import random
+
+import numpy as np
+import pytest
+
+import circuits
+from circuit_compiler import compile_circuit, generate_source, topological_order
+
+def half_adder():
+    circuit = circuits.Circuit()
+    a, b = circuit.add_input('a'), circuit.add_input('b')
+    circuit.output_bus('s', [circuit.add_gate('XOR', a, b), circuit.add_gate('AND', a, b)])
+    return circuit
+
+def random_inputs(circuit, count, seed=0):
+    generator = random.Random(seed)
+    return [{wire: generator.randint(0, 1) for wire in circuit.inputs} for _ in range(count)]
+
+CIRCUITS = {
+    'half adder': half_adder,
+    'ripple adder': lambda: circuits.adder_circuit(5),
+    'lookahead adder': lambda: circuits.adder_circuit(6, 'lookahead'),
+    'multiplier': lambda: circuits.multiplier_circuit(3),
+}
+
+@pytest.mark.parametrize('table_inputs', [0, 4, 8])
+@pytest.mark.parametrize('mode', ['bitwise', 'table'])
+@pytest.mark.parametrize('build', CIRCUITS.values(), ids=CIRCUITS)
+def test_compiled_matches_simulate(build, mode, table_inputs):
+    circuit = build()
+    function = compile_circuit(circuit, mode, table_inputs)
+    for bits in random_inputs(circuit, 100):
+        outputs = function(*[bits[wire] for wire in circuit.inputs])
+        assert dict(zip(circuit.outputs, map(int, outputs))) == circuit.simulate(bits)
+
+def test_bitwise_on_words_matches_evaluate():
+    circuit = circuits.multiplier_circuit(4)
+    generator = np.random.default_rng(0)
+    words = {wire: generator.integers(0, 2 ** 63, 10, dtype=np.uint64) for wire in circuit.inputs}
+    compiled = compile_circuit(circuit)(*[words[wire] for wire in circuit.inputs])
+    expected = circuit.evaluate(words)
+    for wire, word in zip(circuit.outputs, compiled):
+        assert (word == expected[wire]).all()
+
+def test_source_of_a_half_adder():
+    assert generate_source(half_adder()) == ('def circuit(a, b, ones=ALL_ONES):\n'
+                                             '    w0 = a ^ b\n'
+                                             '    w1 = a & b\n'
+                                             '    return (w0, w1)\n')
+
+def test_compiling_again_reuses_the_function():
+    assert compile_circuit(circuits.adder_circuit(3)) is compile_circuit(circuits.adder_circuit(3))
+    assert compile_circuit(circuits.adder_circuit(3)) is not compile_circuit(circuits.adder_circuit(3), 'table')
+
+def test_gates_out_of_order_odd_names_and_constants():
+    circuit = circuits.Circuit()
+    a, b = circuit.add_input('class'), circuit.add_input('in put')
+    circuit.gates.append(circuits.Gate('late', 'NOT', ('early',)))
+    circuit.gates.append(circuits.Gate('early', 'NAND', (a, b)))
+    circuit.add_output('late')
+    circuit.add_output(a)
+    circuit.add_output(circuits.ONE)
+    assert [gate.output for gate in topological_order(circuit)] == ['early', 'late']
+    # bitwise functions work on words, so single bits need ones=1
+    for mode, options in [('bitwise', {'ones': 1}), ('table', {})]:
+        function = compile_circuit(circuit, mode)
+        for bits in random_inputs(circuit, 8):
+            outputs = function(*[bits[wire] for wire in circuit.inputs], **options)
+            assert dict(zip(circuit.outputs, map(int, outputs))) == {'late': bits[a] & bits[b], a: bits[a], circuits.ONE: 1}
+
+def test_made_up_names_do_not_clash_with_wires():
+    circuit = circuits.Circuit()
+    wire3, spaced, ones = circuit.add_input('_wire3'), circuit.add_input('x y'), circuit.add_input('ones')
+    circuit.add_output(circuit.add_gate('XOR', circuit.add_gate('AND', wire3, spaced), ones))
+    for mode, options in [('bitwise', {'ones': 1}), ('table', {})]:
+        function = compile_circuit(circuit, mode)
+        for bits in random_inputs(circuit, 8):
+            (output,) = function(*[bits[wire] for wire in circuit.inputs], **options)
+            assert int(output) == bits[wire3] & bits[spaced] ^ bits[ones]
+
+def test_bad_netlists():
+    loop = circuits.Circuit()
+    x = loop.add_input('x')
+    loop.gates += [circuits.Gate('p', 'AND', (x, 'q')), circuits.Gate('q', 'AND', (x, 'p'))]
+    with pytest.raises(ValueError):
+        compile_circuit(loop)
+    dangling = circuits.Circuit()
+    dangling.gates.append(circuits.Gate('p', 'NOT', ('nowhere',)))
+    with pytest.raises(ValueError):
+        compile_circuit(dangling)
+    with pytest.raises(ValueError):
+        compile_circuit(half_adder(), 'fastest')
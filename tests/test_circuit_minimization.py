@@ -0,0 +1,103 @@
+'''tests for circuit_minimization.py'''
+
+import random
+
+import pytest
+
+import circuit_minimization as minimization
+import circuits
+from circuit_compiler import truth_table
+
+def covered(cover, n):
+    '''the truth table of a cover'''
+    return sum(1 << i for i in range(2 ** n)
+               if any(i & cube.mask == cube.value & cube.mask for cube in cover))
+
+@pytest.mark.parametrize('method', ['quine-mccluskey', 'espresso'])
+def test_covers_compute_the_function(method):
+    generator = random.Random(0)
+    for n in range(1, 6):
+        for _ in range(20):
+            on, dont_cares = generator.getrandbits(2 ** n), generator.getrandbits(2 ** n)
+            on &= ~dont_cares
+            table = covered(minimization.minimize_cover(on, n, dont_cares, method), n)
+            # every 1 is covered, and nothing outside the 1s and the don't-cares
+            assert table & on == on and table & ~(on | dont_cares) == 0
+
+def test_quine_mccluskey_is_minimal_on_a_textbook_function():
+    # f(a, b, c, d) = sum of minterms 4, 8, 10, 11, 12, 15 with don't-cares 9, 14: three products
+    on = sum(1 << i for i in (4, 8, 10, 11, 12, 15))
+    dont_cares = sum(1 << i for i in (9, 14))
+    assert len(minimization.quine_mccluskey(on, 4, dont_cares)) == 3
+
+def test_minimize_truth_table():
+    inputs = ['x', 'y', 'z']
+    circuit = minimization.minimize_truth_table(0b10010110, inputs)
+    assert truth_table(circuit, circuit.outputs[0], inputs) == 0b10010110
+
+def nand_xor(circuit, a, b):
+    both = circuit.add_gate('NAND', a, b)
+    return circuit.add_gate('NAND', circuit.add_gate('NAND', a, both), circuit.add_gate('NAND', b, both))
+
+def test_minimize_keeps_the_function_and_shrinks_hand_built_gates():
+    circuit = circuits.Circuit()
+    bits = circuit.input_bus('x', 6)
+    parity = bits[0]
+    for bit in bits[1:]:
+        parity = nand_xor(circuit, parity, bit)
+    circuit.output_bus('p', [parity])
+    minimized = minimization.minimize(circuit)
+    assert len(minimized) < len(circuit)
+    assert minimization.equivalent(circuit, minimized) == (None, True)
+
+@pytest.mark.parametrize('kind', circuits.ADDERS)
+def test_minimized_adders_are_certainly_equivalent(kind):
+    circuit = circuits.adder_circuit(6, kind)
+    minimized = minimization.minimize(circuit)
+    assert len(minimized) <= len(circuit)
+    assert minimization.equivalent(circuit, minimized) == (None, True)
+
+def broken_adder(width):
+    circuit = circuits.adder_circuit(width)
+    # the last carry is computed with an OR instead of an AND
+    position = max(i for i, gate in enumerate(circuit.gates) if gate.kind == 'AND')
+    circuit.gates[position] = circuit.gates[position]._replace(kind='OR')
+    return circuit
+
+def test_equivalent_finds_a_difference():
+    circuit, broken = circuits.adder_circuit(4), broken_adder(4)
+    counterexample, certain = minimization.equivalent(circuit, broken)
+    assert certain and circuit.simulate(counterexample) != broken.simulate(counterexample)
+
+def test_outputs_with_too_many_inputs_are_tried_on_random_inputs(monkeypatch):
+    # as if the adder were wider than equivalent can try exhaustively
+    monkeypatch.setattr(minimization, 'EQUIVALENCE_INPUTS', 6)
+    circuit = circuits.adder_circuit(6)
+    assert minimization.equivalent(circuit, minimization.minimize(circuit, check=False)) == (None, False)
+    # a difference found on random inputs is still certain
+    counterexample, certain = minimization.equivalent(circuit, broken_adder(6))
+    assert certain and circuit.simulate(counterexample) != broken_adder(6).simulate(counterexample)
+
+def test_minimize_warns_when_it_cannot_try_every_input(monkeypatch):
+    monkeypatch.setattr(minimization, 'EQUIVALENCE_INPUTS', 6)
+    with pytest.warns(RuntimeWarning):
+        minimization.minimize(circuits.adder_circuit(6))
+
+def test_minimize_refuses_a_circuit_that_computes_something_else(monkeypatch):
+    monkeypatch.setattr(minimization, '_minimize', lambda circuit, method: broken_adder(4))
+    with pytest.raises(ValueError):
+        minimization.minimize(circuits.adder_circuit(4))
+    assert len(minimization.minimize(circuits.adder_circuit(4), check=False)) == len(broken_adder(4))
+
+def test_minimization_report(monkeypatch):
+    monkeypatch.setattr(minimization, 'EQUIVALENCE_INPUTS', 8)
+    with pytest.warns(RuntimeWarning):
+        minimized, report = minimization.minimization_report(circuits.adder_circuit(6, 'lookahead'), words=4)
+    assert report.gates_before == len(circuits.adder_circuit(6, 'lookahead')) and report.gates_after == len(minimized)
+    assert report.counterexample is None and not report.certain
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        minimization.minimize_cover(1, 1, method='guess')
+    with pytest.raises(ValueError):
+        minimization.equivalent(circuits.adder_circuit(2), circuits.adder_circuit(3))
@@ -0,0 +1,68 @@
+'''tests for circuit_timing.py: the numbers in its docstring, and the simulator settling on the values
+   Circuit.simulate gives'''
+
+import random
+
+import pytest
+
+import circuits
+from circuit_timing import TimingSimulator, critical_path, gate_delay
+
+def test_critical_paths_of_adders():
+    assert critical_path(circuits.adder_circuit(16, 'ripple'))[0] == 32
+    assert critical_path(circuits.adder_circuit(16, 'lookahead'))[0] == 14
+
+def test_critical_path_runs_from_an_input_to_an_output():
+    circuit = circuits.adder_circuit(8)
+    latency, path = critical_path(circuit)
+    assert path[0] in circuit.inputs and path[-1] in circuit.outputs
+    drivers = {gate.output: gate for gate in circuit.gates}
+    assert sum(gate_delay(drivers[wire]) for wire in path[1:]) == latency
+
+def test_delays_by_kind_and_by_wire():
+    circuit = circuits.adder_circuit(4)
+    assert critical_path(circuit, {'XOR': 1})[0] < critical_path(circuit)[0]
+    first_gate = circuit.gates[0]
+    assert gate_delay(first_gate, {first_gate.output: 10, first_gate.kind: 5}) == 10
+
+def test_docstring_example():
+    simulator = TimingSimulator(circuits.adder_circuit(4))
+    assert simulator.apply({'a0': 1, 'a1': 1, 'a2': 1, 'a3': 1}) == 4
+    assert simulator.apply({'b0': 1}) == 7
+    assert simulator.waveform() == ('s0 __----______\n'
+                                    's1 ____---_____\n'
+                                    's2 ____-----___\n'
+                                    's3 ____-------_\n'
+                                    's4 ___________-')
+
+@pytest.mark.parametrize('inertial', [True, False])
+@pytest.mark.parametrize('build', [lambda: circuits.adder_circuit(6, 'lookahead'), lambda: circuits.multiplier_circuit(3)])
+def test_settles_on_the_simulated_values(build, inertial):
+    circuit = build()
+    simulator = TimingSimulator(circuit, inertial=inertial)
+    generator = random.Random(0)
+    bits = {wire: 0 for wire in circuit.inputs}
+    for _ in range(50):
+        changes = {wire: generator.randint(0, 1) for wire in generator.sample(circuit.inputs, 3)}
+        bits.update(changes)
+        assert simulator.apply(changes) <= critical_path(circuit)[0]
+        assert {wire: simulator.value(wire) for wire in circuit.outputs} == circuit.simulate(bits)
+
+def test_inertial_delays_swallow_short_pulses():
+    # a XOR a delayed copy of a pulses for 1 unit when a changes, shorter than the XOR's delay of 5
+    circuit = circuits.Circuit()
+    a = circuit.add_input('a')
+    delayed = circuit.add_gate('AND', a, circuits.ONE)
+    circuit.add_output(circuit.add_gate('XOR', a, delayed))
+    delays = {delayed: 1, 'XOR': 5}
+    inertial = TimingSimulator(circuit, delays)
+    transport = TimingSimulator(circuit, delays, inertial=False)
+    # only the copy changes, at 1
+    assert inertial.apply({'a': 1}) == 1
+    assert inertial.trace == []
+    assert transport.apply({'a': 1}) == 6
+    assert [(time, value) for time, wire, value in transport.trace] == [(5, 1), (6, 0)]
+
+def test_unknown_input():
+    with pytest.raises(ValueError):
+        TimingSimulator(circuits.adder_circuit(2)).apply({'c0': 1})
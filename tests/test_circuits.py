@@ -0,0 +1,70 @@
+'''tests for circuits.py: the bit-sliced evaluation has to agree with simulating the circuit one input
+   at a time with the gates in logic_gates.py'''
+
+import random
+
+import numpy as np
+import pytest
+
+import circuits
+
+CIRCUITS = {
+    'ripple adder': lambda: circuits.adder_circuit(4),
+    'lookahead adder': lambda: circuits.adder_circuit(6, 'lookahead'),
+    'multiplier': lambda: circuits.multiplier_circuit(3),
+}
+
+@pytest.mark.parametrize('build', CIRCUITS.values(), ids=CIRCUITS)
+def test_evaluate_matches_simulate(build):
+    circuit = build()
+    generator = random.Random(0)
+    inputs = [{wire: generator.randint(0, 1) for wire in circuit.inputs} for _ in range(64)]
+    # lane i of every word holds input i
+    words = {wire: np.uint64(sum(bits[wire] << lane for lane, bits in enumerate(inputs))) for wire in circuit.inputs}
+    outputs = circuit.evaluate(words)
+    for lane, bits in enumerate(inputs):
+        expected = circuit.simulate(bits)
+        assert {wire: int(outputs[wire]) >> lane & 1 for wire in circuit.outputs} == expected
+
+def test_evaluate_on_python_ints():
+    circuit = circuits.adder_circuit(2)
+    ones = 2 ** 16 - 1
+    planes = circuits.exhaustive_planes(len(circuit.inputs), 0, 1)
+    words = {wire: int(plane[0]) & ones for wire, plane in zip(circuit.inputs, planes)}
+    outputs = circuit.evaluate(words, ones=ones)
+    for number in range(16):
+        bits = {wire: number >> j & 1 for j, wire in enumerate(circuit.inputs)}
+        assert {wire: outputs[wire] >> number & 1 for wire in circuit.outputs} == circuit.simulate(bits)
+
+def test_compute():
+    assert circuits.adder_circuit(4).compute(a=[5], b=[9])['s'].tolist() == [14]
+    assert circuits.multiplier_circuit(8).compute(a=[3, 200], b=[5, 100])['p'].tolist() == [15, 20000]
+    a, b = np.arange(1000) % 256, np.arange(1000) // 4
+    assert (circuits.adder_circuit(8, 'lookahead').compute(a=a, b=b)['s'] == a + b).all()
+
+def test_pack_and_unpack_bits():
+    numbers = np.random.default_rng(0).integers(0, 2 ** 20, 300, dtype=np.uint64)
+    assert (circuits.unpack_bits(circuits.pack_bits(numbers, 20), 300) == numbers).all()
+
+@pytest.mark.parametrize('kind', circuits.ADDERS)
+def test_verify_adders(kind):
+    assert circuits.verify(circuits.adder_circuit(8, kind), circuits.add_planes) is None
+
+def test_verify_multiplier():
+    assert circuits.verify(circuits.multiplier_circuit(5), circuits.multiply_planes) is None
+
+def test_verify_finds_a_broken_circuit():
+    circuit = circuits.adder_circuit(4)
+    # the carry out of bit 0 becomes an OR instead of an AND
+    position = next(i for i, gate in enumerate(circuit.gates) if gate.kind == 'AND')
+    circuit.gates[position] = circuit.gates[position]._replace(kind='OR')
+    counterexample = circuits.verify(circuit, circuits.add_planes)
+    assert counterexample is not None
+    assert circuit.compute(**{name: [value] for name, value in counterexample.items()})['s'][0] != sum(counterexample.values())
+
+def test_bad_gates():
+    circuit = circuits.Circuit()
+    with pytest.raises(ValueError):
+        circuit.add_gate('MAYBE', '0', '1')
+    with pytest.raises(TypeError):
+        circuit.add_gate('NOT', '0', '1')
@@ -0,0 +1,45 @@
+'''tests for continued_fractions.py, checked against Python's fractions module'''
+
+import fractions
+import random
+
+import numpy as np
+import pytest
+
+import continued_fractions as cf
+from fraction_algorithms import Fraction
+
+def exact(fraction):
+    return fractions.Fraction(fraction.numerator, fraction.denominator)
+
+def test_docstring_examples():
+    assert list(cf.continued_fraction(Fraction(43, 19))) == [2, 3, 1, 4]
+    assert [exact(convergent) for convergent in cf.convergents(Fraction(43, 19))] == [2, fractions.Fraction(7, 3),
+                                                                                      fractions.Fraction(9, 4), fractions.Fraction(43, 19)]
+    assert exact(cf.limit_denominator(Fraction(43, 19), 4)) == fractions.Fraction(9, 4)
+    assert exact(cf.best_rational_approximation(0.1, 10 ** 6)) == fractions.Fraction(1, 10)
+    assert exact(cf.from_float(0.1)) == fractions.Fraction(0.1)
+    assert cf.stern_brocot_path(Fraction(43, 19)) == [('R', 2), ('L', 3), ('R', 1), ('L', 3)]
+
+def test_limit_denominator_matches_fractions():
+    generator = random.Random(0)
+    for _ in range(2000):
+        x = generator.uniform(-1000, 1000) if generator.random() < 0.5 else generator.random()
+        max_denominator = generator.choice([1, 2, 7, 100, 10 ** 6, 10 ** 12])
+        assert exact(cf.limit_denominator(x, max_denominator)) == fractions.Fraction(x).limit_denominator(max_denominator)
+
+@pytest.mark.parametrize('max_denominator', [None, 1, 3, 1000, 10 ** 9, 2 ** 62], ids=str)
+def test_from_floats_matches_one_at_a_time(max_denominator):
+    generator = np.random.default_rng(0)
+    values = np.concatenate([generator.uniform(-10, 10, 500), generator.standard_normal(200) * 1e15,
+                             generator.standard_normal(200) * 1e-15, [0.0, 0.5, 0.1, 1 / 3, -2.0, 1e300, 5e-324]])
+    expected = [fractions.Fraction(float(value)) if max_denominator is None
+                else fractions.Fraction(float(value)).limit_denominator(max_denominator) for value in values]
+    assert [exact(fraction) for fraction in cf.from_floats(values, max_denominator)] == expected
+
+def test_from_floats_errors():
+    assert repr(cf.from_floats(np.array([0.5, 0.1, 1 / 3]), 1000)) == 'FractionArray([1/2, 1/10, 1/3])'
+    with pytest.raises(ValueError):
+        cf.from_floats([1.0, np.nan])
+    with pytest.raises(ValueError):
+        cf.from_floats([1.0], 0)
@@ -0,0 +1,48 @@
+'''tests for fact_tables.py'''
+
+import os
+import stat
+
+import pytest
+
+import fact_tables
+
+@pytest.fixture
+def table_directory(tmp_path, monkeypatch):
+    directory = tmp_path / 'fact_tables'
+    monkeypatch.setattr(fact_tables, 'TABLE_DIRECTORY', str(directory))
+    fact_tables.fact_table.cache_clear()
+    yield directory
+    fact_tables.fact_table.cache_clear()
+
+def test_facts_match_the_arithmetic(table_directory):
+    for a in range(0, 13):
+        for b in range(0, 13):
+            assert fact_tables.addition_fact(a, b, size=12) == a + b
+            assert fact_tables.multiplication_fact(a, b, size=12) == a * b
+            if b:
+                assert fact_tables.division_fact(a, b, size=12) == divmod(a, b)
+
+def test_numbers_outside_the_table_are_worked_out(table_directory):
+    assert fact_tables.multiplication_fact(7, 8) == 56
+    assert fact_tables.multiplication_fact(700, 8) == 5600
+    assert fact_tables.addition_fact(-3, 5) == 2
+    assert fact_tables.division_fact(17, 5) == (3, 2)
+    with pytest.raises(ZeroDivisionError):
+        fact_tables.division_fact(3, 0)
+
+def test_floats_are_worked_out(table_directory):
+    assert fact_tables.multiplication_fact(2.5, 4) == 10.0
+    assert fact_tables.addition_fact(3.0, 4) == 7.0
+    assert fact_tables.division_fact(7.5, 2) == (3.0, 1.5)
+
+def test_tables_are_private(table_directory):
+    fact_tables.fact_table('addition', 4)
+    assert stat.S_IMODE(os.stat(table_directory).st_mode) & 0o077 == 0
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='needs POSIX permissions')
+def test_directory_others_can_write_to_is_refused(table_directory):
+    table_directory.mkdir(mode=0o777)
+    os.chmod(table_directory, 0o777)
+    with pytest.raises(PermissionError):
+        fact_tables.fact_table('addition', 4)
@@ -0,0 +1,96 @@
+'''tests for fraction_algorithms.py, checked against Python's own fractions module'''
+
+import fractions
+import math
+import operator
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from fraction_algorithms import Fraction
+
+def exact(fraction):
+    return fractions.Fraction(fraction.numerator, fraction.denominator)
+
+def random_fractions(count, largest, seed=0):
+    generator = random.Random(seed)
+    return [Fraction(generator.randint(-largest, largest), generator.choice([-1, 1]) * generator.randint(1, largest))
+            for _ in range(count)]
+
+def test_sorting_matches_fractions():
+    values = random_fractions(2000, 10 ** 6, seed=3)
+    # fractions whose floats are equal, and fractions too big for a float
+    values += [Fraction(10 ** 20 + 1, 10 ** 20), Fraction(10 ** 20, 10 ** 20 - 1), Fraction(1, 1),
+               Fraction(10 ** 400, 3), Fraction(10 ** 400 + 1, 3), Fraction(-10 ** 400, 7)]
+    expected = sorted(exact(fraction) for fraction in values)
+    assert [exact(fraction) for fraction in sorted(values)] == expected
+    assert [exact(fraction) for fraction in sorted(values, key=Fraction.sort_key)] == expected
+    assert [exact(fraction) for fraction in sorted(values, reverse=True)] == expected[::-1]
+
+def test_comparisons_with_numbers():
+    half = Fraction(1, 2)
+    assert half < 1 and half > 0 and half <= 0.5 and half >= 0.5 and half == 0.5 and half != 1
+    assert Fraction(10 ** 20 + 1, 10 ** 20) > 1 and not Fraction(10 ** 20 + 1, 10 ** 20) < 1.0
+    assert 1 > half and 0.25 < half
+    for compare in (operator.lt, operator.le, operator.gt, operator.ge):
+        with pytest.raises(TypeError, match=r"'str'"):
+            compare(half, 'a')
+        with pytest.raises(TypeError):
+            compare('a', half)
+
+@pytest.mark.parametrize('fraction', [Fraction(1, 2), Fraction(-3, 1), Fraction(0, 1), Fraction(10 ** 400, 3),
+                                      Fraction(-10 ** 400, 7)], ids=repr)
+def test_comparisons_with_infinity_and_nan(fraction):
+    for compare in (operator.lt, operator.le, operator.gt, operator.ge, operator.eq, operator.ne):
+        for other in (math.inf, -math.inf, math.nan):
+            # Python's fractions compare exactly the same way
+            assert compare(fraction, other) == compare(exact(fraction), other)
+            assert compare(other, fraction) == compare(other, exact(fraction))
+    assert sorted([math.inf, fraction, -math.inf]) == [-math.inf, fraction, math.inf]
+
+def python_sum(values):
+    return sum((fractions.Fraction(value) if isinstance(value, int) else exact(value) for value in values), fractions.Fraction(0))
+
+def python_prod(values):
+    return math.prod((fractions.Fraction(value) if isinstance(value, int) else exact(value) for value in values),
+                     start=fractions.Fraction(1))
+
+# every length up to 17 goes through a different shape of tournament
+@pytest.mark.parametrize('count', list(range(18)) + [1000, 4097])
+def test_sum_and_prod_match_fractions(count):
+    values = random_fractions(count, 10 ** 3, seed=count)
+    total, product = Fraction.sum(iter(values)), Fraction.prod(iter(values))
+    assert isinstance(total, Fraction) and isinstance(product, Fraction)
+    assert exact(total) == python_sum(values)
+    assert exact(product) == python_prod(values)
+
+def test_sum_and_prod_of_nothing_and_of_one_fraction():
+    assert exact(Fraction.sum([])) == 0 and exact(Fraction.prod([])) == 1
+    assert exact(Fraction.sum([Fraction(3, 7)])) == exact(Fraction.prod([Fraction(3, 7)])) == fractions.Fraction(3, 7)
+    assert exact(Fraction.sum([5])) == exact(Fraction.prod([5])) == 5
+
+def test_sum_and_prod_mix_fractions_and_ints():
+    values = [Fraction(1, 2), 3, Fraction(-5, 4), 0, 7, Fraction(1, 3)]
+    assert exact(Fraction.sum(values)) == python_sum(values)
+    # a zero anywhere makes the product zero, written as 0/1
+    product = Fraction.prod(values)
+    assert (product.numerator, product.denominator) == (0, 1)
+    for position in (0, 500, 999):
+        values = random_fractions(1000, 10 ** 6, seed=position)
+        values[position] = Fraction(0, 5)
+        assert exact(Fraction.prod(values)) == 0 == python_prod(values)
+
+def test_hash_matches_python_numbers():
+    for fraction in random_fractions(500, 10 ** 9, seed=4) + [Fraction(4, 2), Fraction(-1, 1), Fraction(10 ** 400, 3)]:
+        assert hash(fraction) == hash(exact(fraction))
+    assert {Fraction(2, 1), 2, Fraction(1, 2), 0.5} == {2, 0.5}
+
+def test_importing_fractions_does_not_import_numpy():
+    # FractionArray, which needs NumPy, lives in fraction_arrays.py
+    code = 'import sys, fraction_algorithms; print("numpy" in sys.modules)'
+    process = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             capture_output=True, text=True, check=True)
+    assert process.stdout.strip() == 'False'
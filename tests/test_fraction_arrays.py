@@ -0,0 +1,59 @@
+'''tests for fraction_arrays.py, checked against Python's own fractions module'''
+
+import fractions
+import operator
+import random
+
+import numpy as np
+import pytest
+
+from fraction_algorithms import Fraction
+from fraction_arrays import FractionArray
+
+def exact(fraction):
+    return fractions.Fraction(fraction.numerator, fraction.denominator)
+
+def random_fractions(count, largest, seed=0):
+    generator = random.Random(seed)
+    return [Fraction(generator.randint(-largest, largest), generator.choice([-1, 1]) * generator.randint(1, largest))
+            for _ in range(count)]
+
+@pytest.mark.parametrize('largest', [10, 10 ** 6, 2 ** 40, 10 ** 30], ids=str)
+@pytest.mark.parametrize('operation', [operator.add, operator.sub, operator.mul, operator.truediv],
+                         ids=lambda operation: operation.__name__)
+def test_array_arithmetic_matches_fractions(operation, largest):
+    left, right = random_fractions(200, largest, seed=1), random_fractions(200, largest, seed=2)
+    right = [fraction if fraction.numerator else Fraction(1, 1) for fraction in right]
+    result = operation(FractionArray.from_fractions(left), FractionArray.from_fractions(right))
+    assert [exact(fraction) for fraction in result] == [operation(exact(x), exact(y)) for x, y in zip(left, right)]
+    assert all(factor == 1 for factor in np.gcd(result.numerators, result.denominators))
+    assert (result.denominators > 0).all()
+
+def test_array_with_a_fraction_or_ints():
+    answers = FractionArray([1, 2, 3], [2, 4, 9])
+    assert repr(answers) == 'FractionArray([1/2, 1/2, 1/3])'
+    assert list(answers == FractionArray.from_fractions([Fraction(1, 2), Fraction(2, 3), Fraction(1, 3)])) == [True, False, True]
+    assert [exact(fraction) for fraction in answers * Fraction(2, 3)] == [fractions.Fraction(1, 3), fractions.Fraction(1, 3), fractions.Fraction(2, 9)]
+    assert [exact(fraction) for fraction in answers + 1] == [fractions.Fraction(3, 2), fractions.Fraction(3, 2), fractions.Fraction(4, 3)]
+    assert list(answers < Fraction(1, 2)) == [False, False, True]
+
+def test_array_overflow_switches_to_python_ints():
+    big = 2 ** 62 - 57
+    product = FractionArray([big], [3]) * FractionArray([big], [5])
+    assert product.numerators.dtype == object
+    assert exact(product[0]) == fractions.Fraction(big, 3) * fractions.Fraction(big, 5)
+    assert (product / FractionArray([big], [1]))[0].numerator == big
+
+def test_array_errors():
+    with pytest.raises(ZeroDivisionError):
+        FractionArray([1, 2], [3, 0])
+    with pytest.raises(ZeroDivisionError):
+        FractionArray([1, 2], [3, 4]) / FractionArray([0, 1])
+    with pytest.raises(TypeError):
+        FractionArray([0.5], [1])
+
+def test_array_indexing():
+    answers = FractionArray([1, 2, 3, 4], 6)
+    assert isinstance(answers[1], Fraction) and exact(answers[1]) == fractions.Fraction(1, 3)
+    assert len(answers[answers > Fraction(1, 3)]) == 2
+    assert len(answers[1:]) == 3
@@ -0,0 +1,135 @@
+'''tests for quantum/complex_numbers.py'''
+
+import math
+
+import numpy as np
+import pytest
+
+from quantum.complex_numbers import Complex, ComplexVector, are_orthonormal, gram_schmidt, linear_combination
+
+def test_vectors_from_lists_and_arrays():
+    from_list = ComplexVector([Complex(1, 2), 3, 4j])
+    from_array = ComplexVector(np.array([1 + 2j, 3, 4j]))
+    from_ints = ComplexVector(np.array([1, 3, 0]))
+    assert from_list.amplitudes.dtype == from_array.amplitudes.dtype == from_ints.amplitudes.dtype == np.complex128
+    assert list(from_list.amplitudes) == list(from_array.amplitudes) == [1 + 2j, 3, 4j]
+    assert from_list[0] == Complex(1, 2) and type(from_list[0].x) is float
+    assert len(from_list) == 3
+    with pytest.raises(ValueError):
+        ComplexVector(np.zeros((2, 2)))
+
+def test_vectors_do_not_share_numbers():
+    source = np.array([1 + 1j, 2, 3], dtype=np.complex128)
+    vector = ComplexVector(source)
+    source[0] = 100
+    assert vector[0] == Complex(1, 1)
+    copy = ComplexVector(vector)
+    copy[1] = 7
+    assert vector[1] == Complex(2, 0)
+
+def test_slices_are_copies():
+    vector = ComplexVector([1, 2, 3, 4])
+    part = vector[1:3]
+    assert isinstance(part, ComplexVector) and list(part.amplitudes) == [2, 3]
+    part[0] = 100
+    assert vector[1] == Complex(2, 0)
+
+def test_inner_product_and_norm():
+    v = ComplexVector([Complex(1, 2), Complex(3, 4)])
+    product = v.inner_product(v)
+    assert product == Complex(30, 0)
+    assert type(product.x) is float and type(product.y) is float
+    # the first vector is conjugated
+    assert ComplexVector([1j, 0]).inner_product([1, 0]) == Complex(0, -1)
+    assert v.norm() == pytest.approx(math.sqrt(30)) and type(v.norm()) is float
+    assert v.normalize().norm() == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        v.inner_product([1, 2, 3])
+
+def test_vector_arithmetic():
+    v, w = ComplexVector([1, 2j]), ComplexVector([3, 4])
+    assert list((v + w).amplitudes) == [4, 4 + 2j]
+    assert list((v - w).amplitudes) == [-2, -4 + 2j]
+    assert list((v * w).amplitudes) == [3, 8j]
+    assert list(v.scalar_multiplication(Complex(0, 1)).amplitudes) == [1j, -2]
+    assert list(v.complex_conjugate().amplitudes) == [1, -2j]
+    with pytest.raises(ZeroDivisionError):
+        v / ComplexVector([1, 0])
+    assert list(linear_combination([v, w], [1, 2]).amplitudes) == [7, 8 + 2j]
+
+def test_gram_schmidt():
+    basis = gram_schmidt([ComplexVector([1, 1, 0]), ComplexVector([1, 0, 1]), ComplexVector([0, 1, 1])])
+    assert are_orthonormal(basis)
+
+def as_complex(number):
+    number = complex(number)
+    return Complex(number.real, number.imag)
+
+def parts(number):
+    # == allows a difference of up to 0.1, so exact checks compare the parts
+    return number.x, number.y
+
+def test_in_place_operations_change_every_name_for_the_number():
+    a = Complex(1, 2)
+    b = a
+    b += Complex(1, 1)
+    assert b is a and parts(a) == (2, 3)
+    b *= 1j
+    assert b is a and parts(a) == (-3, 2)
+    # + and * always make a new number
+    c = a + 1
+    d = a * 2
+    assert parts(a) == (-3, 2) and parts(c) == (-2, 2) and parts(d) == (-6, 4)
+
+def test_in_place_operations_leave_other_numbers_alone():
+    numbers = [Complex(1, 1), Complex(2, 2), Complex(3, 3)]
+    # sum starts from 0, so the first + makes a new number and += only ever changes that one
+    assert parts(sum(numbers)) == (6, 6)
+    assert [parts(number) for number in numbers] == [(1, 1), (2, 2), (3, 3)]
+    vector = ComplexVector(numbers)
+    number = vector[0]
+    number += 10
+    assert parts(vector[0]) == (1, 1)
+    # the item is read, changed, and written back
+    vector[0] += 10
+    assert parts(vector[0]) == (11, 1)
+    total = Complex(0, 0)
+    for number in vector:
+        total += number
+    assert parts(total) == (16, 6) and parts(vector[1]) == (2, 2)
+
+def test_mixing_with_built_in_numbers():
+    c = Complex(1, 2)
+    assert complex(c) == 1 + 2j and type(complex(c)) is complex
+    assert parts(c + 1j) == parts(1j + c) == (1, 3)
+    assert parts(c - 1) == (0, 2) and parts(1 - c) == (0, -2)
+    assert parts(c * 2) == parts(2 * c) == (2, 4)
+    assert parts(c * 1j) == parts(1j * c) == (-2, 1)
+    assert parts(c * 0.5) == (0.5, 1.0)
+    assert complex(c / (1 + 1j)) == pytest.approx((1 + 2j) / (1 + 1j))
+    assert complex(1j / c) == pytest.approx(1j / (1 + 2j))
+    assert c == 1 + 2j and 1 + 2j == c
+    c += 1
+    c *= 1j
+    assert parts(c) == (-2, 2)
+    with pytest.raises(TypeError):
+        c + 'a'
+    with pytest.raises(TypeError):
+        c *= 'a'
+
+@pytest.mark.parametrize('numerator, denominator', [(1 + 2j, 3 - 4j), (-2.5, 0.5j), (7, 2), (0, 1 + 1j), (1e200 + 1e200j, 1e-3)],
+                         ids=str)
+def test_division_matches_built_in_complex_numbers(numerator, denominator):
+    expected = complex(numerator) / complex(denominator)
+    for quotient in (as_complex(numerator) / as_complex(denominator),
+                     as_complex(numerator) / denominator, numerator / as_complex(denominator)):
+        assert complex(quotient) == pytest.approx(expected)
+
+@pytest.mark.parametrize('denominator', [Complex(0, 0), Complex(0.0, -0.0), 0, 0.0, 0j], ids=repr)
+def test_division_by_zero(denominator):
+    with pytest.raises(ZeroDivisionError):
+        Complex(1, 2) / denominator
+    with pytest.raises(ZeroDivisionError):
+        Complex(0, 0) / denominator
+    with pytest.raises(ZeroDivisionError):
+        1j / as_complex(denominator)